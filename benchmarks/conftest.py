@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from hsclient import PollingStrategy
+from hsclient.testing import LocalHydroShare
+
+METADATA_FILES_PATH = os.path.join(os.path.dirname(__file__), '..', 'tests', 'data', 'test_resource_metadata_files')
+
+# the local server has no latency, so polling quickly measures the overhead of the client rather than waiting
+BENCHMARK_POLLING = PollingStrategy(initial_interval=0.001, max_interval=0.01, jitter=0)
+
+
+@pytest.fixture(scope='module')
+def local_server():
+    """A LocalHydroShare server shared by the benchmarks of a module, add the resources a benchmark needs to it"""
+    with LocalHydroShare(fixtures_path=METADATA_FILES_PATH, page_size=100) as server:
+        yield server
+
+
+@pytest.fixture(scope='module')
+def local_hydroshare(local_server):
+    return local_server.hydroshare(polling=BENCHMARK_POLLING)
@@ -0,0 +1,44 @@
+"""
+Deterministic generators of synthetic resources, so benchmark results are comparable across releases
+"""
+import os
+import random
+from typing import Dict, List
+
+EXTENSIONS = ('.txt', '.csv', '.json', '.xml', '.nc', '.tif')
+AGGREGATION_FIXTURE = 'ecoregions'
+
+
+def synthetic_files(count: int, folders: int = 100, size: int = 0, seed: int = 0) -> Dict[str, bytes]:
+    """
+    Generates the contents of a resource with count files spread over folders, in a deterministic order
+    :param count: the number of files
+    :param folders: the number of folders the files are spread over, nested two levels deep
+    :param size: the number of bytes of each file
+    :param seed: the seed of the generated file content
+    """
+    generator = random.Random(seed)
+    content = generator.randbytes(size)
+    files = {}
+    for i in range(count):
+        folder = i % folders
+        path = f'folder{folder // 10}/sub{folder % 10}/file{i}{EXTENSIONS[i % len(EXTENSIONS)]}'
+        files[path] = content
+    return files
+
+
+def synthetic_aggregations(count: int) -> List[str]:
+    """The names of count copies of the ecoregions CSV aggregation fixture, each in its own folder"""
+    return [f'aggregation{i}/{AGGREGATION_FIXTURE}' for i in range(count)]
+
+
+def write_files(directory: str, count: int, size: int, seed: int = 0) -> List[str]:
+    """Writes count local files of size bytes of random content to directory, returns their paths"""
+    generator = random.Random(seed)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f'upload{i}.bin')
+        with open(path, 'wb') as f:
+            f.write(generator.randbytes(size))
+        paths.append(path)
+    return paths
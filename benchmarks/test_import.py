@@ -0,0 +1,23 @@
+import subprocess
+import sys
+
+# modules which are only imported once a feature needing them is used
+DEFERRED_MODULES = ('hsmodels', 'rdflib', 'pydantic', 'requests_oauthlib', 'pkg_resources', 'fiona', 'pandas',
+                    'rasterio', 'xarray')
+
+
+def import_hsclient():
+    """Imports hsclient in a new interpreter, returns the top level modules it imported"""
+    output = subprocess.run(
+        [sys.executable, '-c', 'import sys, hsclient; print(" ".join(sys.modules))'],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return {module.split('.')[0] for module in output.split()}
+
+
+def test_import_time(benchmark):
+    modules = benchmark.pedantic(import_hsclient, rounds=10, warmup_rounds=1)
+
+    assert not modules.intersection(DEFERRED_MODULES)
@@ -0,0 +1,90 @@
+import pytest
+
+from benchmarks.generators import synthetic_aggregations, synthetic_files
+
+
+@pytest.fixture(scope='module')
+def large_resource(local_server, local_hydroshare):
+    resource_id = local_server.add_resource(synthetic_files(100000))
+    res = local_hydroshare.resource(resource_id)
+    # parse the resource map once, the benchmarks measure filtering the parsed files
+    res.files()
+    return res
+
+
+def test_resource_open(benchmark, local_server, local_hydroshare):
+    resource_id = local_server.add_resource(synthetic_files(100), aggregations=synthetic_aggregations(10))
+
+    res = benchmark(local_hydroshare.resource, resource_id, use_cache=False)
+
+    assert res.resource_id == resource_id
+
+
+@pytest.mark.parametrize('count', [10, 100, 1000])
+def test_aggregations(benchmark, local_server, local_hydroshare, count):
+    resource_id = local_server.add_resource(aggregations=synthetic_aggregations(count))
+
+    def materialize():
+        # a new resource each round, so the resource map is parsed and every aggregation metadata is loaded
+        res = local_hydroshare.resource(resource_id, validate=False, use_cache=False)
+        return res.aggregations(type='CSV')
+
+    aggregations = benchmark.pedantic(materialize, rounds=3 if count >= 1000 else 10, warmup_rounds=1)
+
+    assert len(aggregations) == count
+
+
+def test_files_parse(benchmark, local_server):
+    resource_id = local_server.add_resource(synthetic_files(10000))
+
+    def parse(hs):
+        return hs.resource(resource_id, validate=False).files()
+
+    # a new client each round, so the resource map is parsed rather than revalidated
+    files = benchmark.pedantic(parse, setup=lambda: ((local_server.hydroshare(),), {}), rounds=3)
+
+    assert len(files) == 10000
+
+
+@pytest.mark.parametrize(
+    'filters, expected',
+    [
+        ({'extension': '.csv'}, 16667),
+        ({'folder': 'folder3/sub4'}, 1000),
+        ({'name': 'file99999.xml'}, 1),
+        ({'path': 'folder0/sub0/file0.txt'}, 1),
+    ],
+)
+def test_files_filter(benchmark, large_resource, filters, expected):
+    files = benchmark(large_resource.files, **filters)
+
+    assert len(files) == expected
+
+
+def test_resource_from_snapshot(benchmark, local_server, local_hydroshare, tmp_path):
+    resource_id = local_server.add_resource(synthetic_files(10000), aggregations=synthetic_aggregations(100))
+    path = str(tmp_path / 'resource.snapshot')
+    local_hydroshare.resource(resource_id).snapshot(path)
+
+    res = benchmark(local_hydroshare.resource_from_snapshot, path, use_cache=False)
+
+    assert len(res.aggregations()) == 100
+
+
+def test_bulk_rename(benchmark, local_server, local_hydroshare):
+    def setup():
+        resource_id = local_server.add_resource(synthetic_files(100), aggregations=synthetic_aggregations(10))
+        res = local_hydroshare.resource(resource_id)
+        res.aggregations()
+        return (res,), {}
+
+    def rename(res):
+        # the files and aggregations are listed after each rename, as a sync script checking its progress does
+        for file in res.files()[:50]:
+            res.file_rename(file, 'renamed/' + file)
+            res.aggregations()
+        return res.files()
+
+    files = benchmark.pedantic(rename, setup=setup, rounds=3)
+
+    assert len(files) == 100
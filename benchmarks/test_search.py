@@ -0,0 +1,7 @@
+def test_search_pagination(benchmark, local_server, local_hydroshare):
+    for _ in range(1000):
+        local_server.add_resource()
+
+    results = benchmark(lambda: list(local_hydroshare.search()))
+
+    assert len(results) == 1000
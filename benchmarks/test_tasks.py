@@ -0,0 +1,32 @@
+from benchmarks.conftest import BENCHMARK_POLLING
+from benchmarks.generators import synthetic_files
+from hsclient import TaskWatcher
+
+
+def test_task_watcher_overhead(benchmark):
+    watcher = TaskWatcher(polling=BENCHMARK_POLLING)
+
+    def watch_all():
+        futures = []
+        for _ in range(1000):
+            polls = iter([(False, None), (False, None), (True, None)])
+            futures.append(watcher.watch(lambda polls=polls: next(polls)))
+        for future in futures:
+            future.result()
+
+    benchmark.pedantic(watch_all, rounds=5)
+
+
+def test_concurrent_zipped_downloads(benchmark, local_server, local_hydroshare, tmp_path):
+    local_server.task_polls = 3
+    resource_id = local_server.add_resource(synthetic_files(100, folders=20))
+    res = local_hydroshare.resource(resource_id)
+    folders = sorted({path.rsplit('/', 1)[0] for path in res.files()})
+
+    def download_all():
+        futures = [res.submit_folder_download(folder, save_path=str(tmp_path)) for folder in folders]
+        return [future.result() for future in futures]
+
+    paths = benchmark.pedantic(download_all, rounds=3)
+
+    assert len(paths) == 20
@@ -0,0 +1,42 @@
+import pytest
+
+from benchmarks.generators import synthetic_files, write_files
+from hsclient import UploadStrategy
+
+SMALL_FILE_SIZE = 10 * 1024
+LARGE_FILE_SIZE = 16 * 1024 * 1024
+
+
+@pytest.mark.parametrize(
+    'count, size, strategy',
+    [
+        (200, SMALL_FILE_SIZE, UploadStrategy.ZIP),
+        (200, SMALL_FILE_SIZE, UploadStrategy.PARALLEL),
+        (2, LARGE_FILE_SIZE, UploadStrategy.PARALLEL),
+    ],
+)
+def test_upload(benchmark, local_server, local_hydroshare, tmp_path, count, size, strategy):
+    files = write_files(str(tmp_path), count, size)
+    res = local_hydroshare.resource(local_server.add_resource(), validate=False)
+    benchmark.extra_info['bytes'] = count * size
+
+    benchmark.pedantic(res.file_upload, args=files, kwargs={'strategy': strategy, 'refresh': False}, rounds=3)
+
+    assert len(local_server.resources[res.resource_id].contents) == count
+
+
+def test_download_large_file(benchmark, local_server, local_hydroshare, tmp_path):
+    resource_id = local_server.add_resource({'large.bin': bytes(LARGE_FILE_SIZE)})
+    res = local_hydroshare.resource(resource_id)
+    benchmark.extra_info['bytes'] = LARGE_FILE_SIZE
+
+    benchmark.pedantic(res.file_download, args=('large.bin',), kwargs={'save_path': str(tmp_path)}, rounds=3)
+
+
+def test_download_small_files(benchmark, local_server, local_hydroshare, tmp_path):
+    files = synthetic_files(200, folders=1, size=SMALL_FILE_SIZE)
+    resource_id = local_server.add_resource(files)
+    res = local_hydroshare.resource(resource_id)
+    benchmark.extra_info['bytes'] = len(files) * SMALL_FILE_SIZE
+
+    benchmark.pedantic(res.folder_download, args=('folder0',), kwargs={'save_path': str(tmp_path)}, rounds=3)
@@ -9,4 +9,19 @@ from hsclient.hydroshare import (
     GeoFeatureAggregation,
     CSVAggregation
 )
-from hsclient.oauth2_model import Token
+from hsclient.batch import Batch, BatchOperation
+from hsclient.cache import DiskCache
+from hsclient.metrics import MetricsCollector, RequestEvent, RequestHook, RequestStart
+from hsclient.ratelimit import RateLimiter
+from hsclient.retry import CircuitBreaker, RetryPolicy
+from hsclient.streaming import UploadProgress, UploadStrategy
+from hsclient.tasks import PollingStrategy, TaskTiming, TaskWatcher
+
+
+def __getattr__(name):
+    # pydantic is only imported once an OAuth2 token is used
+    if name == 'Token':
+        from hsclient.oauth2_model import Token
+
+        return Token
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
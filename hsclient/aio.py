@@ -0,0 +1,666 @@
+import asyncio
+import importlib.util
+import os
+from collections import deque
+from datetime import datetime
+from posixpath import basename, join as urljoin
+from typing import TYPE_CHECKING, AsyncIterator, Deque, Dict, Iterator, List, Union
+from urllib.parse import unquote, urlparse
+from zipfile import ZipFile
+
+if TYPE_CHECKING:
+    import httpx
+    from hsmodels.schemas.base_models import BaseMetadata
+
+    from hsclient.json_models import ResourcePreview, User
+    from hsclient.oauth2_model import Token
+else:
+    try:
+        import httpx
+    except ImportError:
+        httpx = None
+
+from hsclient.hydroshare import (
+    DOWNLOAD_CHUNK_SIZE,
+    TASK_TIMINGS_LIMIT,
+    VERSION,
+    Aggregation,
+    File,
+    HydroShare,
+    HydroShareSession,
+    Resource,
+    parse_checksums,
+    search_params,
+)
+from hsclient.resourcemap import parse_resource_map
+from hsclient.streaming import UPLOAD_CHUNK_SIZE, MultipartEncoder, UploadStrategy, choose_upload_strategy, zip_stream
+from hsclient.tasks import TASK_FAILED_STATUSES, PollingStrategy, TaskTiming
+from hsclient.utils import attribute_filter, encode_resource_url, is_aggregation
+
+DEFAULT_MAX_CONNECTIONS = 100
+
+
+async def _read_in_thread(iterator: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """Yields the chunks of a blocking iterator, each read in a worker thread"""
+    while True:
+        chunk = await asyncio.to_thread(next, iterator, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+class AsyncHydroShareSession:
+    """The asyncio counterpart of HydroShareSession, issuing requests over a pooled httpx.AsyncClient"""
+
+    def __init__(
+        self,
+        host,
+        protocol,
+        port,
+        *,
+        username: str = None,
+        password: str = None,
+        client_id: str = None,
+        token: Union['Token', Dict[str, str]] = None,
+        http2: bool = True,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: float = None,
+        download_chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        polling: PollingStrategy = None,
+    ):
+        if httpx is None:
+            raise Exception("httpx package was not found")
+        self._host = host
+        self._protocol = protocol
+        self._port = port
+        self.download_chunk_size = download_chunk_size
+        self.upload_chunk_size = UPLOAD_CHUNK_SIZE
+        self.polling = polling if polling is not None else PollingStrategy()
+        self.task_timings: Deque[TaskTiming] = deque(maxlen=TASK_TIMINGS_LIMIT)
+
+        headers = {'User-Agent': f'python-httpx/{httpx.__version__} (hsclient {VERSION})'}
+        auth = None
+        if client_id or token:
+            if not token or not client_id:
+                raise ValueError("Oauth2 requires both token and client_id be provided")
+            token = HydroShareSession._validate_oauth2_token(token)
+            headers['Authorization'] = f"Bearer {token['access_token']}"
+        elif username is not None and password is not None:
+            auth = (username, password)
+
+        # HTTP/2 multiplexes concurrent requests over a single connection when the h2 package is installed
+        http2 = http2 and importlib.util.find_spec("h2") is not None
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._client = httpx.AsyncClient(
+            auth=auth, headers=headers, http2=http2, limits=limits, timeout=timeout, follow_redirects=True
+        )
+
+    @property
+    def host(self):
+        return self._host
+
+    @property
+    def base_url(self):
+        return "{}://{}:{}".format(self._protocol, self._host, self._port)
+
+    def _build_url(self, path: str):
+        path = "/" + path.strip("/") + "/"
+        return encode_resource_url(self.base_url + path)
+
+    async def close(self):
+        await self._client.aclose()
+
+    async def _request(self, method, path, status_code, **kwargs):
+        url = self._build_url(path)
+        response = await self._client.request(method, url, **kwargs)
+        if response.status_code != status_code:
+            raise Exception(
+                "Failed {} {}, status_code {}, message {}".format(method, url, response.status_code, response.content)
+            )
+        return response
+
+    async def get(self, path, status_code, **kwargs):
+        return await self._request("GET", path, status_code, **kwargs)
+
+    async def post(self, path, status_code, data=None, **kwargs):
+        return await self._request("POST", path, status_code, data=data, **kwargs)
+
+    async def put(self, path, status_code, data=None, **kwargs):
+        return await self._request("PUT", path, status_code, data=data, **kwargs)
+
+    async def delete(self, path, status_code, **kwargs):
+        return await self._request("DELETE", path, status_code, **kwargs)
+
+    async def upload_file(self, path, files, status_code=204):
+        """
+        Uploads files as a streamed multipart/form-data body, see MultipartEncoder.  The body is read in a worker
+        thread so compressing or reading files doesn't block the event loop.
+        :param path: the path to post the files to
+        :param files: a dict of field name to (filename, content) tuples
+        :param status_code: the expected response status code
+        """
+        body = MultipartEncoder(files, chunk_size=self.upload_chunk_size)
+        headers = {'Content-Type': body.content_type}
+        if body.length is not None:
+            headers['Content-Length'] = str(body.length)
+        return await self.post(path, content=_read_in_thread(iter(body)), headers=headers, status_code=status_code)
+
+    async def retrieve_string(self, path):
+        response = await self.get(path, status_code=200)
+        return response.content.decode()
+
+    async def retrieve_file(self, path, save_path=""):
+        filename = path.split("/")[-1]
+        return await self.stream_to_file(self._build_url(path), os.path.join(save_path, filename))
+
+    async def retrieve_zip(self, path, save_path="", params=None):
+        response = await self.get(path, status_code=200, params=params or {})
+        url = await self.wait_for_task(response.json()['task_id'])
+        filename = path.split("/")[-1]
+        # append .zip to the filename if it doesn't end with .zip
+        if not filename.endswith(".zip"):
+            filename += ".zip"
+        return await self.stream_to_file(url, os.path.join(save_path, filename))
+
+    async def stream_to_file(self, url, downloaded_file):
+        """
+        Streams url to disk in chunks of download_chunk_size bytes through a temporary .part file which is renamed
+        to downloaded_file once the transfer completes
+        """
+        part_file = downloaded_file + ".part"
+        try:
+            async with self._client.stream("GET", url) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise Exception(
+                        "Failed GET {}, status_code {}, message {}".format(url, response.status_code, response.content)
+                    )
+                with open(part_file, 'wb') as f:
+                    async for chunk in response.aiter_bytes(self.download_chunk_size):
+                        f.write(chunk)
+        except BaseException:
+            if os.path.exists(part_file):
+                os.remove(part_file)
+            raise
+        os.replace(part_file, downloaded_file)
+        return downloaded_file
+
+    async def check_task(self, task_id):
+        response = await self.get(f"/hsapi/taskstatus/{task_id}/", status_code=200)
+        json_response = response.json()
+        return json_response['status'], json_response['payload'] if 'payload' in json_response else None
+
+    async def wait_for_task(self, task_id):
+        """
+        Polls the status of a server side task according to the polling strategy until it completes, without
+        blocking the event loop.  The time spent waiting is recorded in task_timings.
+        :param task_id: the id of the task to wait on
+        :return: the payload of the completed task
+        """
+        start = asyncio.get_running_loop().time()
+        payload = None
+
+        async def task_is_complete():
+            nonlocal payload
+            status, payload = await self.check_task(task_id)
+            if status in TASK_FAILED_STATUSES:
+                raise Exception(f"Task {task_id} {status}, payload {payload}")
+            return status == 'true'
+
+        polls = await self.polling.wait_async(task_is_complete, f"task {task_id}")
+        self.task_timings.append(TaskTiming(task_id, polls, asyncio.get_running_loop().time() - start))
+        return payload
+
+
+class AsyncAggregation:
+    """
+    The asyncio counterpart of Aggregation.  The resource map, metadata and manifest are retrieved on first access
+    and shared by concurrent callers, rdf parsing runs in a worker thread to keep the event loop responsive.
+    """
+
+    def __init__(self, map_path, hs_session: AsyncHydroShareSession, checksums=None):
+        self._map_path = map_path
+        self._hs_session = hs_session
+        self._checksums = checksums
+        self._loading = None
+        self._aggregations_loading = None
+
+    def __str__(self):
+        return self._map_path
+
+    async def _retrieve_and_parse(self, path):
+        from hsmodels.schemas import load_rdf
+
+        file_str = await self._hs_session.retrieve_string(path)
+        return await asyncio.to_thread(load_rdf, file_str)
+
+    async def _retrieve_map(self, path):
+        file_str = await self._hs_session.retrieve_string(path)
+        return await asyncio.to_thread(parse_resource_map, file_str)
+
+    async def _retrieve_checksums(self, path):
+        file_str = await self._hs_session.retrieve_string(path)
+        return parse_checksums(file_str)
+
+    async def _retrieve(self) -> Aggregation:
+        aggregation = Aggregation(self._map_path, None, self._checksums)
+        aggregation._retrieved_map = await self._retrieve_map(self._map_path)
+        retrievals = [self._retrieve_and_parse(aggregation.metadata_path)]
+        if self._checksums is None:
+            retrievals.append(self._retrieve_checksums(aggregation._checksums_path))
+        aggregation._retrieved_metadata, *checksums = await asyncio.gather(*retrievals)
+        if checksums:
+            aggregation._parsed_checksums = checksums[0]
+        return aggregation
+
+    async def _load(self) -> Aggregation:
+        """Returns an Aggregation holding the parsed documents, retrieving them once for all concurrent callers"""
+        if self._loading is None:
+            self._loading = asyncio.ensure_future(self._retrieve())
+        try:
+            return await self._loading
+        except BaseException:
+            self._loading = None
+            raise
+
+    async def _retrieve_aggregations(self) -> List['AsyncAggregation']:
+        loaded = await self._load()
+        aggregations = [
+            AsyncAggregation(unquote(urlparse(file).path), self._hs_session, loaded._parsed_checksums)
+            for file in loaded._map.files
+            if is_aggregation(file)
+        ]
+        # load metadata for all aggregations concurrently
+        await asyncio.gather(*(aggregation._load() for aggregation in aggregations))
+        return aggregations
+
+    async def metadata(self) -> 'BaseMetadata':
+        """A metadata object for reading and updating metadata values"""
+        return (await self._load()).metadata
+
+    async def main_file_path(self) -> str:
+        """The path to the main file in the aggregation"""
+        return (await self._load()).main_file_path
+
+    async def files(self, search_aggregations: bool = False, within: str = None, **kwargs) -> List[File]:
+        """
+        List files and filter by properties on the file object using kwargs (i.e. extension='.txt')
+        :param search_aggregations: Defaults False, set to true to search aggregations
+        :param within: Only list the files in this folder or its subfolders
+        :params **kwargs: Search by properties on the File object (path, name, extension, folder, checksum url)
+        :return: a List of File objects matching the filter parameters
+        """
+        files = (await self._load()).files(within=within, **kwargs)
+        if search_aggregations:
+            for aggregation in await self.aggregations():
+                files = files + await aggregation.files(
+                    search_aggregations=search_aggregations, within=within, **kwargs
+                )
+        return files
+
+    async def file(self, search_aggregations=False, within: str = None, **kwargs) -> File:
+        """
+        Returns a single file in the resource that matches the filtering parameters
+        :param search_aggregations: Defaults False, set to true to search aggregations
+        :param within: Only return a file in this folder or its subfolders
+        :params **kwargs: Search by properties on the File object (path, name, extension, folder, checksum url)
+        :return: A File object matching the filter parameters or None if no matching File was found
+        """
+        file = (await self._load()).file(within=within, **kwargs)
+        if file is None and search_aggregations:
+            for aggregation in await self.aggregations():
+                file = await aggregation.file(search_aggregations=search_aggregations, within=within, **kwargs)
+                if file is not None:
+                    break
+        return file
+
+    async def aggregations(self, **kwargs) -> List['AsyncAggregation']:
+        """
+        List the aggregations in the resource.  Filter by properties on the metadata object using kwargs, see
+        Aggregation.aggregations for the filtering rules.
+        :params **kwargs: Search by properties on the metadata object
+        :return: a List of AsyncAggregation objects matching the filter parameters
+        """
+        if self._aggregations_loading is None:
+            self._aggregations_loading = asyncio.ensure_future(self._retrieve_aggregations())
+        try:
+            aggregations = await self._aggregations_loading
+        except BaseException:
+            self._aggregations_loading = None
+            raise
+
+        for key, value in kwargs.items():
+            if key.startswith('file__') or key.startswith('files__'):
+                file_args = {key.split('__', 1)[1]: value}
+                aggregations = [agg for agg in aggregations if await agg.files(**file_args)]
+            else:
+                aggregations = [agg for agg in aggregations if attribute_filter(await agg.metadata(), key, value)]
+        return aggregations
+
+    async def aggregation(self, **kwargs) -> 'AsyncAggregation':
+        """
+        Returns a single Aggregation in the resource that matches the filtering parameters.
+        :params **kwargs: Search by properties on the metadata object
+        :return: An AsyncAggregation object matching the filter parameters or None if no matching Aggregation was found.
+        """
+        aggregations = await self.aggregations(**kwargs)
+        if aggregations:
+            return aggregations[0]
+        return None
+
+    def refresh(self) -> None:
+        """Discards the retrieved documents, they are retrieved again on the next access"""
+        self._loading = None
+        self._aggregations_loading = None
+        self._checksums = None
+
+
+class AsyncResource(AsyncAggregation):
+    """The asyncio counterpart of Resource"""
+
+    @property
+    def resource_id(self) -> str:
+        """The resource id (guid) of the HydroShare resource"""
+        return self._map_path.strip("/").split("/")[1]
+
+    @property
+    def _resource_path(self):
+        return urljoin("resource", self.resource_id)
+
+    @property
+    def _hsapi_path(self):
+        return urljoin("/hsapi", "resource", self.resource_id)
+
+    async def _retrieve(self) -> Resource:
+        # the metadata and manifest paths of a resource are known up front, so all three are retrieved concurrently
+        resource = Resource(self._map_path, None)
+        resource._retrieved_map, resource._retrieved_metadata, resource._parsed_checksums = await asyncio.gather(
+            self._retrieve_map(self._map_path),
+            self._retrieve_and_parse(urljoin(self._resource_path, "data", "resourcemetadata.xml")),
+            self._retrieve_checksums(urljoin(self._resource_path, "manifest-md5.txt")),
+        )
+        return resource
+
+    async def delete(self) -> None:
+        """
+        Deletes the resource on HydroShare
+        :return: None
+        """
+        await self._hs_session.delete(self._hsapi_path, status_code=204)
+        self.refresh()
+
+    async def folder_create(self, folder: str, refresh: bool = True) -> None:
+        """
+        Creates a folder on HydroShare
+        :param folder: the folder path to create
+        :param refresh: Defaults True, False to not refresh metadata from HydroShare
+        :return: None
+        """
+        await self._hs_session.put(urljoin(self._hsapi_path, "folders", folder), status_code=201)
+        if refresh:
+            self.refresh()
+
+    async def folder_download(self, path: str, save_path: str = "") -> str:
+        """
+        Downloads a folder from HydroShare
+        :param path: The path to folder
+        :param save_path: The local path to save the download to, defaults to the current directory
+        :return: The path to the download zipped folder
+        """
+        return await self._hs_session.retrieve_zip(
+            urljoin(self._resource_path, "data", "contents", path), save_path, params={"zipped": "true"}
+        )
+
+    async def file_download(self, path: str, save_path: str = "", zipped: bool = False) -> str:
+        """
+        Downloads a file from HydroShare
+        :param path: The path to the file
+        :param save_path: The local path to save the file to
+        :param zipped: Defaults to False, set to True to download the file zipped
+        :return: The path to the downloaded file
+        """
+        if zipped:
+            return await self.folder_download(path, save_path)
+        return await self._hs_session.retrieve_file(urljoin(self._resource_path, "data", "contents", path), save_path)
+
+    async def file_delete(self, path: str, refresh: bool = True) -> None:
+        """
+        Delete a file on HydroShare
+        :param path: The path to the file
+        :param refresh: Defaults True, False to not refresh metadata from HydroShare
+        :return: None
+        """
+        await self._hs_session.delete(urljoin(self._hsapi_path, "files", path), status_code=200)
+        if refresh:
+            self.refresh()
+
+    async def _upload(self, file, destination_path):
+        path = urljoin(self._hsapi_path, "files", destination_path.strip("/"))
+        with open(file, 'rb') as f:
+            await self._hs_session.upload_file(path, files={'file': (basename(file), f)}, status_code=201)
+
+    async def _upload_parallel(self, files, destination_path):
+        await asyncio.gather(*(self._upload(file, destination_path) for file in files))
+
+    async def _upload_zip(self, files, destination_path):
+        path = urljoin(self._hsapi_path, "files", destination_path.strip("/"))
+        zipped = zip_stream(files, chunk_size=self._hs_session.upload_chunk_size)
+        await self._hs_session.upload_file(
+            path, files={'file': ('files.zip', zipped, 'application/zip')}, status_code=201
+        )
+        unzip_path = urljoin(self._hsapi_path, "functions", "unzip", "data", "contents", destination_path, 'files.zip')
+        await self._hs_session.post(unzip_path, status_code=200, data={"overwrite": "true", "ingest_metadata": "true"})
+
+    async def file_upload(
+        self,
+        *files: str,
+        destination_path: str = "",
+        strategy: Union[UploadStrategy, str] = UploadStrategy.AUTO,
+        refresh: bool = True,
+    ) -> None:
+        """
+        Uploads files to a folder in HydroShare, sending multiple files as Resource.file_upload does.  File contents
+        are streamed from disk rather than read into memory.
+        :param *files: The local file paths to upload
+        :param destination_path: The path on HydroShare to upload the files to, defaults to the root contents directory
+        :param strategy: How multiple files are sent, "zip", "parallel" or "auto", see Resource.file_upload
+        :param refresh: Defaults True, False to not refresh metadata from HydroShare
+        :return: None
+        """
+        if len(files) == 1:
+            await self._upload(files[0], destination_path=destination_path)
+        else:
+            strategy = UploadStrategy(strategy)
+            if strategy == UploadStrategy.AUTO:
+                strategy = choose_upload_strategy(files)
+            if strategy == UploadStrategy.PARALLEL:
+                await self._upload_parallel(files, destination_path)
+            else:
+                await self._upload_zip(files, destination_path)
+        if refresh:
+            self.refresh()
+
+    async def aggregation_download(
+        self, aggregation: AsyncAggregation, save_path: str = "", unzip_to: str = None
+    ) -> str:
+        """
+        Download an aggregation from HydroShare
+        :param aggregation: The aggregation to download
+        :param save_path: The local path to save the aggregation to, defaults to the current directory
+        :param unzip_to: If set, the resulting download will be unzipped to the specified path
+        :return: The path to the downloaded zip, or unzip_to when set
+        """
+        main_file_path = await aggregation.main_file_path()
+        path = urljoin(self._resource_path, "data", "contents", main_file_path)
+        path = path.replace('resource', 'django_irods/rest_download', 1)
+        downloaded_zip = await self._hs_session.retrieve_zip(
+            path, save_path=save_path, params={"zipped": "true", "aggregation": "true"}
+        )
+        if unzip_to:
+
+            def unzip():
+                with ZipFile(downloaded_zip, 'r') as zip_ref:
+                    zip_ref.extractall(unzip_to)
+                os.remove(downloaded_zip)
+
+            await asyncio.to_thread(unzip)
+            return unzip_to
+        return downloaded_zip
+
+
+class AsyncHydroShare:
+    """
+    An asyncio HydroShare client mirroring the HydroShare class, built on an httpx.AsyncClient with a shared
+    connection pool (HTTP/2 when the h2 package is installed) so a single event loop can drive many concurrent
+    resource operations.  Requires the httpx package, install with `pip install hsclient[async]`.
+
+    Unlike HydroShare, credentials are not validated at initialization, await my_user_info() to validate them.
+    Use as an async context manager or await close() to release the connection pool.
+
+    :param username: A HydroShare username
+    :param password: A HydroShare password associated with the username
+    :param host: The host to use, defaults to `www.hydroshare.org`
+    :param protocol: The protocol to use, defaults to `https`
+    :param port: The port to use, defaults to `443`
+    :param client_id: The client id associated with the OAuth2 token
+    :param token: The OAuth2 token to use
+    :param http2: Defaults to True, set to False to only use HTTP/1.1
+    :param max_connections: The maximum number of pooled connections, defaults to 100
+    :param timeout: The request timeout in seconds, defaults to None for no timeout
+    :param polling: The PollingStrategy used when waiting on server side tasks, defaults to PollingStrategy()
+    """
+
+    def __init__(
+        self,
+        username: str = None,
+        password: str = None,
+        host: str = HydroShare.default_host,
+        protocol: str = HydroShare.default_protocol,
+        port: int = HydroShare.default_port,
+        client_id: str = None,
+        token: Union['Token', Dict[str, str]] = None,
+        http2: bool = True,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: float = None,
+        polling: PollingStrategy = None,
+    ):
+        if (client_id or token) and not (client_id and token):
+            raise ValueError("Oauth2 requires a client_id to be paired with a token")
+        self._hs_session = AsyncHydroShareSession(
+            host=host,
+            protocol=protocol,
+            port=port,
+            username=username,
+            password=password,
+            client_id=client_id,
+            token=token,
+            http2=http2,
+            max_connections=max_connections,
+            timeout=timeout,
+            polling=polling,
+        )
+        self._resource_object_cache: Dict[str, AsyncResource] = dict()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the connection pool"""
+        await self._hs_session.close()
+
+    async def search(
+        self,
+        creator: str = None,
+        contributor: str = None,
+        owner: str = None,
+        group_name: str = None,
+        from_date: datetime = None,
+        to_date: datetime = None,
+        edit_permission: bool = False,
+        resource_types: List[str] = [],
+        subject: List[str] = [],
+        full_text_search: str = None,
+        published: bool = False,
+    ) -> AsyncIterator['ResourcePreview']:
+        """
+        Query the GET /hsapi/resource/ REST end point of the HydroShare server, see HydroShare.search for the filters.
+        :return: An async generator to iterate over ResourcePreview objects
+        """
+        from hsclient.json_models import ResourcePreview
+
+        params = search_params(
+            creator=creator,
+            contributor=contributor,
+            owner=owner,
+            group_name=group_name,
+            from_date=from_date,
+            to_date=to_date,
+            edit_permission=edit_permission,
+            resource_types=resource_types,
+            subject=subject,
+            full_text_search=full_text_search,
+            published=published,
+        )
+        path = "/hsapi/resource/"
+        while path:
+            response = await self._hs_session.get(path, 200, params=params)
+            res = response.json()
+            for item in res['results']:
+                yield ResourcePreview(**item)
+            path = None
+            if res['next']:
+                next_url = urlparse(res['next'])
+                path, params = next_url.path, next_url.query
+
+    async def resource(self, resource_id: str, validate: bool = True, use_cache: bool = True) -> AsyncResource:
+        """
+        Creates a resource object from HydroShare with the provided resource_id
+        :param resource_id: The resource id of the resource to retrieve
+        :param validate: Defaults to True, set to False to not validate the resource exists
+        :param use_cache: Defaults to True, set to False to skip the cache, and always retrieve the
+            resource from HydroShare. This parameter also does not cache the retrieved Resource
+            object.
+        :return: An AsyncResource object representing a resource on HydroShare
+        """
+        if resource_id in self._resource_object_cache and use_cache:
+            return self._resource_object_cache[resource_id]
+
+        res = AsyncResource("/resource/{}/data/resourcemap.xml".format(resource_id), self._hs_session)
+        if validate:
+            await res.metadata()
+
+        if use_cache:
+            self._resource_object_cache[resource_id] = res
+        return res
+
+    async def create(self, use_cache: bool = True) -> AsyncResource:
+        """
+        Creates a new resource on HydroShare
+        :param use_cache: Defaults to True, set to False to not cache the new Resource object
+        :return: An AsyncResource object representing a resource on HydroShare
+        """
+        response = await self._hs_session.post('/hsapi/resource/', status_code=201)
+        resource_id = response.json()['resource_id']
+        return await self.resource(resource_id, use_cache=use_cache)
+
+    async def user(self, user_id: int) -> 'User':
+        """
+        Retrieves the user details of a Hydroshare user
+        :param user_id: The user id of the user details to retrieve
+        :return: User object representing the user details
+        """
+        from hsclient.json_models import User
+
+        response = await self._hs_session.get(f'/hsapi/userDetails/{user_id}/', status_code=200)
+        return User(**response.json())
+
+    async def my_user_info(self):
+        """
+        Retrieves the user info of the user's credentials provided
+        :return: JSON object representing the user info
+        """
+        response = await self._hs_session.get('/hsapi/userInfo/', status_code=200)
+        return response.json()
@@ -0,0 +1,188 @@
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from posixpath import basename, dirname, join as urljoin
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+def _aggregated_paths(path: str, agg_type) -> List[str]:
+    # a FileSet aggregation is created from the folder of path
+    if agg_type.value == "FileSet" and "/" in path:
+        return [path, dirname(path)]
+    return [path]
+
+
+# the paths within the contents of a resource each operation changes, keyed by method name and called with the
+# arguments of the method.  Operations not listed, and operations on the root folder, may change the whole resource.
+OPERATION_PATHS: Dict[str, Callable[..., List[str]]] = {
+    'reference_create': lambda file_name, url, path='': [urljoin(path, file_name)],
+    'reference_update': lambda file_name, url, path='': [urljoin(path, file_name)],
+    'folder_create': lambda folder: [folder],
+    'folder_rename': lambda path, new_path: [path, new_path],
+    'folder_delete': lambda path=None: [path],
+    'file_delete': lambda path=None: [path],
+    'file_rename': lambda path, new_path: [path, new_path],
+    'file_zip': lambda path, zip_name=None, remove_file=True: [
+        path, urljoin(dirname(path), zip_name or basename(path) + ".zip")
+    ],
+    # the files are unzipped into the folder of the zip
+    'file_unzip': lambda path, overwrite=True, ingest_metadata=True: [path, dirname(path)],
+    'file_aggregate': lambda path, agg_type, refresh=True: _aggregated_paths(path, agg_type),
+    'file_upload': lambda *files, destination_path='', **kwargs: [
+        urljoin(destination_path, basename(file)) for file in files
+    ],
+}
+
+
+class BatchOperation(NamedTuple):
+    """The outcome of an operation run by a Batch"""
+
+    name: str
+    args: Tuple
+    kwargs: Dict[str, Any]
+    result: Any
+    error: Optional[BaseException]
+
+
+class _Queued(NamedTuple):
+    call: Callable
+    args: Tuple
+    kwargs: Dict[str, Any]
+    paths: Optional[List[str]]
+    future: Future
+
+
+def conflicts(paths: Optional[List[str]], other_paths: Optional[List[str]]) -> bool:
+    """Whether operations changing paths and other_paths must be run in order, None is any path"""
+    if paths is None or other_paths is None:
+        return True
+    for path in paths:
+        path = (path or "").strip("/")
+        for other in other_paths:
+            other = (other or "").strip("/")
+            if not path or not other or path == other:
+                return True
+            if path.startswith(other + "/") or other.startswith(path + "/"):
+                return True
+    return False
+
+
+class Batch:
+    """
+    Groups operations on a resource, see Resource.batch.  Within the batch, the methods of the resource that refresh
+    it are queued instead of called and return a Future of their result.  On exit the queued operations are run,
+    concurrently when they change separate paths and in the order they were queued when they don't, and the resource
+    is refreshed once.  Operations queued after a failed operation on the same paths are not run.
+
+    :param resource: the resource the operations are on
+    :param raise_errors: Defaults to True, raises an Exception on exit when an operation failed.  Set to False to only
+        report the errors in operations.
+    """
+
+    def __init__(self, resource, raise_errors: bool = True):
+        self.operations: List[BatchOperation] = []
+        self._resource = resource
+        self._raise_errors = raise_errors
+        self._queued: List[_Queued] = []
+        self._owner = None
+
+    def __enter__(self) -> 'Batch':
+        if self._resource._batch is not None:
+            raise Exception("A batch of operations on resource {} is already open".format(self._resource))
+        self._owner = threading.current_thread()
+        self._resource._batch = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._resource._batch = None
+        if exc_type is not None:
+            # the batch was abandoned, none of its operations are run
+            for queued in self._queued:
+                queued.future.cancel()
+            return
+        if not self._queued:
+            return
+        self._run()
+        deleted = any(op.name == "delete" and op.error is None for op in self.operations)
+        self._resource.refresh(eager=not deleted)
+        errors = self.errors
+        if errors and self._raise_errors:
+            raise Exception(
+                "{} of {} operations failed, the first failed {}: {}".format(
+                    len(errors), len(self.operations), errors[0].name, errors[0].error
+                )
+            ) from errors[0].error
+
+    @property
+    def errors(self) -> List[BatchOperation]:
+        """The operations that failed or were not run"""
+        return [operation for operation in self.operations if operation.error is not None]
+
+    def queues(self) -> bool:
+        """Whether a call to a method of the resource is queued, calls are only queued from the thread of the batch"""
+        return threading.current_thread() is self._owner
+
+    def queue(self, call: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Future:
+        """
+        Queues a call of a method of the resource
+        :param call: the undecorated method
+        :param args: the arguments of the call, starting with the resource
+        :param kwargs: the keyword arguments of the call
+        :return: a Future of the result of the call, completed on exit of the batch
+        """
+        operation_paths = OPERATION_PATHS.get(call.__name__)
+        paths = operation_paths(*args[1:], **kwargs) if operation_paths else None
+        future = Future()
+        self._queued.append(_Queued(call, args, kwargs, paths, future))
+        return future
+
+    def _run(self) -> None:
+        # each operation is run in the wave after the last earlier operation on the same paths
+        waves: List[List[int]] = []
+        wave_of = []
+        for index, queued in enumerate(self._queued):
+            wave = max(
+                (
+                    wave_of[earlier] + 1
+                    for earlier in range(index)
+                    if conflicts(queued.paths, self._queued[earlier].paths)
+                ),
+                default=0,
+            )
+            wave_of.append(wave)
+            if wave == len(waves):
+                waves.append([])
+            waves[wave].append(index)
+
+        failed = set()
+
+        def run(index):
+            queued = self._queued[index]
+            if not queued.future.set_running_or_notify_cancel():
+                return
+            if any(conflicts(queued.paths, self._queued[earlier].paths) for earlier in failed if earlier < index):
+                queued.future.set_exception(
+                    Exception("{} was not run, an earlier operation on its paths failed".format(queued.call.__name__))
+                )
+                return
+            try:
+                queued.future.set_result(queued.call(*queued.args, **queued.kwargs))
+            except Exception as e:
+                queued.future.set_exception(e)
+
+        max_workers = min(max(len(wave) for wave in waves), self._resource._hs_session.max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for wave in waves:
+                for _ in executor.map(run, wave):
+                    pass
+                failed.update(index for index in wave if _error(self._queued[index].future) is not None)
+
+        for queued in self._queued:
+            error = _error(queued.future)
+            result = None if error is not None else queued.future.result()
+            self.operations.append(BatchOperation(queued.call.__name__, queued.args[1:], queued.kwargs, result, error))
+
+
+def _error(future: Future) -> Optional[BaseException]:
+    if future.cancelled():
+        return CancelledError()
+    return future.exception()
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional
+
+DEFAULT_CACHE_MAX_SIZE = 256 * 1024 * 1024
+DEFAULT_CACHE_TTL = 300
+
+
+class CacheEntry(NamedTuple):
+    """A document stored in a DiskCache"""
+
+    body: bytes
+    # the conditional request headers (If-None-Match, If-Modified-Since) revalidating the document
+    validators: Dict[str, str]
+    stored_at: float
+
+
+@lru_cache(maxsize=16)
+def credentials_digest(credentials: str) -> str:
+    """
+    A digest identifying credentials in the keys of a DiskCache.  The digest is slow to compute so that the cache,
+    which may be readable by other users, doesn't reveal weak passwords.  It's computed once per credentials.
+    """
+    return hashlib.pbkdf2_hmac('sha256', credentials.encode(), b'hsclient-cache', 100000).hex()
+
+
+class DiskCache:
+    """
+    A persistent cache of the documents HydroShareSession retrieves (resource maps, metadata and manifests), stored in
+    a SQLite database so it is shared by every process using the same path.  Documents are keyed by url and stored with
+    their validators.  A document younger than ttl seconds is used without contacting HydroShare, an older one is
+    revalidated with a conditional request and only downloaded again when it changed.  The least recently used
+    documents are evicted once the cache grows past max_size bytes.
+
+    HydroShareSession adds a digest of its credentials (see credentials_digest) to the url of documents retrieved by an
+    authenticated session.  They are only used by sessions with the same credentials, so a document of a private
+    resource is never returned to another user without a request checking their access.
+
+    The database uses write ahead logging, so readers don't block a writer.  Failing to read or write the cache (i.e.
+    the database is locked for longer than timeout) is treated as a cache miss rather than an error.
+
+    :param path: The path of the SQLite database file, created if it doesn't exist
+    :param max_size: The maximum total bytes of the cached documents, defaults to 256 MiB
+    :param ttl: The seconds a document is used without revalidation, defaults to 300, 0 always revalidates
+    :param timeout: The seconds to wait for another process holding the database lock, defaults to 30
+    """
+
+    def __init__(
+        self, path: str, max_size: int = DEFAULT_CACHE_MAX_SIZE, ttl: float = DEFAULT_CACHE_TTL, timeout: float = 30
+    ):
+        self.path = os.path.abspath(path)
+        self.max_size = max_size
+        self.ttl = ttl
+        self.timeout = timeout
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS documents (url TEXT PRIMARY KEY, body BLOB NOT NULL, validators TEXT NOT NULL, "
+            "size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS documents_accessed_at ON documents (accessed_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite connections can't be shared between threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Checks if entry may be used without revalidating it with HydroShare"""
+        return time.time() - entry.stored_at < self.ttl
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Returns the cached document of url, or None when it isn't cached"""
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT body, validators, stored_at FROM documents WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            entry = CacheEntry(row[0], json.loads(row[1]), row[2])
+            if not entry.validators and not self.is_fresh(entry):
+                # a stale document without validators can't be revalidated
+                connection.execute("DELETE FROM documents WHERE url = ?", (url,))
+                return None
+            connection.execute("UPDATE documents SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            return entry
+        except sqlite3.Error:
+            return None
+
+    def set(self, url: str, body: bytes, validators: Dict[str, str]) -> None:
+        """Stores the document of url, evicting the least recently used documents past max_size"""
+        if len(body) > self.max_size:
+            return
+        now = time.time()
+        try:
+            connection = self._connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, body, json.dumps(validators), len(body), now, now),
+                )
+                connection.execute(
+                    "DELETE FROM documents WHERE url IN (SELECT url FROM (SELECT url, SUM(size) OVER "
+                    "(ORDER BY accessed_at DESC, url) AS total FROM documents) WHERE total > ?)",
+                    (self.max_size,),
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            pass
+
+    def touch(self, url: str) -> None:
+        """Marks the document of url as revalidated now"""
+        try:
+            now = time.time()
+            self._connection().execute(
+                "UPDATE documents SET stored_at = ?, accessed_at = ? WHERE url = ?", (now, now, url)
+            )
+        except sqlite3.Error:
+            pass
+
+    def delete(self, url: str) -> None:
+        try:
+            self._connection().execute("DELETE FROM documents WHERE url = ?", (url,))
+        except sqlite3.Error:
+            pass
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM documents")
+
+    @property
+    def size(self) -> int:
+        """The total bytes of the cached documents"""
+        return self._connection().execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
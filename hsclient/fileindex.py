@@ -0,0 +1,103 @@
+from typing import Any, Dict, Iterator, List, Optional
+
+from hsclient.utils import attribute_filter
+
+# the properties of a File that are looked up by hash, the folder is also looked up by prefix
+INDEXED_PROPERTIES = ('path', 'name', 'extension', 'folder', 'checksum', 'url')
+
+
+class _FolderNode:
+    __slots__ = ('folders', 'positions')
+
+    def __init__(self):
+        self.folders: Dict[str, '_FolderNode'] = {}
+        # the positions of the files directly in this folder
+        self.positions: List[int] = []
+
+    def walk(self) -> Iterator[int]:
+        yield from self.positions
+        for node in self.folders.values():
+            yield from node.walk()
+
+
+class FileIndex:
+    """
+    Looks up files by their properties, as filtering with attribute_filter would but without scanning every file.
+    Each property is indexed on its first lookup, and the folders on the first lookup of the files within a folder.
+    Files are returned in the order of the indexed list.
+    :param files: the files to index, the list must not be modified once indexed
+    """
+
+    def __init__(self, files: List):
+        self.files = files
+        self._indexes: Dict[str, Dict[Any, List[int]]] = {}
+        self._tree: Optional[_FolderNode] = None
+
+    def filter(self, within: str = None, **kwargs) -> List:
+        """
+        The files matching all of kwargs
+        :param within: a folder to return only the files in the folder or its subfolders
+        :params **kwargs: properties of the File object and the value to match
+        """
+        return list(self.find(within, **kwargs))
+
+    def find(self, within: str = None, **kwargs) -> Iterator:
+        """Yields the files matching all of kwargs, see filter"""
+        candidates = None
+        # the filter the candidates were looked up by, which the candidates don't need to be checked against
+        looked_up = None
+        if within is not None:
+            within = within.strip("/")
+            candidates = self._within(within)
+            looked_up = "within"
+        for key, value in kwargs.items():
+            matched = self._lookup(key, value)
+            if matched is not None and (candidates is None or len(matched) < len(candidates)):
+                candidates = matched
+                looked_up = key
+        if candidates is None:
+            candidates = range(len(self.files))
+        filters = [(key, value) for key, value in kwargs.items() if key != looked_up]
+        for position in candidates:
+            file = self.files[position]
+            if within is not None and looked_up != "within" and not _is_within(file, within):
+                continue
+            if all(attribute_filter(file, key, value) for key, value in filters):
+                yield file
+
+    def _lookup(self, key: str, value) -> Optional[List[int]]:
+        """The positions of the files with key equal to value, None when key isn't indexed"""
+        if key not in INDEXED_PROPERTIES:
+            return None
+        index = self._indexes.get(key)
+        if index is None:
+            index = {}
+            for position, file in enumerate(self.files):
+                index.setdefault(getattr(file, key), []).append(position)
+            self._indexes[key] = index
+        try:
+            return index.get(value, [])
+        except TypeError:
+            # an unhashable value is compared with each file
+            return None
+
+    def _within(self, folder: str) -> List[int]:
+        """The positions of the files in folder and its subfolders"""
+        if self._tree is None:
+            tree = _FolderNode()
+            for position, file in enumerate(self.files):
+                node = tree
+                for name in filter(None, file.folder.split("/")):
+                    node = node.folders.setdefault(name, _FolderNode())
+                node.positions.append(position)
+            self._tree = tree
+        node = self._tree
+        for name in filter(None, folder.split("/")):
+            node = node.folders.get(name)
+            if node is None:
+                return []
+        return sorted(node.walk())
+
+
+def _is_within(file, folder: str) -> bool:
+    return not folder or file.folder == folder or file.folder.startswith(folder + "/")
@@ -1,19 +1,25 @@
+import copy
 import getpass
+import hashlib
+import importlib
+import itertools
 import os
 import pathlib
 import pickle
 import shutil
 import sqlite3
-import tempfile
+import threading
 import time
 import urllib.parse
-from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from contextlib import closing
 from datetime import datetime
 from functools import wraps
+from importlib.metadata import PackageNotFoundError, version
 from posixpath import basename, dirname, join as urljoin, splitext
 from pprint import pformat
-from typing import Callable, Dict, List, TYPE_CHECKING, Union
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, TYPE_CHECKING, Tuple, Union
 from urllib.parse import quote, unquote, urlparse
 from uuid import uuid4
 from zipfile import ZipFile
@@ -23,40 +29,98 @@ if TYPE_CHECKING:
     import pandas
     import rasterio
     import xarray
-else:
-    try:
-        import fiona
-    except ImportError:
-        fiona = None
-    try:
-        import pandas
-    except ImportError:
-        pandas = None
-    try:
-        import rasterio
-    except ImportError:
-        rasterio = None
-    try:
-        import xarray
-    except ImportError:
-        xarray = None
-
-import requests
-
-from hsmodels.schemas import load_rdf, rdf_string
-from hsmodels.schemas.base_models import BaseMetadata
-from hsmodels.schemas.enums import AggregationType
-from hsmodels.schemas.fields import BoxCoverage, PointCoverage
-from requests_oauthlib import OAuth2Session
-
-from hsclient.json_models import ResourcePreview, User
-from hsclient.oauth2_model import Token
-from hsclient.utils import attribute_filter, encode_resource_url, is_aggregation, main_file_type
+    from hsmodels.schemas.base_models import BaseMetadata
+    from hsmodels.schemas.enums import AggregationType
+    from hsmodels.schemas.fields import BoxCoverage, PointCoverage
+    from hsmodels.schemas.rdf.resource import ResourceMap
 
-import pkg_resources  # part of setuptools
-VERSION = pkg_resources.get_distribution(__package__).version
+    from hsclient.json_models import User
+    from hsclient.oauth2_model import Token
 
-CHECK_TASK_PING_INTERVAL = 10
+import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+
+from hsclient.batch import Batch
+from hsclient.cache import DiskCache, credentials_digest
+from hsclient.fileindex import FileIndex
+from hsclient.metrics import RequestEvent, RequestHook, RequestStart, endpoint_template
+from hsclient.ratelimit import RateLimiter, throttled_progress
+from hsclient.resourcemap import ResourceMapListing, parse_resource_map
+from hsclient.retry import CircuitBreaker, RetryPolicy
+from hsclient.streaming import (
+    UPLOAD_CHUNK_SIZE,
+    AggregateProgress,
+    MultipartEncoder,
+    UploadProgress,
+    UploadStrategy,
+    choose_upload_strategy,
+    zip_stream,
+)
+# CHECK_TASK_PING_INTERVAL is re-exported for backward compatibility
+from hsclient.tasks import (  # noqa: F401
+    CHECK_TASK_PING_INTERVAL,
+    TASK_FAILED_STATUSES,
+    PollingStrategy,
+    TaskTiming,
+    TaskWatcher,
+    chain,
+)
+from hsclient.utils import (
+    accepts_ranges,
+    attribute_filter,
+    encode_resource_url,
+    file_md5,
+    is_aggregation,
+    main_file_type,
+    optional_import,
+    remove_files,
+    response_validator,
+)
+
+try:
+    VERSION = version(__package__)
+except PackageNotFoundError:
+    VERSION = 'unknown'
+
+# hsmodels (which loads rdflib and its pydantic schemas), pydantic and requests_oauthlib are slow to import, so they are
+# imported where they are first used.  These names remain importable from this module for backwards compatibility.
+_LAZY_IMPORTS = {
+    'load_rdf': 'hsmodels.schemas',
+    'rdf_string': 'hsmodels.schemas',
+    'BaseMetadata': 'hsmodels.schemas.base_models',
+    'AggregationType': 'hsmodels.schemas.enums',
+    'BoxCoverage': 'hsmodels.schemas.fields',
+    'PointCoverage': 'hsmodels.schemas.fields',
+    'OAuth2Session': 'requests_oauthlib',
+    'ResourcePreview': 'hsclient.json_models',
+    'User': 'hsclient.json_models',
+    'Token': 'hsclient.oauth2_model',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        return getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    if name in ('fiona', 'pandas', 'rasterio', 'xarray'):
+        return optional_import(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_RESUME_ATTEMPTS = 3
+TASK_TIMINGS_LIMIT = 1000
+VALIDATED_DOCUMENTS_LIMIT = 1000
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+DEFAULT_POOL_CONNECTIONS = DEFAULT_POOLSIZE
+DEFAULT_POOL_MAXSIZE = DEFAULT_POOLSIZE
+DEFAULT_RETRY_POLICY = RetryPolicy()
+SNAPSHOT_FORMAT_VERSION = 1
+
+# the attributes of an Aggregation loaded on first access
+_LAZY_ATTRIBUTES = (
+    '_retrieved_map', '_retrieved_map_model', '_retrieved_metadata', '_parsed_checksums', '_parsed_files',
+    '_parsed_aggregations',
+)
 
 
 class File(str):
@@ -74,6 +138,9 @@ class File(str):
         self._file_url = file_url
         self._checksum = checksum
 
+    def __getnewargs__(self):
+        return str(self), self._file_url, self._checksum
+
     @property
     def path(self) -> str:
         """The path of the file"""
@@ -105,29 +172,64 @@ class File(str):
         return self._file_url
 
 
+def parse_checksums(file_str: str) -> Dict[str, str]:
+    """Parses the contents of a bagit manifest-md5.txt into a dict of url quoted path to md5 checksum"""
+    # split string by lines, then split line by delimiter into a dict
+    delimiter = "    "
+    return {
+        quote(path): checksum for checksum, path in [line.split(delimiter) for line in file_str.split("\n") if line]
+    }
+
+
 def refresh(f):
     """
     Decorator for refreshing metadata from HydroShare after the decorated method is called.
     The docstring of a decorated method is updated to include
     :param refresh: Defaults True, False to not refresh metadata from HydroShare
     """
+    return updates(lambda self, *args, **kwargs: self.refresh())(f)
 
-    @wraps(f)
-    def wrapper(*args, **kwargs):
-        self = args[0]
-        do_refresh = kwargs.pop("refresh", True)
-        result = f(*args, **kwargs)
-        if do_refresh:
-            self.refresh()
-        return result
 
-    # update docstring to include refresh parameter
-    doc_lines = f.__doc__.split("\n")
-    insert_index = len(doc_lines) - 2
-    doc_lines.insert(insert_index, ":param refresh: Defaults True, False to not refresh metadata from HydroShare")
-    wrapper.__doc__ = "\n    ".join([l.strip() for l in doc_lines])
+def updates(change: Callable):
+    """
+    Decorator for updating the loaded state of a resource after the decorated method is called, for methods whose
+    change can be applied locally rather than by refreshing the resource.  change is called with the arguments of the
+    decorated method.  The docstring of a decorated method is updated to include
+    :param refresh: Defaults True, False to not refresh metadata from HydroShare
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            do_refresh = kwargs.pop("refresh", True)
+            batch = args[0]._batch
+            if batch is not None and batch.queues():
+                # the batch refreshes once all its operations are run
+                return batch.queue(f, args, kwargs)
+            result = f(*args, **kwargs)
+            if do_refresh:
+                change(*args, **kwargs)
+            return result
+
+        # update docstring to include refresh parameter
+        doc_lines = f.__doc__.split("\n")
+        insert_index = len(doc_lines) - 2
+        doc_lines.insert(insert_index, ":param refresh: Defaults True, False to not refresh metadata from HydroShare")
+        wrapper.__doc__ = "\n    ".join([l.strip() for l in doc_lines])
+
+        return wrapper
+
+    return decorator
+
+
+def _overlaps(path: str, other: str) -> bool:
+    """Whether path is other, is in folder other or is a folder containing other"""
+    return path == other or path.startswith(other + "/") or other.startswith(path + "/")
+
 
-    return wrapper
+def _contents_folder(path: str) -> str:
+    """The folder of a path within the contents of a resource"""
+    return dirname(path.split("/data/contents/", 1)[1])
 
 
 class Aggregation:
@@ -137,84 +239,175 @@ class Aggregation:
         self._map_path = map_path
         self._hs_session = hs_session
         self._retrieved_map = None
+        self._retrieved_map_model = None
         self._retrieved_metadata = None
         self._parsed_files = None
         self._parsed_aggregations = None
         self._parsed_checksums = checksums
         self._main_file_path = None
+        # unchanged aggregations kept by a local update, reused when the aggregations are parsed again
+        self._reusable_aggregations = {}
+        # the open Batch queuing the operations on this aggregation
+        self._batch = None
+        self._indexed_files = None
+        self._lazy_locks = {attribute: threading.RLock() for attribute in _LAZY_ATTRIBUTES}
 
     def __str__(self):
         return self._map_path
 
+    def __getstate__(self):
+        # the session and locks can't be pickled, they are restored by HydroShare.resource_from_snapshot
+        state = self.__dict__.copy()
+        del state['_hs_session']
+        del state['_lazy_locks']
+        state['_batch'] = None
+        state['_indexed_files'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._hs_session = None
+        self._lazy_locks = {attribute: threading.RLock() for attribute in _LAZY_ATTRIBUTES}
+
+    def _attach(self, hs_session) -> None:
+        """Sets the session of this aggregation and its loaded aggregations"""
+        self._hs_session = hs_session
+        for aggregation in [*(self._parsed_aggregations or []), *self._reusable_aggregations.values()]:
+            aggregation._attach(hs_session)
+
+    def _changed_by(self, paths: List[str]) -> bool:
+        """Whether changing the files or folders at paths may change this aggregation"""
+        folder = _contents_folder(self._map_path)
+        if folder:
+            return any(_overlaps(path, folder) for path in paths)
+        return any(_overlaps(path, file) for path in paths for file in self._files)
+
+    def _load_all(self) -> None:
+        """Loads the metadata, files and aggregations of this aggregation and, concurrently, of its aggregations"""
+        self._metadata
+        self._files
+        aggregations = self._aggregations
+        if aggregations:
+            with ThreadPoolExecutor(max_workers=min(len(aggregations), self._hs_session.max_workers)) as executor:
+                for _ in executor.map(lambda aggregation: aggregation._load_all(), aggregations):
+                    pass
+
+    def _lazy(self, attribute, load):
+        """
+        Returns the value of attribute, loading it on first access.  Threads accessing an unloaded attribute at the
+        same time wait on a single load.
+        """
+        value = getattr(self, attribute)
+        if value is None:
+            with self._lazy_locks[attribute]:
+                value = getattr(self, attribute)
+                if value is None:
+                    value = load()
+                    setattr(self, attribute, value)
+        return value
+
     @property
-    def _map(self):
-        if not self._retrieved_map:
-            self._retrieved_map = self._retrieve_and_parse(self._map_path)
-        return self._retrieved_map
+    def _map(self) -> ResourceMapListing:
+        return self._lazy(
+            '_retrieved_map', lambda: self._hs_session.retrieve_parsed(self._map_path, parse_resource_map)
+        )
+
+    @property
+    def resource_map(self) -> 'ResourceMap':
+        """
+        The hsmodels ResourceMap model of the resource map.  Listing files and aggregations doesn't need the model, so
+        it is only parsed on first access.
+        """
+        return self._lazy('_retrieved_map_model', lambda: self._retrieve_and_parse(self._map_path))
 
     @property
     def _metadata(self):
-        if not self._retrieved_metadata:
-            self._retrieved_metadata = self._retrieve_and_parse(self.metadata_path)
-        return self._retrieved_metadata
+        return self._lazy('_retrieved_metadata', lambda: self._retrieve_metadata(self.metadata_path))
 
     @property
     def _checksums(self):
-        if not self._parsed_checksums:
-            self._parsed_checksums = self._retrieve_checksums(self._checksums_path)
-        return self._parsed_checksums
+        return self._lazy('_parsed_checksums', lambda: self._retrieve_checksums(self._checksums_path))
 
     @property
     def _files(self):
-        if not self._parsed_files:
-            self._parsed_files = []
-            for file in self._map.describes.files:
-                if not is_aggregation(str(file)):
-                    if not file.path == self.metadata_path:
-                        if not str(file.path).endswith('/'):  # checking for folders, shouldn't have to do this
-                            file_checksum_path = file.path.split(self._resource_path, 1)[1].strip("/")
-                            file_path = unquote(
-                                file_checksum_path.split(
-                                    "data/contents/",
-                                )[1]
-                            )
-                            f = File(file_path, unquote(file.path), self._checksums[file_checksum_path])
-                            self._parsed_files.append(f)
-        return self._parsed_files
+        return self._lazy('_parsed_files', self._parse_files)
+
+    def _parse_files(self):
+        files = []
+        metadata_path = self.metadata_path
+        for file in self._map.files:
+            if not is_aggregation(file):
+                file = urlparse(file)
+                if not file.path == metadata_path:
+                    if not str(file.path).endswith('/'):  # checking for folders, shouldn't have to do this
+                        file_checksum_path = file.path.split(self._resource_path, 1)[1].strip("/")
+                        file_path = unquote(
+                            file_checksum_path.split(
+                                "data/contents/",
+                            )[1]
+                        )
+                        f = File(file_path, unquote(file.path), self._checksums[file_checksum_path])
+                        files.append(f)
+        return files
 
     @property
     def _aggregations(self):
+        return self._lazy('_parsed_aggregations', self._parse_aggregations)
+
+    def _parse_aggregations(self):
+        from hsmodels.schemas.enums import AggregationType
 
         def populate_metadata(_aggr):
             _aggr._metadata
 
-        if not self._parsed_aggregations:
-            self._parsed_aggregations = []
-            for file in self._map.describes.files:
-                if is_aggregation(str(file)):
-                    self._parsed_aggregations.append(Aggregation(unquote(file.path), self._hs_session, self._checksums))
-
-            # load metadata for all aggregations (metadata is needed to create any typed aggregation)
-            with ThreadPoolExecutor() as executor:
-                executor.map(populate_metadata, self._parsed_aggregations)
-
-            # convert aggregations to aggregation type supporting data object
-            aggregations_copy = self._parsed_aggregations[:]
-            typed_aggregation_classes = {AggregationType.MultidimensionalAggregation: NetCDFAggregation,
-                                         AggregationType.TimeSeriesAggregation: TimeseriesAggregation,
-                                         AggregationType.GeographicRasterAggregation: GeoRasterAggregation,
-                                         AggregationType.GeographicFeatureAggregation: GeoFeatureAggregation,
-                                         AggregationType.CSVFileAggregation: CSVAggregation
-                                         }
-            for aggr in aggregations_copy:
-                typed_aggr_cls = typed_aggregation_classes.get(aggr.metadata.type, None)
-                if typed_aggr_cls:
-                    typed_aggr = typed_aggr_cls.create(base_aggr=aggr)
-                    # swapping the generic aggregation with the typed aggregation in the aggregation list
-                    self._parsed_aggregations.remove(aggr)
-                    self._parsed_aggregations.append(typed_aggr)
-
-        return self._parsed_aggregations
+        reusable, self._reusable_aggregations = self._reusable_aggregations, {}
+        reused = []
+        aggregations = []
+        for file in self._map.files:
+            if is_aggregation(file):
+                map_path = unquote(urlparse(file).path)
+                if map_path in reusable:
+                    reused.append(reusable[map_path])
+                else:
+                    aggregations.append(Aggregation(map_path, self._hs_session))
+        if not aggregations:
+            return reused
+
+        # load metadata for all aggregations (metadata is needed to create any typed aggregation), the metadata is
+        # retrieved concurrently with the resource map of each aggregation
+        with ThreadPoolExecutor(max_workers=self._hs_session.max_workers) as executor:
+            # both are submitted before either is waited on, an error loading either is raised here
+            maps = executor.map(lambda _aggr: _aggr._map, aggregations)
+            metadata = executor.map(lambda _aggr: _aggr._prefetch_metadata(), aggregations)
+            for _ in itertools.chain(maps, metadata):
+                pass
+        for aggregation in aggregations:
+            aggregation._check_prefetched_metadata()
+        with ThreadPoolExecutor(max_workers=self._hs_session.max_workers) as executor:
+            for _ in executor.map(populate_metadata, aggregations):
+                pass
+        # the manifest is only waited on once the aggregation metadata is retrieved
+        checksums = self._checksums
+        for aggregation in aggregations:
+            aggregation._parsed_checksums = checksums
+
+        # convert aggregations to aggregation type supporting data object
+        aggregations_copy = aggregations[:]
+        typed_aggregation_classes = {AggregationType.MultidimensionalAggregation: NetCDFAggregation,
+                                     AggregationType.TimeSeriesAggregation: TimeseriesAggregation,
+                                     AggregationType.GeographicRasterAggregation: GeoRasterAggregation,
+                                     AggregationType.GeographicFeatureAggregation: GeoFeatureAggregation,
+                                     AggregationType.CSVFileAggregation: CSVAggregation
+                                     }
+        for aggr in aggregations_copy:
+            typed_aggr_cls = typed_aggregation_classes.get(aggr.metadata.type, None)
+            if typed_aggr_cls:
+                typed_aggr = typed_aggr_cls.create(base_aggr=aggr)
+                # swapping the generic aggregation with the typed aggregation in the aggregation list
+                aggregations.remove(aggr)
+                aggregations.append(typed_aggr)
+
+        return reused + aggregations
 
     @property
     def _checksums_path(self):
@@ -234,54 +427,92 @@ class Aggregation:
         return resource_path
 
     def _retrieve_and_parse(self, path):
-        file_str = self._hs_session.retrieve_string(path)
-        instance = load_rdf(file_str)
-        return instance
+        from hsmodels.schemas import load_rdf
+        return self._hs_session.retrieve_parsed(path, load_rdf)
+
+    def _retrieve_metadata(self, path):
+        # the parsed metadata is shared with later retrievals, so it is copied before it can be modified
+        return copy.deepcopy(self._retrieve_and_parse(path))
 
     def _retrieve_checksums(self, path):
-        file_str = self._hs_session.retrieve_string(path)
-        # split string by lines, then split line by delimiter into a dict
-        delimiter = "    "
-        data = {
-            quote(path): checksum for checksum, path in [line.split(delimiter) for line in file_str.split("\n") if line]
-        }
-        return data
+        return self._hs_session.retrieve_parsed(path, parse_checksums)
+
+    def _download(self, save_path: str = "", unzip_to: str = None, verify: bool = False) -> str:
+        path, params = self._download_path()
+        downloaded_zip = self._hs_session.retrieve_zip(path, save_path=save_path, params=params)
+        return self._unzip(downloaded_zip, unzip_to, verify)
 
-    def _download(self, save_path: str = "", unzip_to: str = None) -> str:
+    def _submit_download(self, save_path: str = "", unzip_to: str = None, verify: bool = False) -> Future:
+        path, params = self._download_path()
+        downloaded = self._hs_session.submit_zip(path, save_path=save_path, params=params)
+        return chain(downloaded, lambda zipped: self._unzip(zipped, unzip_to, verify), self._hs_session.executor)
+
+    def _download_path(self):
         main_file_path = self.main_file_path
 
         path = urljoin(self._resource_path, "data", "contents", main_file_path)
         params = {"zipped": "true", "aggregation": "true"}
         path = path.replace('resource', 'django_irods/rest_download', 1)
-        downloaded_zip = self._hs_session.retrieve_zip(path, save_path=save_path, params=params)
+        return path, params
 
+    def _unzip(self, downloaded_zip: str, unzip_to: str = None, verify: bool = False) -> str:
         if unzip_to:
             import zipfile
 
             with zipfile.ZipFile(downloaded_zip, 'r') as zip_ref:
-                zip_ref.extractall(unzip_to)
+                if verify:
+                    self._extract_verified(zip_ref, unzip_to)
+                else:
+                    zip_ref.extractall(unzip_to)
             os.remove(downloaded_zip)
             return unzip_to
         return downloaded_zip
 
+    def _extract_verified(self, zip_ref: ZipFile, unzip_to: str) -> None:
+        """Extracts the aggregation files from zip_ref, hashing each file as it is written to compare with the
+        manifest checksums"""
+        checksums = {}
+        for file in self.files(search_aggregations=True):
+            # files sharing a name in different folders can't be matched to a zip entry by name
+            checksums[file.name] = None if file.name in checksums else file.checksum
+        chunk_size = self._hs_session.download_chunk_size
+        root = os.path.realpath(unzip_to)
+        for member in zip_ref.infolist():
+            checksum = checksums.get(basename(member.filename))
+            if member.is_dir() or not checksum:
+                zip_ref.extract(member, unzip_to)
+                continue
+            target = os.path.realpath(os.path.join(root, member.filename))
+            if not target.startswith(root + os.sep):
+                raise Exception(f"Zip entry {member.filename} is outside of {unzip_to}")
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            md5 = hashlib.md5()
+            with zip_ref.open(member) as source, open(target, 'wb') as f:
+                for chunk in iter(lambda: source.read(chunk_size), b''):
+                    f.write(chunk)
+                    md5.update(chunk)
+            if md5.hexdigest() != checksum:
+                raise Exception(f"md5 checksum {md5.hexdigest()} of {member.filename} does not match {checksum}")
+
     @property
     def metadata_file(self):
         """The path to the metadata file"""
         return self.metadata_path.split("/data/contents/", 1)[1]
 
     @property
-    def metadata(self) -> BaseMetadata:
+    def metadata(self) -> 'BaseMetadata':
         """A metadata object for reading and updating metadata values"""
         return self._metadata
 
     @property
     def metadata_path(self) -> str:
         """The path to the metadata file"""
-        return urlparse(str(self._map.describes.is_documented_by)).path
+        return urlparse(self._map.is_documented_by).path
 
     @property
     def main_file_path(self) -> str:
         """The path to the main file in the aggregation"""
+        from hsmodels.schemas.enums import AggregationType
         if self._main_file_path is not None:
             return self._main_file_path
         mft = main_file_type(self.metadata.type)
@@ -302,39 +533,52 @@ class Aggregation:
         Saves the metadata back to HydroShare
         :return: None
         """
+        from hsmodels.schemas import rdf_string
         metadata_file = self.metadata_file
         metadata_string = rdf_string(self._retrieved_metadata, rdf_format="xml")
         url = urljoin(self._hsapi_path, "ingest_metadata")
         self._hs_session.upload_file(url, files={'file': (metadata_file, metadata_string)})
 
-    def files(self, search_aggregations: bool = False, **kwargs) -> List[File]:
+    @property
+    def _file_index(self) -> FileIndex:
+        files = self._files
+        index = self._indexed_files
+        if index is None or index.files is not files:
+            # the files were parsed again or updated locally since they were indexed
+            index = self._indexed_files = FileIndex(files)
+        return index
+
+    def files(self, search_aggregations: bool = False, within: str = None, **kwargs) -> List[File]:
         """
         List files and filter by properties on the file object using kwargs (i.e. extension='.txt')
         :param search_aggregations: Defaults False, set to true to search aggregations
+        :param within: Only list the files in this folder or its subfolders
         :params **kwargs: Search by properties on the File object (path, name, extension, folder, checksum url)
         :return: a List of File objects matching the filter parameters
         """
-        files = self._files
-        for key, value in kwargs.items():
-            files = list(filter(lambda file: attribute_filter(file, key, value), files))
+        files = self._file_index.filter(within, **kwargs)
         if search_aggregations:
             for aggregation in self.aggregations():
-                files = files + list(aggregation.files(search_aggregations=search_aggregations, **kwargs))
+                files = files + aggregation.files(search_aggregations=search_aggregations, within=within, **kwargs)
         return files
 
-    def file(self, search_aggregations=False, **kwargs) -> File:
+    def file(self, search_aggregations=False, within: str = None, **kwargs) -> File:
         """
         Returns a single file in the resource that matches the filtering parameters
         :param search_aggregations: Defaults False, set to true to search aggregations
+        :param within: Only return a file in this folder or its subfolders
         :params **kwargs: Search by properties on the File object (path, name, extension, folder, checksum url)
         :return: A File object matching the filter parameters or None if no matching File was found
         """
-        files = self.files(search_aggregations=search_aggregations, **kwargs)
-        if files:
-            return files[0]
-        return None
+        file = next(self._file_index.find(within, **kwargs), None)
+        if file is None and search_aggregations:
+            for aggregation in self.aggregations():
+                file = aggregation.file(search_aggregations=search_aggregations, within=within, **kwargs)
+                if file is not None:
+                    break
+        return file
 
-    def aggregations(self, **kwargs) -> List[BaseMetadata]:
+    def aggregations(self, **kwargs) -> List['BaseMetadata']:
         """
         List the aggregations in the resource.  Filter by properties on the metadata object using kwargs.  If you need
         to filter on nested properties, use __ (double underscore) to separate the properties.  For example, to filter
@@ -355,7 +599,7 @@ class Aggregation:
                 aggregations = filter(lambda agg: attribute_filter(agg.metadata, key, value), aggregations)
         return list(aggregations)
 
-    def aggregation(self, **kwargs) -> BaseMetadata:
+    def aggregation(self, **kwargs) -> 'BaseMetadata':
         """
         Returns a single Aggregation in the resource that matches the filtering parameters.  Uses the same filtering
         rules described in the aggregations method.
@@ -367,19 +611,73 @@ class Aggregation:
             return aggregations[0]
         return None
 
-    def refresh(self) -> None:
+    def refresh(self, eager: bool = False) -> None:
         """
-        Forces the retrieval of the resource map and metadata files.  Currently this is implemented to be lazy and will
-        only retrieve those files again after another call to access them is made.  This will be later updated to be
-        eager and retrieve the files asynchronously.
+        Forces the retrieval of the resource map, metadata and manifest files.  By default this is lazy and the files
+        are only retrieved again when they are next accessed.
+        :param eager: Defaults to False, set to True to retrieve the files now.  The resource map, metadata and manifest
+            are retrieved concurrently and the metadata of the aggregations is retrieved as soon as the resource map is
+            parsed, so a refresh takes about one round trip more than the slowest retrieval.
         """
-        # TODO, refresh should destroy the aggregation objects and async fetch everything.
+        self._hs_session.expire(self._map_path[: len("/resource/b4ce17c17c654a5c8004af73f2df87ab/")])
         self._retrieved_map = None
+        self._retrieved_map_model = None
         self._retrieved_metadata = None
         self._parsed_files = None
         self._parsed_aggregations = None
         self._parsed_checksums = None
         self._main_file_path = None
+        self._reusable_aggregations = {}
+        if eager:
+            self._load_eagerly()
+
+    def _document_paths(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        The metadata and manifest paths, when they are known without parsing the resource map.  The metadata of an
+        aggregation is named after its resource map by convention, which is checked once the resource map is parsed.
+        """
+        if not self._map_path.endswith("_resmap.xml"):
+            return None, None
+        resource_path = self._map_path.split("/data/", 1)[0]
+        return self._map_path[: -len("_resmap.xml")] + "_meta.xml", urljoin(resource_path, "manifest-md5.txt")
+
+    def _prefetch_metadata(self) -> None:
+        """Retrieves the metadata from the path known without parsing the resource map, if any"""
+        metadata_path = self._document_paths()[0]
+        if metadata_path is not None:
+            self._lazy('_retrieved_metadata', lambda: self._retrieve_metadata(metadata_path))
+
+    def _check_prefetched_metadata(self) -> None:
+        """Discards metadata prefetched from a path the resource map doesn't document"""
+        metadata_path = self._document_paths()[0]
+        if metadata_path is not None and self._retrieved_metadata is not None and metadata_path != self.metadata_path:
+            self._retrieved_metadata = None
+
+    def _load_eagerly(self) -> None:
+        checksums_path = self._document_paths()[1]
+
+        def retrieve_metadata():
+            self._prefetch_metadata()
+            return self._metadata
+
+        def retrieve_checksums():
+            if checksums_path is None:
+                return self._checksums
+            return self._lazy('_parsed_checksums', lambda: self._retrieve_checksums(checksums_path))
+
+        # the files and aggregations wait on the resource map, and the files on the manifest, as they are loaded
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            loads = [
+                executor.submit(lambda: self._map),
+                executor.submit(retrieve_metadata),
+                executor.submit(retrieve_checksums),
+                executor.submit(lambda: self._files),
+                executor.submit(lambda: self._aggregations),
+            ]
+            for load in loads:
+                load.result()
+        self._check_prefetched_metadata()
+        self._metadata
 
     def delete(self) -> None:
         """Deletes this aggregation from HydroShare"""
@@ -402,6 +700,7 @@ class DataObjectSupportingAggregation(Aggregation):
         """Creates a type specific aggregation object from an instance of Aggregation"""
         aggr = aggr_cls(base_aggr._map_path, base_aggr._hs_session, base_aggr._parsed_checksums)
         aggr._retrieved_map = base_aggr._retrieved_map
+        aggr._retrieved_map_model = base_aggr._retrieved_map_model
         aggr._retrieved_metadata = base_aggr._retrieved_metadata
         aggr._parsed_files = base_aggr._parsed_files
         aggr._parsed_aggregations = base_aggr._parsed_aggregations
@@ -409,9 +708,15 @@ class DataObjectSupportingAggregation(Aggregation):
         aggr._data_object = None
         return aggr
 
-    def refresh(self) -> None:
-        super().refresh()
+    def refresh(self, eager: bool = False) -> None:
         self._data_object = None
+        super().refresh(eager)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # a data object may hold open files
+        state['_data_object'] = None
+        return state
 
     @property
     def data_object(self) -> \
@@ -435,6 +740,7 @@ class DataObjectSupportingAggregation(Aggregation):
 
     def _get_data_object(self, agg_path: str, func: Callable, **func_kwargs) -> \
             Union['pandas.DataFrame', 'fiona.Collection', 'rasterio.DatasetReader', 'xarray.Dataset']:
+        from hsmodels.schemas.enums import AggregationType
 
         if self._data_object is not None and self.metadata.type != AggregationType.TimeSeriesAggregation:
             return self._data_object
@@ -449,7 +755,7 @@ class DataObjectSupportingAggregation(Aggregation):
         self._data_object = data_object
         return data_object
 
-    def _validate_aggregation_for_update(self, resource: 'Resource', agg_type: AggregationType) -> None:
+    def _validate_aggregation_for_update(self, resource: 'Resource', agg_type: 'AggregationType') -> None:
         if self.metadata.type != agg_type:
             raise Exception(f"Not a {agg_type.value} aggregation")
 
@@ -498,6 +804,7 @@ class NetCDFAggregation(DataObjectSupportingAggregation):
         :param agg_path: the path to the Multidimensional aggregation
         :return: the Multidimensional aggregation as a xarray Dataset object
         """
+        xarray = optional_import('xarray')
         if xarray is None:
             raise Exception("xarray package was not found")
         return self._get_data_object(agg_path=agg_path, func=xarray.open_dataset)
@@ -512,6 +819,7 @@ class NetCDFAggregation(DataObjectSupportingAggregation):
         :param destination_path: the destination path in Hydroshare to save the new aggregation
         :return: the updated or new Multidimensional aggregation
         """
+        from hsmodels.schemas.enums import AggregationType
 
         self._validate_aggregation_for_update(resource, AggregationType.MultidimensionalAggregation)
         file_path = self._validate_aggregation_path(agg_path, for_save_data=True)
@@ -560,6 +868,7 @@ class TimeseriesAggregation(DataObjectSupportingAggregation):
         :param series_id: the series id of the time series to retrieve
         :return: the Time Series aggregation as a pandas DataFrame object
         """
+        pandas = optional_import('pandas')
         if pandas is None:
             raise Exception("pandas package not found")
 
@@ -575,7 +884,6 @@ class TimeseriesAggregation(DataObjectSupportingAggregation):
 
     def save_data_object(self, resource: 'Resource', agg_path: str, as_new_aggr: bool = False,
                          destination_path: str = "") -> 'Aggregation':
-
         """
         Saves the pandas DataFrame object to the Time Series aggregation
         :param resource: the resource containing the aggregation
@@ -584,6 +892,7 @@ class TimeseriesAggregation(DataObjectSupportingAggregation):
         :param destination_path: the destination path in Hydroshare to save the new aggregation
         :return: the updated or new Time Series aggregation
         """
+        from hsmodels.schemas.enums import AggregationType
         self._validate_aggregation_for_update(resource, AggregationType.TimeSeriesAggregation)
         file_path = self._validate_aggregation_path(agg_path, for_save_data=True)
         with closing(sqlite3.connect(file_path)) as conn:
@@ -657,6 +966,7 @@ class GeoFeatureAggregation(DataObjectSupportingAggregation):
         :param agg_path: the path to the Geo Feature aggregation
         :return: the Geo Feature aggregation as a fiona Collection object
         """
+        fiona = optional_import('fiona')
         if fiona is None:
             raise Exception("fiona package was not found")
         return self._get_data_object(agg_path=agg_path, func=fiona.open)
@@ -671,6 +981,8 @@ class GeoFeatureAggregation(DataObjectSupportingAggregation):
         :param destination_path: the destination path in Hydroshare to save the new aggregation
         :return: the updated or new Geo Feature aggregation
         """
+        from hsmodels.schemas.enums import AggregationType
+
         def upload_shape_files(main_file_path, dst_path=""):
             shp_file_dir_path = os.path.dirname(main_file_path)
             filename_starts_with = f"{pathlib.Path(main_file_path).stem}."
@@ -795,6 +1107,7 @@ class GeoRasterAggregation(DataObjectSupportingAggregation):
         :param agg_path: the path to the Geo Raster aggregation
         :return: the Geo Raster aggregation as a rasterio DatasetReader object
         """
+        rasterio = optional_import('rasterio')
         if rasterio is None:
             raise Exception("rasterio package was not found")
         return self._get_data_object(agg_path=agg_path, func=rasterio.open)
@@ -809,6 +1122,8 @@ class GeoRasterAggregation(DataObjectSupportingAggregation):
         :param destination_path: the destination path in Hydroshare to save the new aggregation
         :return: the updated or new Geo Raster aggregation
         """
+        from hsmodels.schemas.enums import AggregationType
+
         def upload_raster_files(dst_path=""):
             raster_files = []
             for item in os.listdir(agg_path):
@@ -877,6 +1192,7 @@ class CSVAggregation(DataObjectSupportingAggregation):
         :param agg_path: the path to the Time Series aggregation
         :return: the CSV aggregation as a pandas DataFrame object
         """
+        pandas = optional_import('pandas')
         if pandas is None:
             raise Exception("pandas package not found")
 
@@ -885,7 +1201,6 @@ class CSVAggregation(DataObjectSupportingAggregation):
 
     def save_data_object(self, resource: 'Resource', agg_path: str, as_new_aggr: bool = False,
                          destination_path: str = "") -> 'Aggregation':
-
         """
         Saves the pandas DataFrame object to the CSV aggregation
         :param resource: the resource containing the aggregation
@@ -894,6 +1209,7 @@ class CSVAggregation(DataObjectSupportingAggregation):
         :param destination_path: the destination path in Hydroshare to save the new aggregation
         :return: the updated or new CSV aggregation
         """
+        from hsmodels.schemas.enums import AggregationType
         self._validate_aggregation_for_update(resource, AggregationType.CSVFileAggregation)
         file_path = self._validate_aggregation_path(agg_path, for_save_data=True)
         self._data_object.to_csv(file_path, index=False)
@@ -939,9 +1255,32 @@ class Resource(Aggregation):
         path = urlparse(str(self.metadata.identifier)).path
         return '/hsapi' + path
 
-    def _upload(self, file, destination_path):
+    def _upload(self, file, destination_path, progress=None):
         path = urljoin(self._hsapi_path, "files", destination_path.strip("/"))
-        self._hs_session.upload_file(path, files={'file': open(file, 'rb')}, status_code=201)
+        with open(file, 'rb') as f:
+            self._hs_session.upload_file(path, files={'file': (file, f)}, status_code=201, progress=progress)
+
+    def _upload_parallel(self, files, destination_path, progress=None):
+        if progress is not None:
+            progress = AggregateProgress(progress, {file: os.path.getsize(file) for file in files})
+        with ThreadPoolExecutor(max_workers=min(len(files), self._hs_session.max_workers)) as executor:
+            futures = [
+                executor.submit(
+                    self._upload, file, destination_path, progress.tracker(file) if progress is not None else None
+                )
+                for file in files
+            ]
+            for future in futures:
+                future.result()
+
+    def _upload_zip(self, files, destination_path, progress=None):
+        path = urljoin(self._hsapi_path, "files", destination_path.strip("/"))
+        zipped = zip_stream(files, chunk_size=self._hs_session.upload_chunk_size)
+        self._hs_session.upload_file(
+            path, files={'file': ('files.zip', zipped, 'application/zip')}, status_code=201, progress=progress
+        )
+        unzip_path = urljoin(self._hsapi_path, "functions", "unzip", "data", "contents", destination_path, 'files.zip')
+        self._hs_session.post(unzip_path, status_code=200, data={"overwrite": "true", "ingest_metadata": "true"})
 
     def _delete_file(self, path) -> None:
         path = urljoin(self._hsapi_path, "files", path)
@@ -954,6 +1293,86 @@ class Resource(Aggregation):
         path = urljoin(self._hsapi_path, "folders", path)
         self._hs_session.delete(path, status_code=200)
 
+    # local updates
+
+    def _renamed(self, path: str, new_path: str) -> None:
+        """Updates the loaded files and aggregations after the file or folder at path was moved to new_path"""
+        path, new_path = path.strip("/"), new_path.strip("/")
+
+        def rename(file):
+            if file != path and not file.startswith(path + "/"):
+                return file
+            renamed = new_path + file[len(path):]
+            return File(renamed, file.url[: len(file.url) - len(file)] + renamed, file.checksum)
+
+        self._changed(sources=[path], targets=[new_path], update=rename)
+
+    def _deleted(self, path: Optional[str]) -> None:
+        """Updates the loaded files and aggregations after the file or folder at path was deleted"""
+        if not path:
+            self.refresh()
+            return
+        path = path.strip("/")
+        self._changed(sources=[path], update=lambda file: None if _overlaps(file, path) else file)
+
+    def _changed(
+        self,
+        sources: Iterable[str] = (),
+        targets: Iterable[str] = (),
+        update: Callable[[File], Optional[File]] = None,
+        aggregations_created: bool = False,
+    ) -> None:
+        """
+        Updates the loaded files and aggregations after the files or folders at sources were changed on HydroShare,
+        moved to targets when there are targets.  The metadata is kept, the other documents of the resource are
+        revalidated on their next retrieval.
+        :param sources: the changed paths, deleted or moved paths included
+        :param targets: the paths created, moved to included
+        :param update: returns each loaded file as changed, None for a deleted file.  The files are parsed from a new
+            resource map on next access when there is no update or the change may involve an aggregation.
+        :param aggregations_created: whether the change may have created aggregations
+        """
+        sources = [path.strip("/") for path in sources]
+        targets = [path.strip("/") for path in targets]
+        self._hs_session.expire(self._map_path[: len("/resource/b4ce17c17c654a5c8004af73f2df87ab/")])
+        self._retrieved_map_model = None
+        self._parsed_checksums = None
+
+        files = self._parsed_files
+        aggregation_paths = self._aggregation_map_paths()
+        if (
+            update is None
+            or files is None
+            or aggregation_paths is None
+            # a path not among the files is in an aggregation
+            or not all(any(_overlaps(path, file) for file in files) for path in sources)
+            # a file moved into the folder of an aggregation may be added to the aggregation
+            or any(_overlaps(path, _contents_folder(map_path)) for path in targets for map_path in aggregation_paths)
+        ):
+            self._parsed_files = None
+        else:
+            self._parsed_files = [changed for changed in map(update, files) if changed is not None]
+
+        # the changes to aggregations aren't known locally, changed aggregations are loaded again on next access
+        aggregations = self._parsed_aggregations
+        if aggregations is not None:
+            unchanged = [aggregation for aggregation in aggregations if not aggregation._changed_by(sources + targets)]
+            if len(unchanged) < len(aggregations) or aggregations_created:
+                self._reusable_aggregations = {aggregation._map_path: aggregation for aggregation in unchanged}
+                self._parsed_aggregations = None
+
+        if self._parsed_files is None or self._parsed_aggregations is None:
+            # files and aggregations not loaded are parsed from a new resource map
+            self._retrieved_map = None
+
+    def _aggregation_map_paths(self) -> Optional[List[str]]:
+        """The resource map paths of the aggregations in the loaded resource, None when nothing is loaded"""
+        if self._parsed_aggregations is not None:
+            return [aggregation._map_path for aggregation in self._parsed_aggregations]
+        if self._retrieved_map is not None:
+            return [unquote(urlparse(file).path) for file in self._retrieved_map.files if is_aggregation(file)]
+        return None
+
     # system information
 
     @property
@@ -961,6 +1380,10 @@ class Resource(Aggregation):
         """The resource id (guid) of the HydroShare resource"""
         return self._map.identifier
 
+    def _document_paths(self) -> Tuple[Optional[str], Optional[str]]:
+        resource_path = self._map_path.split("/data/", 1)[0]
+        return urljoin(resource_path, "data", "resourcemetadata.xml"), urljoin(resource_path, "manifest-md5.txt")
+
     @property
     def metadata_file(self):
         """The path to the metadata file"""
@@ -974,6 +1397,29 @@ class Resource(Aggregation):
         hsapi_path = urljoin(self._hsapi_path, 'sysmeta')
         return self._hs_session.get(hsapi_path, status_code=200).json()
 
+    def snapshot(self, path: str) -> None:
+        """
+        Saves the resource to a snapshot file with its metadata, files and aggregations (including their metadata)
+        loaded, so HydroShare.resource_from_snapshot restores it without retrieving or parsing any documents.
+        Snapshots are pickles, only restore snapshots from a trusted source.
+        :param path: The path of the snapshot file
+        :return: None
+        """
+        # the modification time is read first, so a change made while loading makes the snapshot stale
+        date_last_updated = self.system_metadata()['date_last_updated']
+        self._load_all()
+        header = {
+            'format': SNAPSHOT_FORMAT_VERSION,
+            'hsclient': VERSION,
+            'resource_id': self.resource_id,
+            'date_last_updated': date_last_updated,
+        }
+        partial_path = path + '.part'
+        with open(partial_path, 'wb') as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial_path, path)
+
     # access operations
 
     def set_sharing_status(self, public: bool):
@@ -1007,6 +1453,13 @@ class Resource(Aggregation):
         resource_id = response.text
         return Resource("/resource/{}/data/resourcemap.xml".format(resource_id), self._hs_session)
 
+    def submit_new_version(self) -> Future:
+        """
+        Creates a new version of the resource on HydroShare without blocking
+        :return: A Future of the Resource object of the new version, completing once HydroShare serves its resource map
+        """
+        return self._when_ready(self.new_version())
+
     def copy(self):
         """
         Copies this Resource into a new resource on HydroShare
@@ -1017,6 +1470,28 @@ class Resource(Aggregation):
         resource_id = response.text
         return Resource("/resource/{}/data/resourcemap.xml".format(resource_id), self._hs_session)
 
+    def submit_copy(self) -> Future:
+        """
+        Copies this Resource into a new resource on HydroShare without blocking
+        :return: A Future of the Resource object of the copy, completing once HydroShare serves its resource map
+        """
+        return self._when_ready(self.copy())
+
+    def _when_ready(self, resource: 'Resource') -> Future:
+        """Watches for the resource map of a resource being created in the background to become available"""
+        session = self._hs_session
+        url = encode_resource_url(session._build_url(resource._map_path))
+
+        def resource_is_ready():
+            with closing(session.request("GET", url, allow_redirects=True, stream=True)) as response:
+                if response.status_code == 200:
+                    return True, resource
+                if response.status_code == 404:
+                    return False, None
+                raise Exception("Failed GET {}, status_code {}".format(url, response.status_code))
+
+        return session.task_watcher.watch(resource_is_ready, f"resource {resource._map_path}")
+
     def download(self, save_path: str = "") -> str:
         """
         Downloads a zipped bagit archive of the resource from HydroShare
@@ -1025,6 +1500,14 @@ class Resource(Aggregation):
         """
         return self._hs_session.retrieve_bag(self._hsapi_path, save_path=save_path)
 
+    def submit_download(self, save_path: str = "") -> Future:
+        """
+        Downloads a zipped bagit archive of the resource from HydroShare without blocking
+        param save_path: A local path to save the bag to, defaults to the current working directory
+        returns: A Future of the relative pathname of the download
+        """
+        return self._hs_session.submit_bag(self._hsapi_path, save_path=save_path)
+
     @refresh
     def delete(self) -> None:
         """
@@ -1040,13 +1523,37 @@ class Resource(Aggregation):
         Saves the metadata to HydroShare
         :return: None
         """
+        from hsmodels.schemas import rdf_string
         metadata_string = rdf_string(self._retrieved_metadata, rdf_format="xml")
         path = urljoin(self._hsapi_path, "ingest_metadata")
         self._hs_session.upload_file(path, files={'file': ('resourcemetadata.xml', metadata_string)})
 
+    def batch(self, raise_errors: bool = True) -> Batch:
+        """
+        Groups operations on this resource.  Within a with block on the batch, the methods of the resource taking a
+        refresh parameter are queued rather than called and return a Future of their result.  On exit the queued
+        operations are run, concurrently when they are on separate files and folders and in order when they are not,
+        and the resource is refreshed once.  The outcome of each operation is in the operations of the batch.  The
+        Future of a queued file_aggregate is of None, look up the new aggregation once the batch has exited.
+
+            with resource.batch() as batch:
+                resource.file_rename("a.txt", "folder/a.txt")
+                resource.file_delete("b.txt")
+            errors = batch.errors
+
+        :param raise_errors: Defaults to True, raises an Exception on exit when an operation failed.  Set to False to
+            only report errors in the operations of the batch.
+        :return: a Batch context manager
+        """
+        return Batch(self, raise_errors=raise_errors)
+
     # referenced content operations
 
-    @refresh
+    @updates(
+        lambda self, file_name, url, path='': self._changed(
+            targets=[urljoin(path, file_name)], aggregations_created=True
+        )
+    )
     def reference_create(self, file_name: str, url: str, path: str = '') -> None:
         """
         Creates a HydroShare reference object to reference content outside of the resource
@@ -1062,7 +1569,7 @@ class Resource(Aggregation):
             status_code=200,
         )
 
-    @refresh
+    @updates(lambda self, file_name, url, path='': self._changed(sources=[urljoin(path, file_name)]))
     def reference_update(self, file_name: str, url: str, path: str = '') -> None:
         """
         Updates a HydroShare reference object
@@ -1080,7 +1587,7 @@ class Resource(Aggregation):
 
     # file operations
 
-    @refresh
+    @updates(lambda self, folder: self._changed(targets=[folder], update=lambda file: file))
     def folder_create(self, folder: str) -> None:
         """
         Creates a folder on HydroShare
@@ -1090,7 +1597,7 @@ class Resource(Aggregation):
         path = urljoin(self._hsapi_path, "folders", folder)
         self._hs_session.put(path, status_code=201)
 
-    @refresh
+    @updates(lambda self, path, new_path: self._renamed(path, new_path))
     def folder_rename(self, path: str, new_path: str) -> None:
         """
         Renames a folder on HydroShare
@@ -1098,9 +1605,9 @@ class Resource(Aggregation):
         :param new_path: the new path folder name
         :return: None
         """
-        self.file_rename(path=path, new_path=new_path)
+        self.file_rename(path=path, new_path=new_path, refresh=False)
 
-    @refresh
+    @updates(lambda self, path=None: self._deleted(path))
     def folder_delete(self, path: str = None) -> None:
         """
         Deletes a folder on HydroShare
@@ -1120,12 +1627,39 @@ class Resource(Aggregation):
             urljoin(self._resource_path, "data", "contents", path), save_path, params={"zipped": "true"}
         )
 
-    def file_download(self, path: str, save_path: str = "", zipped: bool = False):
+    def submit_folder_download(self, path: str, save_path: str = "") -> Future:
         """
-        Downloads a file from HydroShare
+        Downloads a folder from HydroShare without blocking, the folder is zipped by a task on HydroShare
+        :param path: The path to folder
+        :param save_path: The local path to save the download to, defaults to the current directory
+        :return: A Future of the path to the download zipped folder
+        """
+        return self._hs_session.submit_zip(
+            urljoin(self._resource_path, "data", "contents", path), save_path, params={"zipped": "true"}
+        )
+
+    def submit_file_download(
+        self, path: str, save_path: str = "", zipped: bool = False, segments: int = 1, verify: bool = False
+    ) -> Future:
+        """
+        Downloads a file from HydroShare on the executor of the session, see file_download for the parameters
+        :return: A Future of the downloaded file path
+        """
+        return self._hs_session.executor.submit(self.file_download, path, save_path, zipped, segments, verify)
+
+    def file_download(
+        self, path: str, save_path: str = "", zipped: bool = False, segments: int = 1, verify: bool = False
+    ):
+        """
+        Downloads a file from HydroShare.  An interrupted download leaves a .part file next to the save path which
+        the next call to download the same file resumes from.
         :param path: The path to the file
         :param save_path: The local path to save the file to
         :param zipped: Defaults to False, set to True to download the file zipped
+        :param segments: Defaults to 1, set to a larger number to download large files as that many concurrent byte
+            ranges.  A single stream is used when the server does not support Range requests.
+        :param verify: Defaults to False, set to True to verify the download against the md5 checksum in the
+            resource manifest
         :return: The path to the downloaded file
         """
         if zipped:
@@ -1133,9 +1667,14 @@ class Resource(Aggregation):
                 urljoin(self._resource_path, "data", "contents", path), save_path, params={"zipped": "true"}
             )
         else:
-            return self._hs_session.retrieve_file(urljoin(self._resource_path, "data", "contents", path), save_path)
+            checksum = None
+            if verify:
+                checksum = self._checksums.get(quote(urljoin("data", "contents", path)))
+            return self._hs_session.retrieve_file(
+                urljoin(self._resource_path, "data", "contents", path), save_path, segments=segments, checksum=checksum
+            )
 
-    @refresh
+    @updates(lambda self, path=None: self._deleted(path))
     def file_delete(self, path: str = None) -> None:
         """
         Delete a file on HydroShare
@@ -1144,7 +1683,7 @@ class Resource(Aggregation):
         """
         self._delete_file(path)
 
-    @refresh
+    @updates(lambda self, path, new_path: self._renamed(path, new_path))
     def file_rename(self, path: str, new_path: str) -> None:
         """
         Rename a file on HydroShare
@@ -1185,7 +1724,7 @@ class Resource(Aggregation):
             unzip_path, status_code=200, data={"overwrite": overwrite, "ingest_metadata": ingest_metadata}
         )
 
-    def file_aggregate(self, path: str, agg_type: AggregationType, refresh: bool = True):
+    def file_aggregate(self, path: str, agg_type: 'AggregationType', refresh: bool = True):
         """
         Aggregate a file to a HydroShare aggregation type.  Aggregating files allows you to specify metadata specific
         to the files associated with the aggregation.  To set a FileSet aggregation, include the path to the folder or
@@ -1193,8 +1732,12 @@ class Resource(Aggregation):
         :param path: The path to the file to aggregate
         :param agg_type: The AggregationType to create
         :param refresh: Defaults True, toggles automatic refreshing of the updated resource in HydroShare
-        :return: The newly created Aggregation object if refresh is True
+        :return: The newly created Aggregation object if refresh is True, within a batch a Future of None
         """
+        if self._batch is not None and self._batch.queues():
+            # the batch refreshes once all its operations are run, the aggregation is looked up after the batch
+            return self._batch.queue(Resource.file_aggregate, (self, path, agg_type), {"refresh": False})
+        from hsmodels.schemas.enums import AggregationType
         type_value = agg_type.value
         data = {}
         if agg_type == AggregationType.SingleFileAggregation:
@@ -1214,28 +1757,35 @@ class Resource(Aggregation):
             return self.aggregation(file__path=path)
 
     @refresh
-    def file_upload(self, *files: str, destination_path: str = "") -> None:
+    def file_upload(
+        self,
+        *files: str,
+        destination_path: str = "",
+        progress: Callable[[UploadProgress], None] = None,
+        strategy: Union[UploadStrategy, str] = UploadStrategy.AUTO,
+    ) -> None:
         """
-        Uploads files to a folder in HydroShare
+        Uploads files to a folder in HydroShare.  File contents are streamed from disk rather than read into memory.
         :param *files: The local file paths to upload
         :param destination_path: The path on HydroShare to upload the files to, defaults to the root contents directory
+        :param progress: An optional callback called with an UploadProgress (bytes_sent, total_bytes, elapsed and
+            throughput) as the upload is sent.  It runs on the uploading thread, so sleeping in it throttles the upload.
+        :param strategy: How multiple files are sent.  "zip" streams a zip archive of the files, compressed as it is
+            sent, and unzips it on HydroShare.  "parallel" uploads each file in a concurrent request.  Defaults to
+            "auto", which zips files HydroShare groups into aggregations or ingests as metadata and many small files,
+            and uploads larger files in parallel.
         :return: None
         """
         if len(files) == 1:
-            self._upload(files[0], destination_path=destination_path)
+            self._upload(files[0], destination_path=destination_path, progress=progress)
+            return
+        strategy = UploadStrategy(strategy)
+        if strategy == UploadStrategy.AUTO:
+            strategy = choose_upload_strategy(files)
+        if strategy == UploadStrategy.PARALLEL:
+            self._upload_parallel(files, destination_path, progress)
         else:
-            with tempfile.TemporaryDirectory() as tmpdir:
-                zipped_file = os.path.join(tmpdir, 'files.zip')
-                with ZipFile(zipped_file, 'w') as zipped:
-                    for file in files:
-                        zipped.write(file, os.path.basename(file))
-                self._upload(zipped_file, destination_path=destination_path)
-                unzip_path = urljoin(
-                    self._hsapi_path, "functions", "unzip", "data", "contents", destination_path, 'files.zip'
-                )
-                self._hs_session.post(
-                    unzip_path, status_code=200, data={"overwrite": "true", "ingest_metadata": "true"}
-                )
+            self._upload_zip(files, destination_path, progress)
         # TODO, return those files?
 
     # aggregation operations
@@ -1265,6 +1815,25 @@ class Resource(Aggregation):
         :param  dst_path: The target file path to move the aggregation to - target folder must exist
         :return: None
         """
+        self._start_aggregation_move(aggregation, dst_path).result()
+        aggregation.refresh()
+
+    def submit_aggregation_move(self, aggregation: Aggregation, dst_path: str = "") -> Future:
+        """
+        Moves an aggregation without blocking, the move task is waited on by the task watcher of the session.
+        :param aggregation: The aggregation object to move
+        :param  dst_path: The target file path to move the aggregation to - target folder must exist
+        :return: A Future completing once the aggregation was moved and the resource refreshed
+        """
+
+        def refresh_moved(_):
+            aggregation.refresh()
+            self.refresh()
+
+        moved = self._start_aggregation_move(aggregation, dst_path)
+        return chain(moved, refresh_moved, self._hs_session.executor)
+
+    def _start_aggregation_move(self, aggregation: Aggregation, dst_path: str) -> Future:
         path = urljoin(
             aggregation._hsapi_path,
             aggregation.metadata.type.value + "LogicalFile",
@@ -1276,11 +1845,7 @@ class Resource(Aggregation):
         response = aggregation._hs_session.post(path, status_code=200)
         json_response = response.json()
         task_id = json_response['id']
-        status, _ = self._hs_session.check_task(task_id)
-        while status != 'true':
-            status, _ = self._hs_session.check_task(task_id)
-            time.sleep(CHECK_TASK_PING_INTERVAL)
-        aggregation.refresh()
+        return self._hs_session.watch_task(task_id)
 
     @refresh
     def aggregation_delete(self, aggregation: Aggregation) -> None:
@@ -1291,15 +1856,53 @@ class Resource(Aggregation):
         """
         aggregation.delete()
 
-    def aggregation_download(self, aggregation: Aggregation, save_path: str = "", unzip_to: str = None) -> str:
+    def aggregation_download(
+        self, aggregation: Aggregation, save_path: str = "", unzip_to: str = None, verify: bool = False
+    ) -> str:
         """
         Download an aggregation from HydroShare
         :param aggregation: The aggregation to download
         :param save_path: The local path to save the aggregation to, defaults to the current directory
         :param unzip_to: If set, the resulting download will be unzipped to the specified path
+        :param verify: Defaults to False, set to True to verify the unzipped aggregation files against the md5
+            checksums in the resource manifest.  Only applies when unzip_to is set.
         :return: None
         """
-        return aggregation._download(save_path=save_path, unzip_to=unzip_to)
+        return aggregation._download(save_path=save_path, unzip_to=unzip_to, verify=verify)
+
+    def submit_aggregation_download(
+        self, aggregation: Aggregation, save_path: str = "", unzip_to: str = None, verify: bool = False
+    ) -> Future:
+        """
+        Download an aggregation from HydroShare without blocking, see aggregation_download for the parameters
+        :return: A Future of the path of the downloaded zip, or unzip_to when it is set
+        """
+        return aggregation._submit_download(save_path=save_path, unzip_to=unzip_to, verify=verify)
+
+
+def _content_length(headers) -> Optional[int]:
+    try:
+        return int(headers['Content-Length'])
+    except (KeyError, ValueError):
+        return None
+
+
+class PoolAdapter(HTTPAdapter):
+    """
+    An HTTPAdapter applying a default timeout to every request and optionally closing connections after each request
+    :param timeout: the default timeout in seconds, or a (connect, read) tuple, used when a request doesn't set one
+    :param keep_alive: Defaults True, set to False to close each connection after its response
+    """
+
+    def __init__(self, *args, timeout=None, keep_alive=True, **kwargs):
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if not self.keep_alive:
+            request.headers['Connection'] = 'close'
+        return super().send(request, timeout=timeout if timeout is not None else self.timeout, **kwargs)
 
 
 class HydroShareSession:
@@ -1312,21 +1915,65 @@ class HydroShareSession:
         username: str = None,
         password: str = None,
         client_id: str = None,
-        token: Union[Token, Dict[str, str]] = None,
+        token: Union['Token', Dict[str, str]] = None,
+        download_chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        polling: PollingStrategy = None,
+        max_workers: int = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = None,
+        keep_alive: bool = True,
+        timeout: Union[float, Tuple[float, float]] = None,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY_POLICY,
+        circuit_breaker: CircuitBreaker = None,
+        hooks: Iterable[RequestHook] = (),
+        cache: DiskCache = None,
+        rate_limiter: RateLimiter = None,
+        executor: Executor = None,
     ):
         self._host = host
         self._protocol = protocol
         self._port = port
         self._client_id = client_id
         self._token = token
+        self.download_chunk_size = download_chunk_size
+        self.upload_chunk_size = UPLOAD_CHUNK_SIZE
+        self.resume_attempts = DOWNLOAD_RESUME_ATTEMPTS
+        self.polling = polling if polling is not None else PollingStrategy()
+        self.task_timings: Deque[TaskTiming] = deque(maxlen=TASK_TIMINGS_LIMIT)
+        # (path, parse) -> (conditional request headers, parsed document) of documents with validators, least recent
+        # first, a document parsed by different functions is kept once per function
+        self._validated: OrderedDict = OrderedDict()
+        self._validated_lock = threading.Lock()
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self._task_watcher = None
+        self._executor = executor
+        self._task_watcher_lock = threading.Lock()
+        self._in_flight: Dict[Tuple, Future] = {}
+        self._in_flight_lock = threading.Lock()
+        # path prefix -> the time documents under it were expired, within the ttl of the cache
+        self._expired: Dict[str, float] = {}
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.hooks: List[RequestHook] = list(hooks)
+        self._retry_stats = Counter()
+        self._retry_stats_lock = threading.Lock()
+        # size the pool so every worker thread of the client can hold a connection
+        pool_maxsize = max(pool_maxsize or DEFAULT_POOL_MAXSIZE, self.max_workers)
+        self._adapter = PoolAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, timeout=timeout, keep_alive=keep_alive
+        )
         if client_id or token:
             if not token or not client_id:
                 raise ValueError("Oauth2 requires both token and client_id be provided")
             else:
+                from requests_oauthlib import OAuth2Session
+
                 token = self._validate_oauth2_token(token)
-                self._session = OAuth2Session(client_id=client_id, token=token)
+                self._session = self._mount(OAuth2Session(client_id=client_id, token=token))
         else:
-            self._session = requests.Session()
+            self._session = self._mount(requests.Session())
             default_agent = self._session.headers['User-Agent']
             self._session.headers['User-Agent'] = f'{default_agent} (hsclient {VERSION})'
 
@@ -1335,14 +1982,21 @@ class HydroShareSession:
 
             self.set_auth((username, password))
 
+    def _mount(self, session: requests.Session) -> requests.Session:
+        """Mounts the pooled adapter on session, sessions sharing the adapter share its connection pool"""
+        session.mount("https://", self._adapter)
+        session.mount("http://", self._adapter)
+        return session
+
     def set_auth(self, auth):
         if self._client_id:
             raise NotImplementedError(f"This session is an Oauth2 session and does not provide the set_oauth method")
         self._session.auth = auth
 
-    def set_oauth(self, client_id: str, token: Union[Token, Dict[str, str]]):
+    def set_oauth(self, client_id: str, token: Union['Token', Dict[str, str]]):
+        from requests_oauthlib import OAuth2Session
         token = self._validate_oauth2_token(token)
-        self._session = OAuth2Session(client_id=client_id, token=token)
+        self._session = self._mount(OAuth2Session(client_id=client_id, token=token))
 
     @property
     def host(self):
@@ -1357,36 +2011,225 @@ class HydroShareSession:
         return self.base_url + path
 
     def retrieve_string(self, path):
-        file = self.get(path, status_code=200, allow_redirects=True)
-        return file.content.decode()
+        return self.retrieve_parsed(path, str)
+
+    def retrieve_parsed(self, path, parse: Callable[[str], Any]):
+        """
+        Retrieves a document and parses it.  The validators (ETag and Last-Modified) of the response are kept with the
+        parsed document, so retrieving the document again sends a conditional request and reuses the parsed document
+        when HydroShare responds 304 Not Modified.  With a DiskCache, a document cached within its ttl is used
+        without a request unless it was expired, see expire.
+        Concurrent retrievals of the same document share a single request and parse.
+        :param path: the path of the document
+        :param parse: parses the document string, the result must not be modified by callers as it is shared
+        :return: the parsed document
+        """
+        return self._single_flight((path, parse), lambda: self._retrieve_parsed(path, parse))
+
+    def _single_flight(self, key, call):
+        """Calls call unless a call with the same key is in flight, in which case its result is waited on instead"""
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+        if not leader:
+            return future.result()
+        try:
+            result = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
 
-    def retrieve_file(self, path, save_path=""):
-        file = self.get(path, status_code=200, allow_redirects=True)
-        return self.write_file(path, file.content, save_path)
+    def _retrieve_parsed(self, path, parse):
+        url = encode_resource_url(self._build_url(path))
+        key = (path, parse)
+        with self._validated_lock:
+            validated = self._validated.get(key)
+        cache_key = self._cache_key(url)
+        entry = self.cache.get(cache_key) if self.cache is not None else None
+        if entry is not None and self.cache.is_fresh(entry) and entry.stored_at > self._expired_at(path):
+            if validated and entry.validators and validated[0] == entry.validators:
+                return validated[1]
+            return self._remember(key, entry.validators, parse(entry.body.decode()))
+        if entry is not None:
+            validators = entry.validators
+        else:
+            validators = validated[0] if validated else {}
+        response = self.request("GET", url, headers=dict(validators), allow_redirects=True)
+        if response.status_code == 304 and validators:
+            if entry is not None:
+                self.cache.touch(cache_key)
+            if validated and validated[0] == validators:
+                return self._remember(key, validators, validated[1])
+            if entry is not None:
+                return self._remember(key, validators, parse(entry.body.decode()))
+        if response.status_code != 200:
+            raise Exception(
+                "Failed GET {}, status_code {}, message {}".format(url, response.status_code, response.content)
+            )
+        validators = {}
+        if 'ETag' in response.headers:
+            validators['If-None-Match'] = response.headers['ETag']
+        if 'Last-Modified' in response.headers:
+            validators['If-Modified-Since'] = response.headers['Last-Modified']
+        if self.cache is not None:
+            self.cache.set(cache_key, response.content, validators)
+        return self._remember(key, validators, parse(response.content.decode()))
+
+    def _cache_key(self, url) -> str:
+        """
+        The key of the document at url in the DiskCache.  Documents retrieved with credentials are keyed by a digest of
+        the credentials too, so they are only shared with sessions authenticated the same way.
+        """
+        token = getattr(self._session, 'token', None)
+        if token:
+            credentials = f"token:{token.get('access_token')}"
+        elif isinstance(self._session.auth, tuple):
+            credentials = "basic:{}:{}".format(*self._session.auth)
+        elif self._session.auth is not None:
+            # credentials which can't be identified are not shared with other sessions
+            credentials = f"session:{id(self._session)}:{os.getpid()}"
+        else:
+            return url
+        return f"{url}#{credentials_digest(credentials)}"
+
+    def _remember(self, key, validators, parsed):
+        """Keeps a parsed document with its validators, documents without validators can't be revalidated"""
+        with self._validated_lock:
+            if validators:
+                self._validated[key] = (validators, parsed)
+                self._validated.move_to_end(key)
+                while len(self._validated) > VALIDATED_DOCUMENTS_LIMIT:
+                    self._validated.popitem(last=False)
+            else:
+                self._validated.pop(key, None)
+        return parsed
+
+    def expire(self, prefix: str) -> None:
+        """
+        Expires the cached documents with paths starting with prefix, so they are revalidated with HydroShare on their
+        next retrieval even when they are within the ttl of the cache
+        """
+        if self.cache is None:
+            # only documents of the DiskCache are used without revalidation
+            return
+        prefix = "/" + prefix.strip("/")
+        now = time.time()
+        with self._validated_lock:
+            # kept in the order they were expired, an expiry older than the ttl no longer applies as every document
+            # cached before it is revalidated anyway
+            self._expired.pop(prefix, None)
+            self._expired[prefix] = now
+            for expired_prefix, at in list(self._expired.items()):
+                if now - at < self.cache.ttl:
+                    break
+                del self._expired[expired_prefix]
+
+    def _expired_at(self, path) -> float:
+        path = "/" + path.strip("/")
+        with self._validated_lock:
+            return max((at for prefix, at in self._expired.items() if path.startswith(prefix)), default=0.0)
+
+    def retrieve_file(self, path, save_path="", segments=1, checksum=None):
+        response = self.get(path, status_code=200, allow_redirects=True, stream=True)
+        filename = path.split("/")[-1]
+        downloaded_file = os.path.join(save_path, filename)
+        # an interrupted single stream download is resumed rather than restarted in segments
+        if segments > 1 and not os.path.exists(downloaded_file + ".part"):
+            size = int(response.headers.get('Content-Length', 0))
+            if accepts_ranges(response) and size >= 2 * self.download_chunk_size:
+                # the ranges are requested from the final url so redirects are only followed once
+                url = response.url
+                response.close()
+                if self._retrieve_segments(url, downloaded_file, size, segments, checksum):
+                    return downloaded_file
+                response = self.request("GET", url, stream=True)
+                if response.status_code != 200:
+                    raise Exception(
+                        "Failed GET {}, status_code {}, message {}".format(url, response.status_code, response.content)
+                    )
+        return self.stream_to_file(response, downloaded_file, checksum=checksum, resume=True)
+
+    def _retrieve_segments(self, url, downloaded_file, size, segments, checksum=None):
+        """
+        Downloads url as concurrent byte ranges written in place to a preallocated file.  Segments arrive out of
+        order, so a checksum is verified with a read of the completed file.
+        :return: True if the file was downloaded, False if the server did not honor the Range requests
+        """
+        segment_size = -(-size // segments)
+        ranges = [(start, min(start + segment_size, size) - 1) for start in range(0, size, segment_size)]
+        part_file = downloaded_file + ".segments"
+
+        def retrieve_segment(byte_range):
+            start, end = byte_range
+            headers = {'Range': f'bytes={start}-{end}'}
+            with closing(self.request("GET", url, headers=headers, stream=True)) as response:
+                if response.status_code != 206:
+                    return False
+                with open(part_file, 'r+b') as f:
+                    f.seek(start)
+                    for chunk in response.iter_content(chunk_size=self.download_chunk_size):
+                        f.write(chunk)
+                        self._throttle(url, len(chunk))
+                    if f.tell() != end + 1:
+                        raise Exception(f"Failed GET {url}, incomplete range {start}-{end}")
+            return True
+
+        with open(part_file, 'wb') as f:
+            f.truncate(size)
+        try:
+            with ThreadPoolExecutor(max_workers=min(len(ranges), self.max_workers)) as executor:
+                honored = all(executor.map(retrieve_segment, ranges))
+            if honored and checksum:
+                md5 = file_md5(part_file, self.download_chunk_size).hexdigest()
+                if md5 != checksum:
+                    raise Exception(f"Failed GET {url}, md5 checksum {md5} does not match {checksum}")
+        except BaseException:
+            os.remove(part_file)
+            raise
+        if not honored:
+            os.remove(part_file)
+            return False
+        os.replace(part_file, downloaded_file)
+        return True
 
     def retrieve_bag(self, path, save_path=""):
         print(f"Retrieving {path}")
-        response = self.get(path, status_code=200, allow_redirects=True)
+        response = self.task_watcher.watch(self._bag_poll(path), f"bag {path}").result()
+        return self._save_bag(response, path, save_path)
 
-        file_is_ready = False
-        content_type = response.headers['Content-Type']
+    def submit_bag(self, path, save_path="") -> Future:
+        """
+        Non-blocking retrieve_bag, the bag is waited on by the task watcher and downloaded on the executor
+        :return: a Future of the local path of the downloaded bag
+        """
+        ready = self.task_watcher.watch(self._bag_poll(path), f"bag {path}")
+        return chain(ready, lambda response: self._save_bag(response, path, save_path), self.executor)
 
-        if content_type == "application/zip":
-            # if the path doesn't end with .zip, add it
-            if not path.endswith(".zip"):
-                path += ".zip"
-            file_is_ready = True
-        if content_type == "binary/octet-stream":
-            # here we assume that the stream is a zip file
-            if not path.endswith(".zip"):
-                path += ".zip"
-            file_is_ready = True
+    def _bag_poll(self, path):
+        def bag_is_ready():
+            response = self.get(path, status_code=200, allow_redirects=True, stream=True)
+            # a zip content type means the bag has been created, here we assume an octet-stream is a zip file
+            if response.headers['Content-Type'] in ("application/zip", "binary/octet-stream"):
+                return True, response
+            response.close()
+            return False, None
 
-        if not file_is_ready:
-            time.sleep(CHECK_TASK_PING_INTERVAL)
-            return self.retrieve_bag(path, save_path)
+        return bag_is_ready
 
-        return self.write_file(path, response.content, save_path)
+    def _save_bag(self, response, path, save_path):
+        filename = path.split("/")[-1]
+        # if the path doesn't end with .zip, add it
+        if not filename.endswith(".zip"):
+            filename += ".zip"
+        return self.stream_to_file(response, os.path.join(save_path, filename))
 
     def write_file(self, path, content, save_path=""):
         filename = path.split("/")[-1]
@@ -1395,23 +2238,213 @@ class HydroShareSession:
             f.write(content)
         return downloaded_file
 
+    def stream_to_file(self, response, downloaded_file, checksum=None, resume=False):
+        """
+        Writes the body of a streamed response to disk in chunks of download_chunk_size bytes.  The content is
+        written to a temporary .part file which is renamed to downloaded_file once the transfer completes, so a
+        partially downloaded file is never left at the final path.
+
+        When the server supports Range requests, a connection dropped mid transfer is resumed from the last byte
+        written, up to resume_attempts times.  With resume=True an existing .part file from a previous call is
+        continued and kept on failure for the next call to continue.  The md5 of the content is computed as it is
+        written, so verifying the checksum does not require reading the downloaded file back.
+        :param response: a response object requested with stream=True
+        :param downloaded_file: the local path to save the content to
+        :param checksum: the expected md5 checksum of the content, the download is rejected if it does not match
+        :param resume: Defaults to False, set to True to continue a .part file left by a previous download
+        :return: the local path of the downloaded file
+        """
+        part_file = downloaded_file + ".part"
+        validator_file = part_file + ".validator"
+        url = response.url
+        can_resume = accepts_ranges(response)
+        md5 = hashlib.md5() if checksum else None
+        offset = 0
+        if resume and can_resume:
+            response, offset, md5 = self._resume_part(response, part_file, md5)
+        validator = response_validator(response)
+        try:
+            with open(part_file, 'ab' if offset else 'wb') as f:
+                if not offset and resume and can_resume:
+                    # kept with the .part file, so a later call only continues it while the remote file is unchanged
+                    self._write_validator(validator_file, validator)
+                md5 = self._write_response(f, response, url, can_resume, validator, md5)
+        except BaseException:
+            if not (resume and can_resume):
+                remove_files(part_file, validator_file)
+            raise
+        if md5 and md5.hexdigest() != checksum:
+            remove_files(part_file, validator_file)
+            raise Exception(f"Failed GET {url}, md5 checksum {md5.hexdigest()} does not match {checksum}")
+        os.replace(part_file, downloaded_file)
+        remove_files(validator_file)
+        return downloaded_file
+
+    def _resume_part(self, response, part_file, md5):
+        """
+        Continues a .part file left by a previous download, when it was downloaded from the same version of the
+        remote file.  Returns the response to write to the .part file, the offset to write it at and the md5 of the
+        content written so far.
+        """
+        validator = response_validator(response)
+        if not os.path.exists(part_file) or validator is None or self._read_validator(part_file) != validator:
+            # the remote file changed, or can't be shown to be unchanged, since the .part file was written
+            return response, 0, md5
+        offset = os.path.getsize(part_file)
+        response.close()
+        ranged = self._retrieve_range(response.url, offset, validator)
+        if ranged.status_code == 200:
+            # the remote file changed or the range was ignored, the whole content is in the response
+            return ranged, 0, hashlib.md5() if md5 else None
+        if ranged.status_code != 206:
+            raise Exception(
+                "Failed GET {}, status_code {}, message {}".format(ranged.url, ranged.status_code, ranged.content)
+            )
+        if md5:
+            file_md5(part_file, self.download_chunk_size, md5)
+        return ranged, offset, md5
+
+    def _write_response(self, f, response, url, can_resume, validator, md5):
+        """
+        Writes the content of response to f.  When can_resume, a dropped connection is resumed from the last byte
+        written up to resume_attempts times, conditional on validator, and restarted when the server responds with
+        the whole content.  Returns the md5 of the content of f.
+        """
+        attempts = 0
+        while response is not None:
+            try:
+                with closing(response):
+                    for chunk in response.iter_content(chunk_size=self.download_chunk_size):
+                        f.write(chunk)
+                        self._throttle(url, len(chunk))
+                        if md5:
+                            md5.update(chunk)
+                return md5
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError):
+                if not can_resume or attempts >= self.resume_attempts:
+                    raise
+                attempts += 1
+                f.flush()
+                response = self._retrieve_range(url, f.tell(), validator)
+                if response.status_code == 200:
+                    # the remote file changed or the range was ignored, the whole content is in the response
+                    f.seek(0)
+                    f.truncate()
+                    md5 = hashlib.md5() if md5 else None
+                elif response.status_code != 206:
+                    response.close()
+                    raise
+
+    @staticmethod
+    def _read_validator(part_file):
+        try:
+            with open(part_file + ".validator") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _write_validator(validator_file, validator):
+        if validator is None:
+            remove_files(validator_file)
+            return
+        with open(validator_file, 'w') as f:
+            f.write(validator)
+
+    def _throttle(self, url, size):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire_bytes(url, size)
+
+    def _retrieve_range(self, url, offset, validator):
+        """
+        Requests url from byte offset to the end.  The range is conditional on validator, the server responds 200
+        with the whole content when the file no longer matches it.
+        """
+        return self.request("GET", url, headers={'Range': f'bytes={offset}-', 'If-Range': validator}, stream=True)
+
     def check_task(self, task_id):
         response = self.get(f"/hsapi/taskstatus/{task_id}/", status_code=200)
         json_response = response.json()
         return json_response['status'], json_response['payload'] if 'payload' in json_response else None
 
+    @property
+    def task_watcher(self) -> TaskWatcher:
+        """The TaskWatcher polling server side tasks for this session, started on first use"""
+        with self._task_watcher_lock:
+            if self._task_watcher is None:
+                self._task_watcher = TaskWatcher(self.polling, max_workers=self.max_workers)
+            self._task_watcher.polling = self.polling
+            return self._task_watcher
+
+    @property
+    def executor(self) -> Executor:
+        """
+        The executor running the downloads of non-blocking (submit_) methods, a ThreadPoolExecutor of max_workers
+        threads is created on first use unless one was configured
+        """
+        with self._task_watcher_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hsclient")
+            return self._executor
+
+    @executor.setter
+    def executor(self, executor: Executor):
+        with self._task_watcher_lock:
+            self._executor = executor
+
+    def watch_task(self, task_id) -> Future:
+        """
+        Waits on a server side task in the background with the task watcher.  The time spent waiting is recorded in
+        task_timings.
+        :param task_id: the id of the task to wait on
+        :return: a Future of the payload of the completed task
+        """
+        start = time.monotonic()
+        polls = 0
+
+        def task_is_complete():
+            nonlocal polls
+            polls += 1
+            status, payload = self.check_task(task_id)
+            if status in TASK_FAILED_STATUSES:
+                raise Exception(f"Task {task_id} {status}, payload {payload}")
+            if status != 'true':
+                return False, None
+            self.task_timings.append(TaskTiming(task_id, polls, time.monotonic() - start))
+            return True, payload
+
+        return self.task_watcher.watch(task_is_complete, f"task {task_id}")
+
+    def wait_for_task(self, task_id):
+        """
+        Waits on a server side task polled by the task watcher until it completes.  The time spent waiting is recorded
+        in task_timings.
+        :param task_id: the id of the task to wait on
+        :return: the payload of the completed task
+        """
+        return self.watch_task(task_id).result()
+
     def retrieve_zip(self, path, save_path="", params=None):
+        task_id = self._start_zip(path, params)
+        return self._save_zip(self.wait_for_task(task_id), path, save_path)
+
+    def submit_zip(self, path, save_path="", params=None) -> Future:
+        """
+        Non-blocking retrieve_zip, the zip task is waited on by the task watcher and downloaded on the executor
+        :return: a Future of the local path of the downloaded zip
+        """
+        task_id = self._start_zip(path, params)
+        return chain(self.watch_task(task_id), lambda url: self._save_zip(url, path, save_path), self.executor)
+
+    def _start_zip(self, path, params=None):
         if params is None:
             params = {}
         response = self.get(path, status_code=200, allow_redirects=True, params=params)
         json_response = response.json()
-        task_id = json_response['task_id']
-        status, url = self.check_task(task_id)
-        while status != 'true':
-            status, url = self.check_task(task_id)
-            time.sleep(CHECK_TASK_PING_INTERVAL)
+        return json_response['task_id']
 
-        response = self._session.get(url)
+    def _save_zip(self, url, path, save_path):
+        response = self.request("GET", url, stream=True)
         if response.status_code != 200:
             raise Exception(
                 "Failed GET {}, status_code {}, message {}".format(url, response.status_code, response.content)
@@ -1420,54 +2453,145 @@ class HydroShareSession:
         # append .zip to the filename if it doesn't end with .zip
         if not filename.endswith(".zip"):
             filename += ".zip"
-        downloaded_file = os.path.join(save_path, filename)
-        with open(downloaded_file, 'wb') as f:
-            f.write(response.content)
-        return downloaded_file
+        return self.stream_to_file(response, os.path.join(save_path, filename))
+
+    def upload_file(self, path, files, status_code=204, progress=None):
+        """
+        Uploads files as a streamed multipart/form-data body, see MultipartEncoder
+        :param path: the path to post the files to
+        :param files: a dict of field name to (filename, content) tuples
+        :param status_code: the expected response status code
+        :param progress: an optional callback called with an UploadProgress as the body is sent
+        """
+        progress = throttled_progress(self.rate_limiter, self._build_url(path), progress)
+        body = MultipartEncoder(files, callback=progress, chunk_size=self.upload_chunk_size)
+        # a body of unknown length is sent with chunked transfer encoding
+        data = body if body.length is not None else iter(body)
+        return self.post(path, data=data, headers={'Content-Type': body.content_type}, status_code=status_code)
+
+    def request(self, method, url, **kwargs):
+        """
+        Sends a request to a fully qualified url.  Connection errors and retryable responses are retried as allowed
+        by the retry policy, and the request fails immediately while the circuit breaker is open.  The request hooks
+        are notified when the request starts and once it completes, including its retries.
+        :param method: the http method
+        :param url: the fully qualified url
+        :return: the final response, which may have any status code
+        """
+        hooks = list(self.hooks)
+        if not hooks:
+            return self._request_with_retries(method, url, [], **kwargs)
+        endpoint = endpoint_template(url)
+        start = RequestStart(method, url, endpoint)
+        for hook in hooks:
+            hook.on_request_start(start)
+        started = time.monotonic()
+        retries = []
+        try:
+            response = self._request_with_retries(method, url, retries, **kwargs)
+        except Exception as e:
+            event = RequestEvent(method, url, endpoint, None, time.monotonic() - started, 0, 0, len(retries), e)
+            self._notify_request_end(hooks, event)
+            raise
+        event = RequestEvent(
+            method,
+            url,
+            endpoint,
+            response.status_code,
+            time.monotonic() - started,
+            _content_length(response.request.headers) or 0,
+            _content_length(response.headers) or (0 if kwargs.get('stream') else len(response.content)),
+            len(retries),
+        )
+        self._notify_request_end(hooks, event)
+        return response
 
-    def upload_file(self, path, files, status_code=204):
-        return self.post(path, files=files, status_code=status_code)
+    def _request_with_retries(self, method, url, retries, **kwargs):
+        """
+        Sends a request, retried as allowed by the retry policy and rejected while the circuit breaker is open
+        :param retries: a list the seconds slept before each retry are appended to
+        :return: the final response
+        """
+        while True:
+            if self.circuit_breaker is not None and not self.circuit_breaker.allow_request():
+                self._count_retry_stat('circuit_rejections')
+                raise Exception(f"Failed {method} {url}, the circuit breaker is open after repeated failures")
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire_request(url)
+            attempt = len(retries)
+            try:
+                response = self._session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self._record_outcome(failed=True)
+                if self.retry is None or not self.retry.can_retry(method, attempt):
+                    raise
+                delay = self.retry.backoff(attempt)
+            else:
+                self._record_outcome(failed=response.status_code >= 500)
+                if self.retry is None or not self.retry.is_retryable_status(response.status_code):
+                    return response
+                if not self.retry.can_retry(method, attempt):
+                    self._count_retry_stat('exhausted')
+                    return response
+                delay = self.retry.backoff(attempt, response)
+                response.close()
+            retries.append(delay)
+            self._count_retry_stat('retries')
+            time.sleep(delay)
+            if hasattr(kwargs.get('data'), 'rewind'):
+                # a streamed body has to be read again from the start
+                kwargs['data'].rewind()
 
-    def post(self, path, status_code, data=None, params={}, **kwargs):
+    @staticmethod
+    def _notify_request_end(hooks, event):
+        for hook in hooks:
+            hook.on_request_end(event)
+
+    def _record_outcome(self, failed):
+        if self.circuit_breaker is None:
+            return
+        if not failed:
+            self.circuit_breaker.record_success()
+        elif self.circuit_breaker.record_failure():
+            self._count_retry_stat('circuit_opened')
+
+    def _count_retry_stat(self, key):
+        with self._retry_stats_lock:
+            self._retry_stats[key] += 1
+
+    @property
+    def retry_stats(self) -> Dict[str, int]:
+        """Counts of retries, retries exhausted, circuit breaker openings and requests rejected by an open circuit"""
+        with self._retry_stats_lock:
+            return dict(self._retry_stats)
+
+    def _send(self, method, path, status_code, **kwargs):
         url = encode_resource_url(self._build_url(path))
-        response = self._session.post(url, params=params, data=data, **kwargs)
+        response = self.request(method, url, **kwargs)
         if response.status_code != status_code:
             raise Exception(
-                "Failed POST {}, status_code {}, message {}".format(url, response.status_code, response.content)
+                "Failed {} {}, status_code {}, message {}".format(method, url, response.status_code, response.content)
             )
         return response
 
+    def post(self, path, status_code, data=None, params={}, **kwargs):
+        return self._send("POST", path, status_code, params=params, data=data, **kwargs)
+
     def put(self, path, status_code, data=None, **kwargs):
-        url = encode_resource_url(self._build_url(path))
-        response = self._session.put(url, data=data, **kwargs)
-        if response.status_code != status_code:
-            raise Exception(
-                "Failed PUT {}, status_code {}, message {}".format(url, response.status_code, response.content)
-            )
-        return response
+        return self._send("PUT", path, status_code, data=data, **kwargs)
 
     def get(self, path, status_code, **kwargs):
-        url = encode_resource_url(self._build_url(path))
-        response = self._session.get(url, **kwargs)
-        if response.status_code != status_code:
-            raise Exception(
-                "Failed GET {}, status_code {}, message {}".format(url, response.status_code, response.content)
-            )
-        return response
+        return self._send("GET", path, status_code, **kwargs)
 
     def delete(self, path, status_code, **kwargs):
-        url = encode_resource_url(self._build_url(path))
-        response = self._session.delete(url, **kwargs)
-        if response.status_code != status_code:
-            raise Exception(
-                "Failed DELETE {}, status_code {}, message {}".format(url, response.status_code, response.content)
-            )
-        return response
+        return self._send("DELETE", path, status_code, **kwargs)
 
     @staticmethod
-    def _validate_oauth2_token(token: Union[Token, Dict[str, str]]) -> dict:
+    def _validate_oauth2_token(token: Union['Token', Dict[str, str]]) -> dict:
         """Validate that object follows OAuth2 token specification. return dictionary representation
         of OAuth2 token dropping optional fields that are None."""
+        from hsclient.oauth2_model import Token
+
         if isinstance(token, dict) or isinstance(token, Token):
             # try to coerce into Token model
             o = Token.model_validate(token)
@@ -1480,6 +2604,42 @@ class HydroShareSession:
             raise ValueError(error_message)
 
 
+def search_params(
+    creator: str = None,
+    contributor: str = None,
+    owner: str = None,
+    group_name: str = None,
+    from_date: datetime = None,
+    to_date: datetime = None,
+    edit_permission: bool = False,
+    resource_types: List[str] = [],
+    subject: List[str] = [],
+    full_text_search: str = None,
+    published: bool = False,
+) -> Dict:
+    """Builds the query parameters of the GET /hsapi/resource/ REST end point, see HydroShare.search"""
+    params = {"edit_permission": edit_permission, "published": published}
+    if creator:
+        params["creator"] = creator
+    if contributor:
+        params["author"] = contributor
+    if owner:
+        params["owner"] = owner
+    if group_name:
+        params["group"] = group_name
+    if resource_types:
+        params["type[]"] = resource_types
+    if subject:
+        params["subject"] = ",".join(subject)
+    if full_text_search:
+        params["full_text_search"] = full_text_search
+    if from_date:
+        params["from_date"] = from_date.strftime('%Y-%m-%d')
+    if to_date:
+        params["to_date"] = to_date.strftime('%Y-%m-%d')
+    return params
+
+
 class HydroShare:
     """
     A HydroShare object for querying HydroShare's REST API.  Provide a username and password at initialization or call
@@ -1496,6 +2656,24 @@ class HydroShare:
     :param port: The port to use, defaults to `443`
     :param client_id: The client id associated with the OAuth2 token
     :param token: The OAuth2 token to use
+    :param download_chunk_size: The number of bytes read into memory at a time when downloading files
+    :param polling: The PollingStrategy used when waiting on server side tasks, defaults to PollingStrategy()
+    :param max_workers: The number of threads used for concurrent requests (i.e. retrieving aggregation metadata),
+        defaults to min(32, cpu count + 4)
+    :param pool_connections: The number of host connection pools to cache, defaults to 10
+    :param pool_maxsize: The maximum number of connections kept per host, defaults to 10 and is raised to
+        max_workers when smaller so concurrent requests don't discard connections
+    :param keep_alive: Defaults to True, set to False to close connections after each request
+    :param timeout: The default request timeout in seconds or a (connect, read) tuple, defaults to None for no timeout
+    :param retry: The RetryPolicy for transient failures (connection errors, 429, 502, 503 and 504 responses to
+        idempotent requests), defaults to RetryPolicy(), set to None to disable retries
+    :param circuit_breaker: A CircuitBreaker to fail fast after repeated failures, defaults to None
+    :param hooks: RequestHooks notified as each request starts and ends, i.e. a MetricsCollector
+    :param cache: A DiskCache of resource maps, metadata and manifests shared across processes, defaults to None.
+        Documents retrieved with credentials are only shared with sessions using the same credentials.
+    :param rate_limiter: A RateLimiter pacing requests and transferred bytes per host, defaults to None for no limit
+    :param executor: The Executor running the work of the non-blocking submit_ methods (i.e. Resource.submit_copy),
+        defaults to a ThreadPoolExecutor of max_workers threads
     """
 
     default_host = 'www.hydroshare.org'
@@ -1510,19 +2688,47 @@ class HydroShare:
         protocol: str = default_protocol,
         port: int = default_port,
         client_id: str = None,
-        token: Union[Token, Dict[str, str]] = None,
+        token: Union['Token', Dict[str, str]] = None,
+        download_chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        polling: PollingStrategy = None,
+        max_workers: int = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = None,
+        keep_alive: bool = True,
+        timeout: Union[float, Tuple[float, float]] = None,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY_POLICY,
+        circuit_breaker: CircuitBreaker = None,
+        hooks: Iterable[RequestHook] = (),
+        cache: DiskCache = None,
+        rate_limiter: RateLimiter = None,
+        executor: Executor = None,
     ):
+        session_options = dict(
+            download_chunk_size=download_chunk_size,
+            polling=polling,
+            max_workers=max_workers,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive,
+            timeout=timeout,
+            retry=retry,
+            circuit_breaker=circuit_breaker,
+            hooks=hooks,
+            cache=cache,
+            rate_limiter=rate_limiter,
+            executor=executor,
+        )
         if client_id or token:
             if not client_id or not token:
                 raise ValueError("Oauth2 requires a client_id to be paired with a token")
             else:
                 self._hs_session = HydroShareSession(
-                    host=host, protocol=protocol, port=port, client_id=client_id, token=token
+                    host=host, protocol=protocol, port=port, client_id=client_id, token=token, **session_options
                 )
                 self.my_user_info()  # validate credentials
         else:
             self._hs_session = HydroShareSession(
-                username=username, password=password, host=host, protocol=protocol, port=port
+                username=username, password=password, host=host, protocol=protocol, port=port, **session_options
             )
             if username or password:
                 self.my_user_info()  # validate credentials
@@ -1566,7 +2772,7 @@ class HydroShare:
         subject: List[str] = [],
         full_text_search: str = None,
         published: bool = False,
-        spatial_coverage: Union[BoxCoverage, PointCoverage] = None,
+        spatial_coverage: Union['BoxCoverage', 'PointCoverage'] = None,
     ):
         """
         Query the GET /hsapi/resource/ REST end point of the HydroShare server.
@@ -1587,26 +2793,21 @@ class HydroShare:
 
         :return: A generator to iterate over a ResourcePreview object
         """
-
-        params = {"edit_permission": edit_permission, "published": published}
-        if creator:
-            params["creator"] = creator
-        if contributor:
-            params["author"] = contributor
-        if owner:
-            params["owner"] = owner
-        if group_name:
-            params["group"] = group_name
-        if resource_types:
-            params["type[]"] = resource_types
-        if subject:
-            params["subject"] = ",".join(subject)
-        if full_text_search:
-            params["full_text_search"] = full_text_search
-        if from_date:
-            params["from_date"] = from_date.strftime('%Y-%m-%d')
-        if to_date:
-            params["to_date"] = to_date.strftime('%Y-%m-%d')
+        from hsclient.json_models import ResourcePreview
+
+        params = search_params(
+            creator=creator,
+            contributor=contributor,
+            owner=owner,
+            group_name=group_name,
+            from_date=from_date,
+            to_date=to_date,
+            edit_permission=edit_permission,
+            resource_types=resource_types,
+            subject=subject,
+            full_text_search=full_text_search,
+            published=published,
+        )
         if spatial_coverage:
             yield Exception(
                 "Bad Request, status_code 400, spatial_coverage queries are disabled."
@@ -1651,6 +2852,8 @@ class HydroShare:
         """
         if resource_id in self._resource_object_cache and use_cache:
             return self._resource_object_cache[resource_id]
+        if not use_cache:
+            self._hs_session.expire(f"/resource/{resource_id}/")
 
         res = Resource("/resource/{}/data/resourcemap.xml".format(resource_id), self._hs_session)
         if validate:
@@ -1660,6 +2863,30 @@ class HydroShare:
             self._resource_object_cache[resource_id] = res
         return res
 
+    def resource_from_snapshot(self, path: str, validate: bool = True, use_cache: bool = True) -> Resource:
+        """
+        Restores a resource saved with Resource.snapshot.  A snapshot written by another version of hsclient, or one
+        of a resource modified on HydroShare since the snapshot was taken, is discarded and the resource is retrieved
+        from HydroShare instead.
+        :param path: The path of the snapshot file
+        :param validate: Defaults to True, checks the resource wasn't modified since the snapshot was taken with a
+            single system metadata request.  Set to False to restore the snapshot without contacting HydroShare.
+        :param use_cache: Defaults to True, set to False to not cache the restored Resource object
+        :return: A Resource object representing a resource on HydroShare
+        """
+        with open(path, 'rb') as f:
+            header = pickle.load(f)
+            resource_id = header['resource_id']
+            if header.get('format') != SNAPSHOT_FORMAT_VERSION or header.get('hsclient') != VERSION:
+                return self.resource(resource_id, use_cache=use_cache)
+            res = pickle.load(f)
+        res._attach(self._hs_session)
+        if validate and res.system_metadata()['date_last_updated'] != header['date_last_updated']:
+            return self.resource(resource_id, use_cache=use_cache)
+        if use_cache:
+            self._resource_object_cache[resource_id] = res
+        return res
+
     def create(self, use_cache: bool = True) -> Resource:
         """
         Creates a new resource on HydroShare
@@ -1672,12 +2899,13 @@ class HydroShare:
         resource_id = response.json()['resource_id']
         return self.resource(resource_id, use_cache=use_cache)
 
-    def user(self, user_id: int) -> User:
+    def user(self, user_id: int) -> 'User':
         """
         Retrieves the user details of a Hydroshare user
         :param user_id: The user id of the user details to retrieve
         :return: User object representing the user details
         """
+        from hsclient.json_models import User
         response = self._hs_session.get(f'/hsapi/userDetails/{user_id}/', status_code=200)
         return User(**response.json())
 
@@ -0,0 +1,127 @@
+import math
+import re
+import threading
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+REQUEST_EVENTS_LIMIT = 10000
+
+# path segments replaced by a placeholder so requests to different resources share an endpoint
+_ENDPOINT_PATTERNS = (
+    (re.compile(r'/(data/contents|files|folders|set-file-type|remove-file-type)/.+$'), r'/\1/{path}'),
+    (re.compile(r'/[0-9a-f]{32}(?=/|$)'), '/{resource_id}'),
+    (re.compile(r'/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}(?=/|$)'), '/{task_id}'),
+    (re.compile(r'/\d+(?=/|$)'), '/{id}'),
+)
+
+
+def endpoint_template(url: str) -> str:
+    """
+    The path of url with resource ids, task ids, numeric ids and file paths replaced by placeholders, i.e.
+    /hsapi/resource/{resource_id}/data/contents/{path}
+    """
+    path = urlparse(url).path
+    for pattern, replacement in _ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+class RequestStart(NamedTuple):
+    """Passed to RequestHook.on_request_start before a request is sent"""
+
+    method: str
+    url: str
+    endpoint: str
+
+
+class RequestEvent(NamedTuple):
+    """Passed to RequestHook.on_request_end once a request, including its retries, completes"""
+
+    method: str
+    url: str
+    endpoint: str
+    # None when the request failed without a response
+    status_code: Optional[int]
+    # seconds from sending the request until the response headers were received, including retries
+    elapsed: float
+    bytes_sent: int
+    # the Content-Length of a streamed response as its body is read after the request completes
+    bytes_received: int
+    retries: int
+    error: Optional[BaseException] = None
+
+
+class RequestHook:
+    """
+    Receives events for each request sent by a HydroShareSession.  Subclass and override the methods of interest,
+    then pass instances in the hooks argument of HydroShare.  Hooks run on the requesting thread, so they must be quick
+    and thread safe.
+    """
+
+    def on_request_start(self, event: RequestStart) -> None:
+        pass
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        pass
+
+
+def percentile(values: List[float], q: float) -> float:
+    """The q-th percentile (0 to 100) of values using linear interpolation between the closest ranks"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower, upper = math.floor(rank), math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class MetricsCollector(RequestHook):
+    """
+    A RequestHook keeping the most recent request events in memory and summarizing them per endpoint
+
+    :param limit: The maximum number of events kept, defaults to 10000
+    """
+
+    def __init__(self, limit: int = REQUEST_EVENTS_LIMIT):
+        self._events: Deque[RequestEvent] = deque(maxlen=limit)
+        self._lock = threading.Lock()
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        with self._lock:
+            self._events.append(event)
+
+    @property
+    def events(self) -> List[RequestEvent]:
+        with self._lock:
+            return list(self._events)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+    def summary(self) -> Dict[Tuple[str, str], Dict[str, float]]:
+        """
+        Summarizes the collected events
+        :return: a dict keyed by (method, endpoint) of the request count, errors (failed requests and responses with a
+            status code of 400 or more), retries, bytes sent and received and the mean, p50, p90, p99 and max latency
+        """
+        grouped: Dict[Tuple[str, str], List[RequestEvent]] = {}
+        for event in self.events:
+            grouped.setdefault((event.method, event.endpoint), []).append(event)
+        summary = {}
+        for key, events in grouped.items():
+            latencies = [event.elapsed for event in events]
+            summary[key] = {
+                'count': len(events),
+                'errors': sum(1 for e in events if e.status_code is None or e.status_code >= 400),
+                'retries': sum(event.retries for event in events),
+                'bytes_sent': sum(event.bytes_sent for event in events),
+                'bytes_received': sum(event.bytes_received for event in events),
+                'mean': sum(latencies) / len(latencies),
+                'p50': percentile(latencies, 50),
+                'p90': percentile(latencies, 90),
+                'p99': percentile(latencies, 99),
+                'max': max(latencies),
+            }
+        return summary
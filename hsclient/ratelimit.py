@@ -0,0 +1,161 @@
+import os
+import struct
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class TokenBucket:
+    """
+    A thread safe token bucket.  Tokens are added at rate per second up to capacity, acquiring takes tokens and waits
+    while the bucket is in debt, so acquisitions larger than the capacity are paced rather than refused.
+
+    :param rate: The tokens added per second
+    :param capacity: The maximum tokens held, which is the largest burst allowed, defaults to rate
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        if rate <= 0:
+            raise ValueError("The rate of a token bucket must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float, available: float, updated: float, now: float) -> Tuple[float, float]:
+        """Takes tokens from a bucket holding available tokens at updated, returns the remaining tokens and delay"""
+        available = min(self.capacity, available + (now - updated) * self.rate) - tokens
+        return available, max(0.0, -available / self.rate)
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Takes tokens from the bucket, sleeping until they have been added
+        :return: the seconds slept
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, delay = self._reserve(tokens, self._tokens, self._updated, now)
+            self._updated = now
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    A token bucket whose state is kept in a file locked while it is updated, so every process using the same path
+    shares the rate.  Requires fcntl, which is not available on Windows.
+
+    :param path: The path of the file holding the bucket state, created if it doesn't exist
+    :param rate: The tokens added per second
+    :param capacity: The maximum tokens held, which is the largest burst allowed, defaults to rate
+    """
+
+    _STATE = struct.Struct('dd')
+
+    def __init__(self, path: str, rate: float, capacity: float = None):
+        if fcntl is None:
+            raise Exception("fcntl package was not found, sharing a rate limit across processes requires fcntl")
+        super().__init__(rate, capacity)
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def acquire(self, tokens: float = 1) -> float:
+        with self._lock, open(self.path, 'a+b') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                state = f.read(self._STATE.size)
+                # wall clock time as monotonic clocks are not comparable across processes
+                now = time.time()
+                available, updated = (self.capacity, now)
+                if len(state) == self._STATE.size:
+                    available, updated = self._STATE.unpack(state)
+                available, delay = self._reserve(tokens, available, updated, now)
+                f.truncate(0)
+                f.write(self._STATE.pack(available, now))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class RateLimiter:
+    """
+    Paces the requests and transferred bytes of a HydroShareSession per host with token buckets, so bulk jobs run
+    at a sustainable rate instead of tripping the server's throttling.  Every request, including retries, takes a
+    request token.  Streamed downloads and uploads take a token per byte as each chunk is transferred.
+
+    :param requests_per_second: The sustained requests per second to each host, defaults to None for no limit
+    :param bytes_per_second: The sustained bytes per second transferred with each host, defaults to None for no limit
+    :param burst: The seconds of rate that may be spent at once after an idle period, defaults to 1
+    :param shared_path: A directory to keep the bucket state in, shared by every process using the same directory,
+        defaults to None to limit only this process
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = None,
+        bytes_per_second: float = None,
+        burst: float = 1,
+        shared_path: str = None,
+    ):
+        self.requests_per_second = requests_per_second
+        self.bytes_per_second = bytes_per_second
+        self.burst = burst
+        self.shared_path = shared_path
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url: str, kind: str, rate: float) -> TokenBucket:
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get((host, kind))
+            if bucket is None:
+                if self.shared_path is not None:
+                    path = os.path.join(self.shared_path, f"{host.replace(':', '_')}-{kind}.bucket")
+                    bucket = SharedTokenBucket(path, rate, rate * self.burst)
+                else:
+                    bucket = TokenBucket(rate, rate * self.burst)
+                self._buckets[(host, kind)] = bucket
+            return bucket
+
+    def acquire_request(self, url: str) -> float:
+        """Waits until a request to the host of url is allowed, returns the seconds waited"""
+        if not self.requests_per_second:
+            return 0.0
+        return self._bucket(url, 'requests', self.requests_per_second).acquire()
+
+    def acquire_bytes(self, url: str, size: int) -> float:
+        """Waits until size bytes may be transferred with the host of url, returns the seconds waited"""
+        if not self.bytes_per_second or not size:
+            return 0.0
+        return self._bucket(url, 'bytes', self.bytes_per_second).acquire(size)
+
+
+def throttled_progress(rate_limiter: Optional[RateLimiter], url: str, callback=None):
+    """Wraps an upload progress callback to take byte tokens for the bytes sent since the previous call"""
+    if rate_limiter is None or not rate_limiter.bytes_per_second:
+        return callback
+    sent = 0
+
+    def progress(update):
+        nonlocal sent
+        if update.bytes_sent < sent:
+            # the body was rewound to be sent again
+            sent = 0
+        rate_limiter.acquire_bytes(url, update.bytes_sent - sent)
+        sent = update.bytes_sent
+        if callback is not None:
+            callback(update)
+
+    return progress
@@ -0,0 +1,77 @@
+from typing import Dict, List, NamedTuple, Optional, Union
+from xml.etree.ElementTree import XMLPullParser
+
+RESOURCE_MAP_CHUNK_SIZE = 64 * 1024
+
+_RDF = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}'
+_ABOUT = _RDF + 'about'
+_RESOURCE = _RDF + 'resource'
+_DESCRIBES = '{http://www.openarchives.org/ore/terms/}describes'
+_AGGREGATES = '{http://www.openarchives.org/ore/terms/}aggregates'
+_IS_DOCUMENTED_BY = '{http://purl.org/spar/cito/}isDocumentedBy'
+_IDENTIFIER = '{http://purl.org/dc/elements/1.1/}identifier'
+
+
+class ResourceMapListing(NamedTuple):
+    """The parts of an ORE resource map hsclient needs to list the contents of a resource or aggregation"""
+
+    # the dc:identifier of the resource map, the resource id of a resource map of a resource
+    identifier: Optional[str]
+    # the url of the metadata document of the described aggregation
+    is_documented_by: Optional[str]
+    # the urls aggregated by the described aggregation, aggregations end with #aggregation
+    files: List[str]
+
+
+def parse_resource_map(document: Union[str, bytes], chunk_size: int = RESOURCE_MAP_CHUNK_SIZE) -> ResourceMapListing:
+    """
+    Parses an RDF/XML resource map into a ResourceMapListing.  The document is parsed incrementally and each
+    description is discarded once read, so no rdf graph or metadata model is built.  Use load_rdf from hsmodels for a
+    ResourceMap model of the whole document.
+    :param document: the resource map RDF/XML
+    :param chunk_size: the number of bytes fed to the parser at a time
+    """
+    if isinstance(document, str):
+        document = document.encode()
+    parser = XMLPullParser(events=('start', 'end'))
+    # the properties of each description, keyed by its rdf:about
+    aggregates: Dict[str, List[str]] = {}
+    documented_by: Dict[str, str] = {}
+    identifiers: Dict[str, str] = {}
+    describes = None
+    depth = 0
+    root = subject = None
+    view = memoryview(document)
+    for start in range(0, len(view), chunk_size):
+        parser.feed(view[start: start + chunk_size])
+        for event, element in parser.read_events():
+            if event == 'start':
+                depth += 1
+                if depth == 1:
+                    root = element
+                elif depth == 2:
+                    subject = element.get(_ABOUT)
+                continue
+            depth -= 1
+            if depth == 2 and subject is not None:
+                value = element.get(_RESOURCE) or (element.text or '').strip()
+                if element.tag == _AGGREGATES:
+                    aggregates.setdefault(subject, []).append(value)
+                elif element.tag == _IS_DOCUMENTED_BY:
+                    documented_by[subject] = value
+                elif element.tag == _IDENTIFIER:
+                    identifiers[subject] = value
+                elif element.tag == _DESCRIBES:
+                    describes = value
+            elif depth == 1:
+                # the description has been read, drop it to keep memory flat
+                del root[:]
+    parser.close()
+    if describes is None:
+        describes = next((subject for subject in aggregates if subject.endswith('#aggregation')), None)
+    map_subject = describes.split('#', 1)[0] if describes else None
+    return ResourceMapListing(
+        identifier=identifiers.get(map_subject, identifiers.get(describes)),
+        is_documented_by=documented_by.get(describes),
+        files=aggregates.get(describes, []),
+    )
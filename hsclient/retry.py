@@ -0,0 +1,126 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable
+
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+class RetryPolicy:
+    """
+    Controls which failed requests HydroShareSession retries and how long it waits between attempts.  By default only
+    idempotent methods are retried, so a POST that may have reached the server is never repeated.
+
+    :param total: The maximum number of retries of a request, defaults to 3
+    :param backoff_factor: The delay before retry n is backoff_factor * 2 ** n seconds, defaults to 0.5
+    :param max_backoff: The maximum seconds to wait before a retry, defaults to 30
+    :param status_codes: The response status codes to retry, defaults to 429, 502, 503 and 504
+    :param methods: The http methods to retry, defaults to the idempotent methods GET, HEAD, OPTIONS, PUT and DELETE
+    :param respect_retry_after: Defaults to True, set to False to ignore the Retry-After header of a response
+    """
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30,
+        status_codes: Iterable[int] = RETRY_STATUS_CODES,
+        methods: Iterable[str] = IDEMPOTENT_METHODS,
+        respect_retry_after: bool = True,
+    ):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.status_codes = frozenset(status_codes)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.respect_retry_after = respect_retry_after
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        """Checks if a request using method may be retried after attempt retries"""
+        return attempt < self.total and method.upper() in self.methods
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in self.status_codes
+
+    def backoff(self, attempt: int, response=None) -> float:
+        """
+        The number of seconds to wait before the next retry
+        :param attempt: the number of retries made so far
+        :param response: the response being retried, its Retry-After header takes precedence when present
+        """
+        if response is not None and self.respect_retry_after:
+            retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        return min(self.backoff_factor * 2 ** attempt, self.max_backoff)
+
+
+def _parse_retry_after(value):
+    """Parses a Retry-After header given in seconds or as an http date into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to HydroShare after failure_threshold consecutive failures (connection errors and 5xx
+    responses).  While open, requests fail immediately.  After reset_timeout seconds a single trial request is let
+    through, closing the circuit if it succeeds and reopening it if it fails.
+
+    :param failure_threshold: The number of consecutive failures that opens the circuit, defaults to 5
+    :param reset_timeout: The seconds the circuit stays open before a trial request, defaults to 30
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Checks if a request may be sent, letting a single trial request through once reset_timeout has passed"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> bool:
+        """Records a failed request, returns True if the failure opened the circuit"""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                opened = self._state != self.OPEN
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                return opened
+            return False
@@ -0,0 +1,263 @@
+import io
+import os
+import threading
+import time
+from enum import Enum
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from uuid import uuid4
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo
+
+from requests.utils import super_len
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+PARALLEL_UPLOAD_MIN_FILE_SIZE = 4 * 1024 * 1024
+
+# file formats which are already compressed and are stored in a zip as is
+COMPRESSED_EXTENSIONS = frozenset(
+    ('.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.zst', '.nc', '.nc4', '.h5', '.hdf5', '.tif', '.tiff', '.jpg',
+     '.jpeg', '.png', '.gif', '.mp3', '.mp4', '.pdf', '.parquet')
+)
+
+# files that HydroShare only combines into an aggregation, or ingests as aggregation metadata, when they arrive in
+# the same zip
+SERVER_UNZIP_EXTENSIONS = frozenset(
+    ('.shp', '.shx', '.dbf', '.prj', '.sbn', '.sbx', '.cpg', '.vrt', '.tif', '.tiff')
+)
+SERVER_UNZIP_SUFFIXES = ('_resmap.xml', '_meta.xml', 'resourcemap.xml', 'resourcemetadata.xml')
+
+
+class UploadStrategy(str, Enum):
+    """How Resource.file_upload sends multiple files"""
+
+    AUTO = "auto"
+    # a zip archive streamed as it is compressed, then unzipped on HydroShare
+    ZIP = "zip"
+    # each file uploaded in its own concurrent request
+    PARALLEL = "parallel"
+
+
+def choose_upload_strategy(files: List[str]) -> UploadStrategy:
+    """
+    Chooses how to upload multiple files.  Files which HydroShare groups into aggregations or ingests as metadata
+    must arrive in a zip.  Otherwise larger files are uploaded in parallel, and many small files are zipped to
+    save requests.
+    """
+    for file in files:
+        name = os.path.basename(file).lower()
+        if os.path.splitext(name)[1] in SERVER_UNZIP_EXTENSIONS or name.endswith(SERVER_UNZIP_SUFFIXES):
+            return UploadStrategy.ZIP
+    average_size = sum(os.path.getsize(file) for file in files) / len(files)
+    if average_size >= PARALLEL_UPLOAD_MIN_FILE_SIZE:
+        return UploadStrategy.PARALLEL
+    return UploadStrategy.ZIP
+
+
+class UploadProgress(NamedTuple):
+    """The progress of an upload passed to upload progress callbacks"""
+
+    bytes_sent: int
+    total_bytes: Optional[int]
+    elapsed: float
+
+    @property
+    def throughput(self) -> float:
+        """The average bytes per second sent so far"""
+        return self.bytes_sent / self.elapsed if self.elapsed else 0.0
+
+
+class MultipartEncoder:
+    """
+    A multipart/form-data request body which is read from the field values as it is sent, so uploading a file only
+    holds chunk_size bytes of it in memory.  The length of the body is computed up front so requests sends a
+    Content-Length header rather than a chunked body.  When a content is an iterator of bytes, its length is unknown
+    and length is None, pass iter(encoder) as the request data to send it with chunked transfer encoding.
+
+    :param fields: a dict of field name to value, where a value is a string, bytes or a tuple of
+        (filename, content) or (filename, content, content_type) and content is a string, bytes, a binary file object
+        or an iterator of bytes
+    :param callback: called with an UploadProgress after each chunk is read.  The callback runs on the sending thread,
+        so sleeping in it throttles the upload.
+    :param chunk_size: the maximum number of bytes read from a file object at a time
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, Union[str, bytes, Tuple]],
+        callback: Callable[[UploadProgress], None] = None,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+    ):
+        self.boundary = uuid4().hex
+        self.callback = callback
+        self.chunk_size = chunk_size
+        self._parts = []
+        for name, value in fields.items():
+            filename, content, content_type = None, value, None
+            if isinstance(value, tuple):
+                filename, content = value[0], value[1]
+                content_type = value[2] if len(value) > 2 else 'application/octet-stream'
+            if isinstance(content, str):
+                content = content.encode()
+            if isinstance(content, bytes):
+                content = io.BytesIO(content)
+            if not hasattr(content, 'read'):
+                content = _IteratorReader(content)
+            disposition = f'form-data; name="{name}"'
+            if filename is not None:
+                disposition += f'; filename="{os.path.basename(filename)}"'
+            header = f'--{self.boundary}\r\nContent-Disposition: {disposition}\r\n'
+            if content_type:
+                header += f'Content-Type: {content_type}\r\n'
+            if isinstance(content, _IteratorReader):
+                start, size = None, None
+            else:
+                start, size = content.tell(), super_len(content)
+            self._parts.append((header.encode() + b'\r\n', content, start, size))
+        self._closing = f'--{self.boundary}--\r\n'.encode()
+        self._started = None
+        self.length = None
+        if all(size is not None for _, _, _, size in self._parts):
+            self.length = sum(len(header) + size + 2 for header, _, _, size in self._parts) + len(self._closing)
+        self.rewind()
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self):
+        if self.length is None:
+            raise TypeError("The length of a multipart body with iterator contents is unknown")
+        return self.length
+
+    def __iter__(self):
+        chunk = self.read(self.chunk_size)
+        while chunk:
+            yield chunk
+            chunk = self.read(self.chunk_size)
+
+    def rewind(self) -> None:
+        """Resets the body to its start so the request can be sent again"""
+        for _, content, start, _ in self._parts:
+            if start is None:
+                if self._started is not None:
+                    raise Exception("A multipart body with iterator contents can't be sent again")
+                continue
+            content.seek(start)
+        self._segments = self._segment_readers()
+        self._current = next(self._segments, None)
+        self._bytes_sent = 0
+        self._started = None
+
+    def _segment_readers(self):
+        """Yields a function reading up to n bytes for each successive segment of the body"""
+        for header, content, _, _ in self._parts:
+            yield io.BytesIO(header).read
+            yield content.read
+            yield io.BytesIO(b'\r\n').read
+        yield io.BytesIO(self._closing).read
+
+    def read(self, size: int = -1) -> bytes:
+        if self._started is None:
+            self._started = time.monotonic()
+        if size is None or size < 0:
+            size = float('inf')
+        chunk = b''
+        while self._current is not None and len(chunk) < size:
+            data = self._current(min(size - len(chunk), self.chunk_size))
+            if data:
+                chunk += data
+            else:
+                self._current = next(self._segments, None)
+        if chunk:
+            self._bytes_sent += len(chunk)
+            if self.callback is not None:
+                self.callback(UploadProgress(self._bytes_sent, self.length, time.monotonic() - self._started))
+        return chunk
+
+
+class _IteratorReader:
+    """Adapts an iterator of bytes to a read(size) function"""
+
+    def __init__(self, iterator: Iterable[bytes]):
+        self._iterator = iter(iterator)
+        self._buffer = b''
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            data = next(self._iterator, None)
+            if data is None:
+                break
+            self._buffer += data
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class _StreamBuffer:
+    """A write only, unseekable file object holding what was written until it is popped"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def pop(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def zip_stream(files: List[str], chunk_size: int = UPLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yields a zip archive of files as it is written, without a temporary file.  Each file is stored under its base name,
+    already compressed formats (COMPRESSED_EXTENSIONS) are stored as is and other files are deflated.
+    :param files: the local file paths to zip
+    :param chunk_size: the number of bytes of a file read into memory at a time
+    """
+    buffer = _StreamBuffer()
+    with ZipFile(buffer, 'w') as zipped:
+        for file in files:
+            info = ZipInfo.from_file(file, os.path.basename(file))
+            compressed = os.path.splitext(file)[1].lower() in COMPRESSED_EXTENSIONS
+            info.compress_type = ZIP_STORED if compressed else ZIP_DEFLATED
+            with open(file, 'rb') as source, zipped.open(info, 'w') as destination:
+                for chunk in iter(lambda: source.read(chunk_size), b''):
+                    destination.write(chunk)
+                    data = buffer.pop()
+                    if data:
+                        yield data
+            data = buffer.pop()
+            if data:
+                yield data
+    yield buffer.pop()
+
+
+class AggregateProgress:
+    """
+    Combines the progress of concurrent uploads into a single UploadProgress callback
+    :param callback: called with the combined UploadProgress
+    :param sizes: a dict of upload key to its estimated size, used as its total until it reports its own
+    """
+
+    def __init__(self, callback: Callable[[UploadProgress], None], sizes: Dict[str, int]):
+        self._callback = callback
+        self._progress = {key: (0, size) for key, size in sizes.items()}
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def tracker(self, key) -> Callable[[UploadProgress], None]:
+        """Returns the progress callback of the upload identified by key"""
+
+        def track(progress: UploadProgress):
+            with self._lock:
+                self._progress[key] = (progress.bytes_sent, progress.total_bytes)
+                sent = sum(bytes_sent for bytes_sent, _ in self._progress.values())
+                total = sum(total_bytes for _, total_bytes in self._progress.values())
+                self._callback(UploadProgress(sent, total, time.monotonic() - self._started))
+
+        return track
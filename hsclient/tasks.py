@@ -0,0 +1,248 @@
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import Executor, Future, InvalidStateError, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+CHECK_TASK_PING_INTERVAL = 10
+TASK_FAILED_STATUSES = ("failed", "aborted")
+
+
+class TaskTiming(NamedTuple):
+    """The time spent waiting on a HydroShare server side task"""
+
+    task_id: str
+    polls: int
+    elapsed: float
+
+
+class PollingStrategy:
+    """
+    Controls how HydroShare is polled while waiting on a server side task (zipping, bagging, moving aggregations).
+    The first poll is issued immediately, after which the interval between polls starts at initial_interval and
+    grows by multiplier up to max_interval, so short tasks complete quickly without hammering HydroShare on long ones.
+
+    :param initial_interval: The seconds to wait after the first poll, defaults to 0.25
+    :param multiplier: The factor the interval grows by after each poll, defaults to 2
+    :param max_interval: The maximum seconds to wait between polls, defaults to 10
+    :param jitter: The fraction of random variation applied to each interval, defaults to 0.1
+    :param timeout: The maximum seconds to wait for a task to complete, defaults to None for no limit
+    """
+
+    def __init__(
+        self,
+        initial_interval: float = 0.25,
+        multiplier: float = 2.0,
+        max_interval: float = CHECK_TASK_PING_INTERVAL,
+        jitter: float = 0.1,
+        timeout: float = None,
+    ):
+        if initial_interval < 0 or multiplier < 1 or max_interval < 0 or not 0 <= jitter < 1:
+            raise ValueError("Polling intervals must be positive and jitter must be between 0 and 1")
+        self.initial_interval = initial_interval
+        self.multiplier = multiplier
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.timeout = timeout
+
+    def intervals(self) -> Iterator[float]:
+        """Yields the number of seconds to sleep between successive polls"""
+        interval = self.initial_interval
+        while True:
+            yield min(interval, self.max_interval) * random.uniform(1 - self.jitter, 1 + self.jitter)
+            interval *= self.multiplier
+
+    def wait(self, poll, description: str = "task") -> int:
+        """
+        Calls poll until it returns True, sleeping between calls
+        :param poll: a callable returning True when the awaited condition is met
+        :param description: a description of what is being waited on for the timeout error message
+        :return: the number of times poll was called
+        """
+        start = time.monotonic()
+        polls = 0
+        for interval in self.intervals():
+            polls += 1
+            if poll():
+                return polls
+            if self.timeout is not None:
+                remaining = self.timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    raise TimeoutError(f"Timed out after {self.timeout} seconds waiting on {description}")
+                interval = min(interval, remaining)
+            time.sleep(interval)
+
+    async def wait_async(self, poll, description: str = "task") -> int:
+        """
+        Coroutine equivalent of wait, awaiting poll and sleeping without blocking the event loop
+        :param poll: a coroutine function returning True when the awaited condition is met
+        :param description: a description of what is being waited on for the timeout error message
+        :return: the number of times poll was awaited
+        """
+        start = time.monotonic()
+        polls = 0
+        for interval in self.intervals():
+            polls += 1
+            if await poll():
+                return polls
+            if self.timeout is not None:
+                remaining = self.timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    raise TimeoutError(f"Timed out after {self.timeout} seconds waiting on {description}")
+                interval = min(interval, remaining)
+            await asyncio.sleep(interval)
+
+
+def _resolve(future: Future, result: Any = None, error: BaseException = None) -> None:
+    """Sets the result or exception of future unless it was cancelled"""
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+def chain(future: Future, then: Callable[[Any], Any], executor: Executor) -> Future:
+    """
+    Returns a future of then(result of future), called on executor once future completes.  An exception of future is
+    passed on without calling then, and cancelling the returned future cancels future if it is still pending.
+    """
+    chained = Future()
+
+    def resolve(done: Future):
+        if done.cancelled():
+            chained.cancel()
+            return
+        if done.exception() is not None:
+            _resolve(chained, error=done.exception())
+            return
+        try:
+            inner = executor.submit(then, done.result())
+        except RuntimeError as e:
+            # the executor was shut down
+            _resolve(chained, error=e)
+            return
+        inner.add_done_callback(
+            lambda f: _resolve(chained, error=f.exception()) if f.exception() else _resolve(chained, f.result())
+        )
+
+    future.add_done_callback(resolve)
+    chained.add_done_callback(lambda f: future.cancel() if f.cancelled() else None)
+    return chained
+
+
+class _Watch:
+    def __init__(self, poll, description, future, intervals):
+        self.poll = poll
+        self.description = description
+        self.future = future
+        self.intervals = intervals
+        self.started = time.monotonic()
+
+
+class TaskWatcher:
+    """
+    Waits on many server side tasks from a single background thread instead of a sleeping thread per task.  Each
+    watched poll follows its own PollingStrategy schedule and is sent on one of at most max_workers threads as it
+    falls due, so a slow poll doesn't hold back the polls of other tasks.  The thread is started by the first watch
+    and exits once no polls are left.
+
+    :param polling: The PollingStrategy scheduling the polls, defaults to PollingStrategy()
+    :param max_workers: The maximum number of polls sent at the same time, defaults to 8
+    """
+
+    def __init__(self, polling: PollingStrategy = None, max_workers: int = 8):
+        self.polling = polling if polling is not None else PollingStrategy()
+        self.max_workers = max_workers
+        # (due time, sequence, watch) ordered by the time the next poll is due
+        self._schedule: List[Tuple[float, int, _Watch]] = []
+        self._sequence = itertools.count()
+        # the number of polls sent and not yet answered
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._thread = None
+        self._executor = None
+
+    def watch(self, poll: Callable[[], Tuple[bool, Any]], description: str = "task") -> Future:
+        """
+        Calls poll in the background until it reports completion.  The first poll is sent immediately.
+        :param poll: a callable returning (True, result) once the awaited task is complete and (False, None) otherwise,
+            an exception raised by poll fails the returned future
+        :param description: a description of what is being waited on for the timeout error message
+        :return: a Future of the result, wrap it with asyncio.wrap_future to await it
+        """
+        future = Future()
+        watch = _Watch(poll, description, future, self.polling.intervals())
+        with self._condition:
+            heapq.heappush(self._schedule, (time.monotonic(), next(self._sequence), watch))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="hsclient-task-watcher", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    @property
+    def pending(self) -> int:
+        """The number of watched tasks not yet complete"""
+        with self._condition:
+            return len(self._schedule) + self._in_flight
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if not self._schedule:
+                        if not self._in_flight:
+                            self._thread = None
+                            return
+                        self._condition.wait()
+                        continue
+                    delay = self._schedule[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                now = time.monotonic()
+                due = []
+                while self._schedule and self._schedule[0][0] <= now:
+                    due.append(heapq.heappop(self._schedule)[2])
+                self._in_flight += len(due)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hsclient-poll")
+            for watch in due:
+                polled = self._executor.submit(self._poll, watch)
+                polled.add_done_callback(lambda polled, watch=watch: self._polled(watch, polled))
+
+    def _polled(self, watch: _Watch, polled: Future) -> None:
+        """Reschedules a watch once its poll is answered, or resolves its future once the task is complete"""
+        done, result, error = polled.result()
+        with self._condition:
+            self._in_flight -= 1
+            if not done:
+                interval = next(watch.intervals)
+                if self.polling.timeout is not None:
+                    remaining = self.polling.timeout - (time.monotonic() - watch.started)
+                    interval = max(0.0, min(interval, remaining))
+                heapq.heappush(self._schedule, (time.monotonic() + interval, next(self._sequence), watch))
+            self._condition.notify()
+        if done:
+            _resolve(watch.future, result, error)
+
+    def _poll(self, watch: _Watch) -> Tuple[bool, Any, Optional[BaseException]]:
+        """Polls a watch, returns (done, result, error) where done is True once its future is to be resolved"""
+        if watch.future.cancelled():
+            return True, None, None
+        try:
+            done, result = watch.poll()
+        except BaseException as e:
+            return True, None, e
+        if done:
+            return True, result, None
+        if self.polling.timeout is not None and time.monotonic() - watch.started >= self.polling.timeout:
+            error = TimeoutError(f"Timed out after {self.polling.timeout} seconds waiting on {watch.description}")
+            return True, None, error
+        return False, None, None
@@ -0,0 +1,609 @@
+"""
+A local stand-in for the HydroShare REST API, for testing and benchmarking hsclient without a network connection.
+
+    with LocalHydroShare(fixtures_path="tests/data/test_resource_metadata_files", latency=0.01) as server:
+        resource_id = server.add_resource({"data/file.txt": b"content"}, aggregations=["ecoregions"])
+        hs = server.hydroshare()
+        res = hs.resource(resource_id)
+"""
+import hashlib
+import io
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlparse
+from zipfile import ZipFile
+
+from hsclient.metrics import endpoint_template
+
+FIXTURE_RESOURCE_ID = "97523bdb7b174901b3fc2d89813458f1"
+DEFAULT_PAGE_SIZE = 100
+BANDWIDTH_CHUNK_SIZE = 16 * 1024
+
+_RESOURCE_ID = re.compile(r"/resource/[0-9a-f]{32}")
+_CONTENTS_FOLDER = re.compile(r'(/data/contents/)(?:[^"#<>]*/)?(?=[^/"#<>]+)')
+_AGGREGATES = re.compile(r'ore:aggregates rdf:resource="[^"]*/data/contents/([^"#]+)"')
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+def resource_map_xml(resource_id: str, files: Iterable[str], aggregations: Iterable[str] = ()) -> str:
+    """
+    A resource map of resource_id aggregating files and the aggregations described by the resmap file paths
+    :param resource_id: the resource id
+    :param files: the paths of the files in the resource which are not part of an aggregation
+    :param aggregations: the paths of the aggregation resource map files (i.e. "ecoregions_resmap.xml")
+    """
+    base = f"http://localhost:8000/resource/{resource_id}/data"
+    aggregates = "".join(f'    <ore:aggregates rdf:resource="{base}/contents/{quote(f)}"/>\n' for f in files)
+    aggregates += "".join(
+        f'    <ore:aggregates rdf:resource="{base}/contents/{quote(a)}#aggregation"/>\n' for a in aggregations
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rdf:RDF
+   xmlns:citoterms="http://purl.org/spar/cito/"
+   xmlns:dc="http://purl.org/dc/elements/1.1/"
+   xmlns:ore="http://www.openarchives.org/ore/terms/"
+   xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+>
+  <rdf:Description rdf:about="{base}/resourcemap.xml">
+    <ore:describes rdf:resource="{base}/resourcemap.xml#aggregation"/>
+    <rdf:type rdf:resource="http://www.openarchives.org/ore/terms/ResourceMap"/>
+    <dc:identifier>{resource_id}</dc:identifier>
+  </rdf:Description>
+  <rdf:Description rdf:about="{base}/resourcemap.xml#aggregation">
+    <rdf:type rdf:resource="http://www.openarchives.org/ore/terms/Aggregation"/>
+    <dc:title>Test Resource</dc:title>
+    <ore:isDescribedBy>{base}/resourcemap.xml</ore:isDescribedBy>
+    <citoterms:isDocumentedBy>{base}/resourcemetadata.xml</citoterms:isDocumentedBy>
+{aggregates}  </rdf:Description>
+</rdf:RDF>
+"""
+
+
+def _with_resource_id(document: bytes, resource_id: str) -> bytes:
+    """Rewrites the resource urls of a fixture document to resource_id"""
+    return _RESOURCE_ID.sub(f"/resource/{resource_id}", document.decode()).encode()
+
+
+def _zip(files: Dict[str, bytes]) -> bytes:
+    archive = io.BytesIO()
+    with ZipFile(archive, "w") as zipped:
+        for path, content in files.items():
+            zipped.writestr(path, content)
+    return archive.getvalue()
+
+
+class _LocalResource:
+    """The files, aggregations and folders of a resource served by LocalHydroShare"""
+
+    def __init__(self, resource_id: str, metadata: bytes):
+        self.resource_id = resource_id
+        self.metadata = metadata
+        self.contents: Dict[str, bytes] = {}
+        # aggregation resource map path -> the paths of the files belonging to the aggregation
+        self.aggregations: Dict[str, Set[str]] = {}
+        self.folders: Set[str] = set()
+        self.created = self.modified = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+    def touch(self) -> None:
+        """Updates the modification time after the resource changed"""
+        self.modified = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+    def add_aggregation(self, resmap_path: str, resmap: bytes, meta: bytes) -> None:
+        folder = os.path.dirname(resmap_path)
+        meta_path = resmap_path[: -len("_resmap.xml")] + "_meta.xml"
+        # the documents describe the files of the aggregation by their url, which includes the folder
+        resmap, meta = (
+            _CONTENTS_FOLDER.sub(rf"\1{folder}/" if folder else r"\1", document.decode()).encode()
+            for document in (resmap, meta)
+        )
+        self.contents[resmap_path] = _with_resource_id(resmap, self.resource_id)
+        self.contents[meta_path] = _with_resource_id(meta, self.resource_id)
+        owned = {resmap_path, meta_path}
+        for aggregated in _AGGREGATES.findall(resmap.decode()):
+            owned.add(os.path.join(folder, os.path.basename(unquote(aggregated))).lstrip("/"))
+        self.aggregations[resmap_path] = owned
+
+    def aggregation_of(self, path: str) -> Optional[Set[str]]:
+        for owned in self.aggregations.values():
+            if path in owned:
+                return owned
+        return None
+
+    def resource_map(self) -> bytes:
+        owned = set().union(*self.aggregations.values()) if self.aggregations else set()
+        files = [path for path in self.contents if path not in owned]
+        return resource_map_xml(self.resource_id, files, list(self.aggregations)).encode()
+
+    def manifest(self) -> bytes:
+        return "".join(
+            f"{hashlib.md5(content).hexdigest()}    data/contents/{path}\n" for path, content in self.contents.items()
+        ).encode()
+
+    def files_under(self, path: str) -> Dict[str, bytes]:
+        """The files at or below path, keyed by their path relative to the parent of path"""
+        parent = os.path.dirname(path.rstrip("/"))
+        return {
+            os.path.relpath(file, parent) if parent else file: content
+            for file, content in self.contents.items()
+            if file == path or file.startswith(path.rstrip("/") + "/")
+        }
+
+    def exists(self, path: str) -> bool:
+        path = path.strip("/")
+        return bool(self.files_under(path)) or any(
+            folder == path or folder.startswith(path + "/") for folder in self.folders
+        )
+
+    def remove(self, path: str) -> None:
+        for file in list(self.files_under(path)):
+            self.contents.pop(os.path.join(os.path.dirname(path.rstrip("/")), file).lstrip("/"), None)
+        for resmap_path in list(self.aggregations):
+            if resmap_path not in self.contents:
+                del self.aggregations[resmap_path]
+        self.folders = {folder for folder in self.folders if folder != path and not folder.startswith(path + "/")}
+
+    def rename(self, source: str, target: str) -> None:
+        for file in [file for file in self.contents if file == source or file.startswith(source + "/")]:
+            self.contents[target + file[len(source):]] = self.contents.pop(file)
+        for resmap_path in list(self.aggregations):
+            owned = {target + p[len(source):] if p == source or p.startswith(source + "/") else p
+                     for p in self.aggregations.pop(resmap_path)}
+            if resmap_path == source or resmap_path.startswith(source + "/"):
+                resmap_path = target + resmap_path[len(source):]
+            self.aggregations[resmap_path] = owned
+
+    def unzip(self, path: str, overwrite: bool, ingest_metadata: bool, remove_original: bool) -> None:
+        folder = os.path.dirname(path)
+        if not overwrite:
+            folder = path[: -len(".zip")]
+        with ZipFile(io.BytesIO(self.contents[path])) as zipped:
+            members = {os.path.join(folder, name).lstrip("/"): zipped.read(name) for name in zipped.namelist()
+                       if not name.endswith("/")}
+        self.contents.update(members)
+        if ingest_metadata:
+            for member, content in members.items():
+                meta = member[: -len("_resmap.xml")] + "_meta.xml"
+                if member.endswith("_resmap.xml") and meta in members:
+                    self.add_aggregation(member, content, members[meta])
+        if remove_original:
+            self.contents.pop(path)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_chunked(self):
+        body = b""
+        while True:
+            size = int(self.rfile.readline().split(b";")[0], 16)
+            body += self.rfile.read(size)
+            self.rfile.readline()
+            if size == 0:
+                return body
+
+    def _dispatch(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            self.body = self._read_chunked()
+        else:
+            length = int(self.headers.get("Content-Length") or 0)
+            self.body = self.rfile.read(length) if length else b""
+        url = urlparse(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        status, headers, body = self.server.respond(self, unquote(url.path))
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.server.write(self.wfile, body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _dispatch
+
+
+class LocalHydroShare(ThreadingHTTPServer):
+    """
+    A local HTTP server emulating the HydroShare REST endpoints hsclient uses: resource maps, metadata and manifests
+    (with ETag and Range support), file upload, delete and rename, folders, zip and unzip, zipped downloads through
+    server side tasks and taskstatus, bags, resource creation, copies and versions, paginated search and user info.
+
+    Resources are created with add_resource from RDF fixtures, i.e. the files in
+    tests/data/test_resource_metadata_files.
+    Handlers registered in routes, keyed by (method, path), take precedence over the emulated endpoints.  A handler is
+    called with the request, which has headers, body and query, and returns (status, headers, body).
+
+    :param fixtures_path: The directory of the RDF fixtures, resourcemetadata.xml is the metadata of every resource and
+        aggregations are added by name from their _resmap.xml, _meta.xml and data files
+    :param latency: The seconds every request is delayed before it is handled, defaults to 0
+    :param bandwidth: The bytes per second responses are written at, defaults to None for unlimited
+    :param failure_rate: The fraction of requests answered with failure_status, defaults to 0
+    :param failure_status: The status code of injected failures, defaults to 503
+    :param task_polls: The number of taskstatus polls before a server side task completes, defaults to 1
+    :param page_size: The number of resources in each page of search results, defaults to 100
+    :param seed: The seed of the random failure injection, for reproducible runs
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        fixtures_path: str = None,
+        latency: float = 0,
+        bandwidth: float = None,
+        failure_rate: float = 0,
+        failure_status: int = 503,
+        task_polls: int = 1,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        seed: int = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        super().__init__((host, port), _Handler)
+        self.fixtures_path = fixtures_path
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.task_polls = task_polls
+        self.page_size = page_size
+        self.routes: Dict[Tuple[str, str], Callable] = {}
+        self.resources: Dict[str, _LocalResource] = {}
+        # (method, endpoint template) -> the number of requests received
+        self.request_counts = Counter()
+        self._random = random.Random(seed)
+        self._failures = []
+        # task id -> [polls remaining, zip content]
+        self._tasks: Dict[str, list] = {}
+        self._lock = threading.RLock()
+        self._thread = None
+        self._endpoints = [
+            ("GET", r"/resource/(?P<id>\w{32})/data/resourcemap\.xml", self._get_resource_map),
+            ("GET", r"/resource/(?P<id>\w{32})/data/resourcemetadata\.xml", self._get_metadata),
+            ("GET", r"/resource/(?P<id>\w{32})/manifest-md5\.txt", self._get_manifest),
+            ("GET", r"/resource/(?P<id>\w{32})/data/contents/(?P<path>.+)", self._get_contents),
+            ("GET", r"/django_irods/rest_download/(?P<id>\w{32})/data/contents/(?P<path>.+)", self._get_contents),
+            ("GET", r"/hsapi/taskstatus/(?P<task>[\w-]+)", self._get_task_status),
+            ("GET", r"/zips/(?P<task>[\w-]+)\.zip", self._get_task_zip),
+            ("GET", r"/hsapi/resource", self._search),
+            ("POST", r"/hsapi/resource", self._create),
+            ("GET", r"/hsapi/resource/(?P<id>\w{32})", self._get_bag),
+            ("DELETE", r"/hsapi/resource/(?P<id>\w{32})", self._delete),
+            ("GET", r"/hsapi/resource/(?P<id>\w{32})/sysmeta", self._get_sysmeta),
+            ("POST", r"/hsapi/resource/(?P<id>\w{32})/(?P<kind>copy|version)", self._copy),
+            ("POST", r"/hsapi/resource/(?P<id>\w{32})/files(?:/(?P<path>.+))?", self._upload),
+            ("DELETE", r"/hsapi/resource/(?P<id>\w{32})/files/(?P<path>.+)", self._delete_path),
+            ("PUT", r"/hsapi/resource/(?P<id>\w{32})/folders/(?P<path>.+)", self._create_folder),
+            ("DELETE", r"/hsapi/resource/(?P<id>\w{32})/folders/(?P<path>.+)", self._delete_path),
+            ("POST", r"/hsapi/resource/(?P<id>\w{32})/functions/move-or-rename", self._rename),
+            ("POST", r"/hsapi/resource/(?P<id>\w{32})/functions/zip", self._zip_function),
+            ("POST", r"/hsapi/resource/(?P<id>\w{32})/functions/unzip/data/contents/(?P<path>.+)", self._unzip),
+            ("POST", r"/hsapi/resource/(?P<id>\w{32})/ingest_metadata", self._ingest_metadata),
+            ("GET", r"/hsapi/userInfo", self._user_info),
+            ("GET", r"/hsapi/userDetails/(?P<user>\d+)", self._user_details),
+        ]
+        self._endpoints = [(method, re.compile(pattern + "$"), handler) for method, pattern, handler in self._endpoints]
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalHydroShare":
+        """Serves requests on a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name="local-hydroshare", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self.shutdown()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def hydroshare(self, **kwargs):
+        """Returns a HydroShare client of this server, kwargs are passed on to HydroShare"""
+        from hsclient.hydroshare import HydroShare
+
+        host, port = self.server_address[:2]
+        return HydroShare(host=host, protocol="http", port=port, **kwargs)
+
+    def fail_next(self, count: int = 1, status: int = None) -> None:
+        """Answers the next count requests with status, defaults to failure_status"""
+        with self._lock:
+            self._failures.extend([status or self.failure_status] * count)
+
+    def add_resource(
+        self,
+        files: Dict[str, bytes] = None,
+        aggregations: Iterable[str] = (),
+        resource_id: str = None,
+        metadata: bytes = None,
+    ) -> str:
+        """
+        Adds a resource
+        :param files: a dict of file path to content
+        :param aggregations: the names of aggregation fixtures (i.e. "ecoregions") added to the root folder, prefix a
+            name with a folder (i.e. "folder/ecoregions") to add the aggregation to that folder
+        :param resource_id: defaults to a random resource id
+        :param metadata: the resource metadata RDF/XML, defaults to the resourcemetadata.xml fixture
+        :return: the resource id
+        """
+        resource_id = resource_id or uuid.uuid4().hex
+        resource = _LocalResource(resource_id, _with_resource_id(metadata or self._fixture("resourcemetadata.xml"),
+                                                                 resource_id))
+        for name in aggregations:
+            fixture = os.path.basename(name)
+            resource.add_aggregation(
+                f"{name}_resmap.xml", self._fixture(f"{fixture}_resmap.xml"), self._fixture(f"{fixture}_meta.xml")
+            )
+            for path in resource.aggregations[f"{name}_resmap.xml"]:
+                if path not in resource.contents:
+                    resource.contents[path] = self._fixture(os.path.basename(path), missing=b"")
+        for path, content in (files or {}).items():
+            resource.contents[path] = content.encode() if isinstance(content, str) else content
+        with self._lock:
+            self.resources[resource_id] = resource
+        return resource_id
+
+    def _fixture(self, name: str, missing: bytes = None) -> bytes:
+        path = os.path.join(self.fixtures_path or "", name)
+        if missing is not None and not os.path.exists(path):
+            return missing
+        if self.fixtures_path is None:
+            raise Exception(f"LocalHydroShare requires a fixtures_path to read {name}")
+        with open(path, "rb") as f:
+            return f.read()
+
+    # request handling
+
+    def write(self, wfile, body: bytes) -> None:
+        """Writes a response body, paced to the bandwidth"""
+        if not self.bandwidth:
+            wfile.write(body)
+            return
+        for start in range(0, len(body), BANDWIDTH_CHUNK_SIZE):
+            chunk = body[start: start + BANDWIDTH_CHUNK_SIZE]
+            wfile.write(chunk)
+            time.sleep(len(chunk) / self.bandwidth)
+
+    def respond(self, request, path: str) -> Response:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.request_counts[(request.command, endpoint_template(path))] += 1
+            failure = self._failures.pop(0) if self._failures else None
+            if failure is None and self.failure_rate and self._random.random() < self.failure_rate:
+                failure = self.failure_status
+        if failure is not None:
+            return failure, {}, b"injected failure"
+        route = self.routes.get((request.command, path))
+        if route is not None:
+            return route(request)
+        normalized = path.rstrip("/")
+        for method, pattern, handler in self._endpoints:
+            match = pattern.match(normalized)
+            if match and method == request.command:
+                with self._lock:
+                    resource_id = match.groupdict().get("id")
+                    if resource_id is not None and resource_id not in self.resources:
+                        return 404, {}, b"resource not found"
+                    response = handler(request, **match.groupdict())
+                    if resource_id in self.resources and request.command != "GET" and response[0] < 300:
+                        self.resources[resource_id].touch()
+                    return response
+        return 404, {}, b"not found"
+
+    @staticmethod
+    def _serve(request, body: bytes, content_type: str = "application/octet-stream") -> Response:
+        """Serves a document, answering conditional and Range requests"""
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        headers = {"Content-Type": content_type, "ETag": etag, "Accept-Ranges": "bytes"}
+        if request.headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        byte_range = request.headers.get("Range")
+        if_range = request.headers.get("If-Range")
+        if byte_range and byte_range.startswith("bytes=") and (if_range is None or if_range == etag):
+            start, end = byte_range[len("bytes="):].split("-")
+            start, end = int(start), int(end or len(body) - 1)
+            if start >= len(body):
+                return 416, {}, b""
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+            return 206, headers, body[start: end + 1]
+        return 200, headers, body
+
+    @staticmethod
+    def _json(status: int, value) -> Response:
+        return status, {"Content-Type": "application/json"}, json.dumps(value).encode()
+
+    @staticmethod
+    def _form(request) -> Dict[str, str]:
+        return {key: values[-1] for key, values in parse_qs(request.body.decode()).items()}
+
+    @staticmethod
+    def _multipart(request) -> List[Tuple[str, bytes]]:
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {request.headers['Content-Type']}\r\n\r\n".encode() + request.body
+        )
+        return [(part.get_filename(), part.get_payload(decode=True)) for part in message.iter_parts()
+                if part.get_filename()]
+
+    def _start_task(self, content: bytes) -> str:
+        task_id = str(uuid.uuid4())
+        self._tasks[task_id] = [self.task_polls, content]
+        return task_id
+
+    def _get_resource_map(self, request, id):
+        return self._serve(request, self.resources[id].resource_map(), "application/xml")
+
+    def _get_metadata(self, request, id):
+        return self._serve(request, self.resources[id].metadata, "application/xml")
+
+    def _get_manifest(self, request, id):
+        return self._serve(request, self.resources[id].manifest(), "text/plain")
+
+    def _get_contents(self, request, id, path):
+        resource = self.resources[id]
+        if request.query.get("zipped") == "true":
+            if request.query.get("aggregation") == "true":
+                owned = resource.aggregation_of(path) or {path}
+                files = {os.path.basename(p): resource.contents[p] for p in owned if p in resource.contents}
+            else:
+                files = resource.files_under(path)
+            if not files:
+                return 404, {}, b"not found"
+            return self._json(200, {"task_id": self._start_task(_zip(files))})
+        if path not in resource.contents:
+            return 404, {}, b"not found"
+        return self._serve(request, resource.contents[path])
+
+    def _get_task_status(self, request, task):
+        if task not in self._tasks:
+            return 404, {}, b"not found"
+        self._tasks[task][0] -= 1
+        if self._tasks[task][0] > 0:
+            return self._json(200, {"status": "progress", "payload": None})
+        return self._json(200, {"status": "true", "payload": f"{self.url}/zips/{task}.zip"})
+
+    def _get_task_zip(self, request, task):
+        if task not in self._tasks:
+            return 404, {}, b"not found"
+        return self._serve(request, self._tasks[task][1], "application/zip")
+
+    def _search(self, request):
+        page = int(request.query.get("page", 1))
+        resources = list(self.resources.values())
+        start = (page - 1) * self.page_size
+        results = [self._preview(resource) for resource in resources[start: start + self.page_size]]
+        next_page = f"{self.url}/hsapi/resource/?page={page + 1}" if start + self.page_size < len(resources) else None
+        return self._json(200, {"count": len(resources), "next": next_page, "previous": None, "results": results})
+
+    def _preview(self, resource: _LocalResource) -> dict:
+        url = f"{self.url}/resource/{resource.resource_id}"
+        return {
+            "resource_type": "CompositeResource",
+            "resource_title": "Test Resource",
+            "resource_id": resource.resource_id,
+            "creator": "Local User",
+            "date_created": resource.created,
+            "date_last_updated": resource.modified,
+            "public": True,
+            "discoverable": True,
+            "shareable": True,
+            "immutable": False,
+            "published": False,
+            "resource_url": url,
+            "resource_map_url": f"{url}/data/resourcemap.xml",
+            "science_metadata_url": f"{url}/data/resourcemetadata.xml",
+        }
+
+    def _create(self, request):
+        return self._json(201, {"resource_id": self.add_resource()})
+
+    def _get_bag(self, request, id):
+        files = {f"{id}/data/contents/{path}": content for path, content in self.resources[id].contents.items()}
+        return 200, {"Content-Type": "application/zip"}, _zip(files)
+
+    def _delete(self, request, id):
+        del self.resources[id]
+        return 204, {}, b""
+
+    def _get_sysmeta(self, request, id):
+        return self._json(200, {**self._preview(self.resources[id]), "resource_id": id})
+
+    def _copy(self, request, id, kind):
+        source = self.resources[id]
+        resource_id = self.add_resource(metadata=source.metadata)
+        copy = self.resources[resource_id]
+        owned = set().union(*source.aggregations.values()) if source.aggregations else set()
+        # aggregation maps and metadata describe their resource by url
+        copy.contents = {
+            path: _with_resource_id(content, resource_id) if path in owned else content
+            for path, content in source.contents.items()
+        }
+        copy.aggregations = {path: set(files) for path, files in source.aggregations.items()}
+        copy.folders = set(source.folders)
+        return 202, {"Content-Type": "text/plain"}, resource_id.encode()
+
+    def _upload(self, request, id, path=None):
+        resource = self.resources[id]
+        for filename, content in self._multipart(request):
+            resource.contents[os.path.join(path or "", filename)] = content
+        return 201, {}, b""
+
+    def _delete_path(self, request, id, path):
+        if not self.resources[id].exists(path):
+            return 404, {}, b"Path does not exist"
+        self.resources[id].remove(path)
+        return 200, {}, b""
+
+    def _create_folder(self, request, id, path):
+        self.resources[id].folders.add(path)
+        return 201, {}, b""
+
+    def _rename(self, request, id):
+        form = self._form(request)
+        if not self.resources[id].exists(form["source_path"]):
+            return 404, {}, b"Path does not exist"
+        self.resources[id].rename(form["source_path"], form["target_path"])
+        return 200, {}, b""
+
+    def _zip_function(self, request, id):
+        form = self._form(request)
+        resource = self.resources[id]
+        path = form["input_coll_path"]
+        target = os.path.join(os.path.dirname(path), form["output_zip_file_name"])
+        resource.contents[target] = _zip(resource.files_under(path))
+        if form.get("remove_original_after_zip") in ("True", "true"):
+            resource.remove(path)
+        return 200, {}, b""
+
+    def _unzip(self, request, id, path):
+        resource = self.resources[id]
+        if path not in resource.contents:
+            return 404, {}, b"not found"
+        form = self._form(request)
+        resource.unzip(
+            path,
+            overwrite=form.get("overwrite", "true") in ("True", "true"),
+            ingest_metadata=form.get("ingest_metadata", "true") in ("True", "true"),
+            remove_original=form.get("remove_original_zip", "true") in ("True", "true"),
+        )
+        return 200, {}, b""
+
+    def _ingest_metadata(self, request, id):
+        resource = self.resources[id]
+        for filename, content in self._multipart(request):
+            if filename == "resourcemetadata.xml":
+                resource.metadata = content
+            else:
+                for path in resource.contents:
+                    if os.path.basename(path) == os.path.basename(filename):
+                        resource.contents[path] = content
+        return 204, {}, b""
+
+    def _user_info(self, request):
+        return self._json(200, {"id": 1, "username": "local", "email": "local@example.com"})
+
+    def _user_details(self, request, user):
+        return self._json(200, {"name": "Local User", "email": "local@example.com", "type": "University Faculty"})
@@ -1,8 +1,13 @@
+import hashlib
+import importlib
+import os
 from collections import namedtuple
 from os.path import splitext
+from typing import TYPE_CHECKING
 from urllib.request import pathname2url
 
-from hsmodels.schemas.enums import AggregationType
+if TYPE_CHECKING:
+    from hsmodels.schemas.enums import AggregationType
 
 CSVColumnDataType = namedtuple('CSVColumnDataType', ['string', 'number', 'datetime', 'boolean'])(
     'string', 'number', 'datetime', 'boolean'
@@ -13,7 +18,17 @@ def is_aggregation(path):
     return path.endswith('#aggregation')
 
 
-def main_file_type(type: AggregationType):
+def optional_import(name: str):
+    """Imports the module name of an optional dependency when it is first needed, returns None if not installed"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def main_file_type(type: 'AggregationType'):
+    from hsmodels.schemas.enums import AggregationType
+
     if type == AggregationType.GeographicRasterAggregation:
         return ".vrt"
     if type == AggregationType.MultidimensionalAggregation:
@@ -69,3 +84,41 @@ def encode_resource_url(url):
 def is_folder(path):
     """Checks for an extension to determine if the path is to a folder"""
     return splitext(path)[1] == ''
+
+
+def accepts_ranges(response):
+    """Checks the response headers to determine if the server supports byte Range requests for the url"""
+    return response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+
+
+def response_validator(response):
+    """
+    The validator identifying the version of the content of the response, the ETag or else the Last-Modified date.
+    Weak ETags can't be used to resume a download, None if there is no strong validator.
+    """
+    etag = response.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response.headers.get('Last-Modified')
+
+
+def remove_files(*paths):
+    """Removes the local files at paths that exist"""
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def file_md5(path, chunk_size=1024 * 1024, md5=None):
+    """
+    Computes the md5 of a local file, reading chunk_size bytes at a time.
+    :param path: the local file path
+    :param chunk_size: the number of bytes to read into memory at a time
+    :param md5: an existing hashlib md5 object to update, defaults to a new one
+    :return: the updated hashlib md5 object
+    """
+    md5 = md5 if md5 is not None else hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            md5.update(chunk)
+    return md5
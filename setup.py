@@ -4,7 +4,7 @@ from setuptools import setup, find_packages
 README = (pathlib.Path(__file__).parent / "README.md").read_text()
 
 extra_deps = ["pandas", "netCDF4", "xarray", "rasterio", "fiona"]
-dev_deps = ["pytest", "pytest-xdist", "pytest-cov", "mkdocs", "mknotebooks", "mkdocstrings", "mkdocstrings-python"]
+dev_deps = ["httpx[http2]", "pytest", "pytest-benchmark", "pytest-xdist", "pytest-cov", "mkdocs", "mknotebooks", "mkdocstrings", "mkdocstrings-python"]
 
 setup(
     name='hsclient',
@@ -15,13 +15,13 @@ setup(
         'hsmodels>=1.0.4',
         'requests',
         'requests_oauthlib',
-        'setuptools',
     ],
     extras_require={
         "pandas": ["pandas"],
         "xarray": ["netCDF4", "xarray"],
         "rasterio": ["rasterio"],
         "fiona": ["fiona"],
+        "async": ["httpx[http2]"],
         "all": extra_deps,
         "dev": extra_deps + dev_deps,
     },
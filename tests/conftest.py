@@ -1,6 +1,27 @@
 import os
+
 import pytest
 from hsclient import HydroShare
+from hsclient.testing import LocalHydroShare
+
+
+@pytest.fixture()
+def local_server():
+    """
+    A LocalHydroShare server of the test_resource_metadata_files fixtures, register handlers in routes keyed by
+    (method, path) returning (status, headers, body) to override its endpoints
+    """
+    server = LocalHydroShare(fixtures_path=METADATA_FILES_PATH).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture()
+def local_hydroshare(local_server):
+    return local_server.hydroshare()
+
+
+METADATA_FILES_PATH = os.path.join(os.path.dirname(__file__), "data", "test_resource_metadata_files")
 
 
 @pytest.fixture(scope="function")
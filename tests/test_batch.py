@@ -0,0 +1,107 @@
+import time
+
+import pytest
+from hsmodels.schemas.enums import AggregationType
+
+from hsclient.batch import OPERATION_PATHS, conflicts
+
+
+def test_batch_runs_operations_and_refreshes_once(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({f"file{i}.txt": b"data" for i in range(5)})
+    res = local_hydroshare.resource(resource_id)
+    res.files()
+
+    with res.batch() as batch:
+        renamed = res.file_rename("file0.txt", "folder/file0.txt")
+        res.file_delete("file1.txt")
+        res.folder_create("empty")
+        assert not renamed.done()
+        assert res.files() == [f"file{i}.txt" for i in range(5)]
+
+    assert renamed.done() and renamed.result() is None
+    assert [operation.name for operation in batch.operations] == ["file_rename", "file_delete", "folder_create"]
+    assert batch.errors == []
+    assert sorted(res.files()) == ["file2.txt", "file3.txt", "file4.txt", "folder/file0.txt"]
+    assert local_server.request_counts[("GET", "/resource/{resource_id}/data/resourcemap.xml/")] == 2
+
+
+def test_batch_runs_independent_operations_concurrently(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({f"file{i}.txt": b"data" for i in range(8)})
+    res = local_hydroshare.resource(resource_id)
+    res.files()
+    local_server.latency = 0.2
+
+    start = time.monotonic()
+    with res.batch():
+        for i in range(8):
+            res.file_rename(f"file{i}.txt", f"renamed{i}.txt")
+    local_server.latency = 0
+
+    # eight renames and an eager refresh take far less than their sequential round trips
+    assert time.monotonic() - start < 8 * 0.2
+    assert sorted(res.files()) == sorted(f"renamed{i}.txt" for i in range(8))
+
+
+def test_batch_reports_errors_and_skips_dependent_operations(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({"data.txt": b"data"})
+    res = local_hydroshare.resource(resource_id)
+
+    with res.batch(raise_errors=False) as batch:
+        res.file_rename("missing.txt", "other.txt")
+        res.file_delete("other.txt")
+        res.file_rename("data.txt", "renamed.txt")
+
+    assert [operation.name for operation in batch.errors] == ["file_rename", "file_delete"]
+    assert "not run" in str(batch.errors[1].error)
+    assert res.files() == ["renamed.txt"]
+
+    with pytest.raises(Exception, match="1 of 1 operations failed"):
+        with res.batch():
+            res.file_delete("missing.txt")
+
+
+def test_abandoned_batch_runs_nothing(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({"data.txt": b"data"})
+    res = local_hydroshare.resource(resource_id)
+
+    with pytest.raises(ValueError):
+        with res.batch():
+            deleted = res.file_delete("data.txt")
+            raise ValueError()
+
+    assert deleted.cancelled()
+    assert res.files() == ["data.txt"]
+
+
+def test_batch_queues_file_aggregate(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({"data.txt": b"data", "folder/other.txt": b"data"})
+    res = local_hydroshare.resource(resource_id)
+    aggregated = []
+    local_server.routes[("POST", f"/hsapi/resource/{resource_id}/functions/set-file-type/data.txt/SingleFile/")] = (
+        lambda request: aggregated.append(request) or (201, {}, b"{}")
+    )
+    res.files()
+
+    with res.batch() as batch:
+        future = res.file_aggregate("data.txt", AggregationType.SingleFileAggregation)
+        res.file_rename("folder/other.txt", "folder/renamed.txt")
+        assert not future.done()
+        assert not aggregated
+
+    assert future.result() is None
+    assert len(aggregated) == 1
+    assert [operation.name for operation in batch.operations] == ["file_aggregate", "file_rename"]
+    assert local_server.request_counts[("GET", "/resource/{resource_id}/data/resourcemap.xml/")] == 2
+
+
+def test_conflicts():
+    assert conflicts(["folder"], ["folder/file.txt"])
+    assert conflicts(["a.txt"], ["a.txt", "b.txt"])
+    assert not conflicts(["a.txt"], ["b.txt", "folder/a.txt"])
+    # the root folder and unknown paths conflict with every path
+    assert conflicts([""], ["a.txt"])
+    assert conflicts(None, ["a.txt"])
+    # a FileSet aggregation changes the folder of the aggregated file
+    aggregated = OPERATION_PATHS["file_aggregate"]
+    assert not conflicts(aggregated("folder/a.txt", AggregationType.SingleFileAggregation), ["folder/b.txt"])
+    assert conflicts(aggregated("folder/a.txt", AggregationType.FileSetAggregation), ["folder/b.txt"])
@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+import time
+
+from hsclient import DiskCache, HydroShare, MetricsCollector
+
+
+def test_cache_stores_and_evicts(tmp_path):
+    cache = DiskCache(os.path.join(str(tmp_path), "cache.db"), max_size=100)
+    cache.set("a", b"x" * 40, {"If-None-Match": '"a"'})
+    cache.set("b", b"x" * 40, {})
+    assert cache.get("a").validators == {"If-None-Match": '"a"'}
+
+    cache.set("c", b"x" * 40, {})
+
+    assert cache.get("b") is None
+    assert cache.get("a").body == b"x" * 40
+    assert cache.size == 80
+
+
+def test_stale_entries_without_validators_are_dropped(tmp_path):
+    cache = DiskCache(os.path.join(str(tmp_path), "cache.db"), ttl=0)
+    cache.set("a", b"body", {})
+    cache.set("b", b"body", {"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+    assert cache.get("a") is None
+    assert not cache.is_fresh(cache.get("b"))
+
+
+def _write_entries(path, worker):
+    cache = DiskCache(path)
+    for i in range(50):
+        cache.set(f"{worker}-{i}", os.urandom(100), {"If-None-Match": str(i)})
+
+
+def test_cache_is_shared_across_processes(tmp_path):
+    path = os.path.join(str(tmp_path), "cache.db")
+    DiskCache(path)
+    processes = [multiprocessing.Process(target=_write_entries, args=(path, worker)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in processes)
+    assert DiskCache(path).size == 4 * 50 * 100
+
+
+def test_sessions_share_the_cache(local_server, tmp_path):
+    resource_id = local_server.add_resource({"data.txt": b"some data"}, aggregations=("ecoregions",))
+    path = os.path.join(str(tmp_path), "cache.db")
+
+    def hydroshare(collector):
+        return HydroShare(
+            host="127.0.0.1", protocol="http", port=local_server.server_address[1], cache=DiskCache(path),
+            hooks=[collector],
+        )
+
+    first = MetricsCollector()
+    res = hydroshare(first).resource(resource_id)
+    metadata = res.metadata
+    files = res.files(search_aggregations=True)
+    assert len(first.events) == 5
+
+    second = MetricsCollector()
+    res = hydroshare(second).resource(resource_id)
+    assert res.metadata.title == metadata.title
+    assert sorted(map(str, res.files(search_aggregations=True))) == sorted(map(str, files))
+    assert second.events == []
+
+    res.refresh()
+    res.files(search_aggregations=True)
+    assert [event.status_code for event in second.events] == [304] * 4
+
+
+def test_authenticated_documents_are_only_shared_with_the_same_credentials(local_server, tmp_path):
+    resource_id = local_server.add_resource({"data.txt": b"some data"})
+    path = os.path.join(str(tmp_path), "cache.db")
+
+    def metadata_requests(username, password):
+        collector = MetricsCollector()
+        hs = HydroShare(
+            username, password, host="127.0.0.1", protocol="http", port=local_server.server_address[1],
+            cache=DiskCache(path), hooks=[collector],
+        )
+        hs.resource(resource_id, validate=False).metadata
+        return [event for event in collector.events if event.endpoint.endswith("resourcemetadata.xml/")]
+
+    assert len(metadata_requests("owner", "secret")) == 1
+    assert metadata_requests("owner", "secret") == []
+    # another user, or the same user with other credentials, retrieves the document from HydroShare
+    assert len(metadata_requests("other", "secret")) == 1
+    assert len(metadata_requests("owner", "guessed")) == 1
+    assert len(metadata_requests(None, None)) == 1
+
+
+def test_expired_prefixes_are_dropped_after_the_ttl(local_server, tmp_path):
+    session = HydroShare(
+        host="127.0.0.1", protocol="http", port=local_server.server_address[1],
+        cache=DiskCache(os.path.join(str(tmp_path), "cache.db"), ttl=0.2),
+    )._hs_session
+    for i in range(100):
+        session.expire(f"/resource/{i}/")
+    assert session._expired_at("/resource/5/data/resourcemap.xml") > 0
+
+    time.sleep(0.2)
+    session.expire("/resource/new/")
+
+    assert list(session._expired) == ["/resource/new"]
+    assert session._expired_at("/resource/5/data/resourcemap.xml") == 0
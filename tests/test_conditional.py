@@ -0,0 +1,42 @@
+from hsclient import MetricsCollector
+
+
+def test_refresh_revalidates_documents(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({"data.txt": b"some data"}, aggregations=("ecoregions",))
+    collector = MetricsCollector()
+    local_hydroshare._hs_session.hooks.append(collector)
+    res = local_hydroshare.resource(resource_id)
+    resource_map, metadata = res._map, res.metadata
+    aggregation_metadata = res.aggregations()[0].metadata
+    checksums = res._checksums
+    assert {event.status_code for event in collector.events} == {200}
+    collector.reset()
+
+    res.refresh()
+    assert res._map is resource_map
+    assert res._checksums is checksums
+    assert res.metadata == metadata and res.metadata is not metadata
+    assert res.aggregations()[0].metadata == aggregation_metadata
+    assert [event.status_code for event in collector.events] == [304] * 5
+
+
+def test_local_metadata_changes_are_discarded_on_refresh(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({})
+    res = local_hydroshare.resource(resource_id)
+    title = res.metadata.title
+
+    res.metadata.title = "changed locally"
+    res.refresh()
+
+    assert res.metadata.title == title
+
+
+def test_changed_documents_are_retrieved(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({"data.txt": b"some data"})
+    res = local_hydroshare.resource(resource_id)
+    assert [file.path for file in res.files()] == ["data.txt"]
+
+    local_server.resources[resource_id].contents["more.txt"] = b"more data"
+    res.refresh()
+
+    assert sorted(file.path for file in res.files()) == ["data.txt", "more.txt"]
@@ -0,0 +1,248 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+from hsclient.testing import LocalHydroShare
+
+
+def serve_file(content):
+    def handler(request):
+        return 200, {"Content-Type": "application/octet-stream"}, content
+
+    return handler
+
+
+def serve_ranges(content, requested_ranges):
+    def handler(request):
+        byte_range = request.headers.get("Range")
+        if byte_range is None:
+            return 200, {"Accept-Ranges": "bytes"}, content
+        requested_ranges.append(byte_range)
+        start, end = byte_range[len("bytes="):].split("-")
+        start, end = int(start), int(end or len(content) - 1)
+        headers = {"Content-Range": f"bytes {start}-{end}/{len(content)}"}
+        return 206, headers, content[start:end + 1]
+
+    return handler
+
+
+def test_file_download_streams_to_disk(local_server, local_hydroshare, tmp_path):
+    content = os.urandom(3 * 1024 * 1024 + 17)
+    local_server.routes[("GET", "/resource/abc/data/contents/big.nc/")] = serve_file(content)
+    local_hydroshare._hs_session.download_chunk_size = 64 * 1024
+
+    downloaded = local_hydroshare._hs_session.retrieve_file("resource/abc/data/contents/big.nc", str(tmp_path))
+
+    assert downloaded == os.path.join(str(tmp_path), "big.nc")
+    with open(downloaded, "rb") as f:
+        assert f.read() == content
+    assert not os.path.exists(downloaded + ".part")
+
+
+def test_failed_download_leaves_no_file(local_server, local_hydroshare, tmp_path):
+    with pytest.raises(Exception, match="Failed GET"):
+        local_hydroshare._hs_session.retrieve_file("resource/abc/data/contents/missing.nc", str(tmp_path))
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_segmented_file_download(local_server, local_hydroshare, tmp_path):
+    content = os.urandom(1024 * 1024 + 3)
+    requested_ranges = []
+    local_server.routes[("GET", "/resource/abc/data/contents/big.tif/")] = serve_ranges(content, requested_ranges)
+    local_hydroshare._hs_session.download_chunk_size = 16 * 1024
+
+    downloaded = local_hydroshare._hs_session.retrieve_file(
+        "resource/abc/data/contents/big.tif", str(tmp_path), segments=4
+    )
+
+    assert len(requested_ranges) == 4
+    with open(downloaded, "rb") as f:
+        assert f.read() == content
+
+
+def test_segmented_download_falls_back_without_range_support(local_server, local_hydroshare, tmp_path):
+    content = os.urandom(1024 * 1024)
+    local_server.routes[("GET", "/resource/abc/data/contents/big.tif/")] = serve_file(content)
+    local_hydroshare._hs_session.download_chunk_size = 16 * 1024
+
+    downloaded = local_hydroshare._hs_session.retrieve_file(
+        "resource/abc/data/contents/big.tif", str(tmp_path), segments=4
+    )
+
+    with open(downloaded, "rb") as f:
+        assert f.read() == content
+
+
+def test_segmented_download_fallback_checks_status(local_server, local_hydroshare, tmp_path):
+    content = os.urandom(1024 * 1024)
+    requests = []
+
+    def handler(request):
+        requests.append(request.headers.get("Range"))
+        if len(requests) == 1:
+            return 200, {"Accept-Ranges": "bytes"}, content
+        return 404, {}, b"Not Found"
+
+    local_server.routes[("GET", "/resource/abc/data/contents/big.bin/")] = handler
+    local_hydroshare._hs_session.download_chunk_size = 16 * 1024
+
+    with pytest.raises(Exception, match="status_code 404"):
+        local_hydroshare._hs_session.retrieve_file("resource/abc/data/contents/big.bin", str(tmp_path), segments=4)
+
+    assert requests[-1] is None
+    assert os.listdir(str(tmp_path)) == []
+
+
+class DroppingRangeServer:
+    """Serves content with Range support, dropping the first full request after drop_after bytes"""
+
+    def __init__(self, content, drop_after):
+        self.content = content
+        self.drop_after = drop_after
+
+    def __call__(self, request):
+        byte_range = request.headers.get("Range")
+        if byte_range is None:
+            if self.drop_after is not None:
+                drop_after, self.drop_after = self.drop_after, None
+                request.send_response(200)
+                request.send_header("Accept-Ranges", "bytes")
+                request.send_header("Content-Length", str(len(self.content)))
+                request.end_headers()
+                request.wfile.write(self.content[:drop_after])
+                request.wfile.flush()
+                request.close_connection = True
+                raise ConnectionAbortedError()
+            return 200, {"Accept-Ranges": "bytes"}, self.content
+        start = int(byte_range[len("bytes="):].split("-")[0])
+        return 206, {"Accept-Ranges": "bytes"}, self.content[start:]
+
+
+def test_dropped_download_resumes_from_offset(local_server, local_hydroshare, tmp_path):
+    content = os.urandom(512 * 1024)
+    local_server.routes[("GET", "/resource/abc/data/contents/f.nc/")] = DroppingRangeServer(content, 100 * 1024)
+    checksum = hashlib.md5(content).hexdigest()
+
+    downloaded = local_hydroshare._hs_session.retrieve_file(
+        "resource/abc/data/contents/f.nc", str(tmp_path), checksum=checksum
+    )
+
+    with open(downloaded, "rb") as f:
+        assert f.read() == content
+
+
+def serve_versioned(content, requested_ranges):
+    def handler(request):
+        if "Range" in request.headers:
+            requested_ranges.append((request.headers["Range"], request.headers.get("If-Range")))
+        return LocalHydroShare._serve(request, content)
+
+    return handler
+
+
+def write_part_file(tmp_path, content, validator):
+    with open(os.path.join(str(tmp_path), "f.nc.part"), "wb") as f:
+        f.write(content)
+    if validator is not None:
+        with open(os.path.join(str(tmp_path), "f.nc.part.validator"), "w") as f:
+            f.write(validator)
+
+
+def test_download_resumes_existing_part_file(local_server, local_hydroshare, tmp_path):
+    content = os.urandom(256 * 1024)
+    etag = f'"{hashlib.md5(content).hexdigest()}"'
+    requested_ranges = []
+    local_server.routes[("GET", "/resource/abc/data/contents/f.nc/")] = serve_versioned(content, requested_ranges)
+    write_part_file(tmp_path, content[:1000], etag)
+
+    downloaded = local_hydroshare._hs_session.retrieve_file(
+        "resource/abc/data/contents/f.nc", str(tmp_path), checksum=hashlib.md5(content).hexdigest()
+    )
+
+    assert requested_ranges == [("bytes=1000-", etag)]
+    with open(downloaded, "rb") as f:
+        assert f.read() == content
+    assert os.listdir(str(tmp_path)) == ["f.nc"]
+
+
+@pytest.mark.parametrize("validator", ['"a-previous-etag"', None])
+def test_download_restarts_part_file_of_another_version(local_server, local_hydroshare, tmp_path, validator):
+    content = b"B" * 4096
+    requested_ranges = []
+    local_server.routes[("GET", "/resource/abc/data/contents/f.nc/")] = serve_versioned(content, requested_ranges)
+    write_part_file(tmp_path, b"A" * 1000, validator)
+
+    downloaded = local_hydroshare._hs_session.retrieve_file("resource/abc/data/contents/f.nc", str(tmp_path))
+
+    assert requested_ranges == []
+    with open(downloaded, "rb") as f:
+        assert f.read() == content
+
+
+def test_resumed_download_restarts_when_the_file_changes(local_server, local_hydroshare, tmp_path):
+    content = os.urandom(256 * 1024)
+    etag = f'"{hashlib.md5(content).hexdigest()}"'
+    changed = os.urandom(300 * 1024)
+    local_server.routes[("GET", "/resource/abc/data/contents/f.nc/")] = serve_versioned(changed, [])
+    # the validator still matches when the download starts, the file changes before the range is requested
+    session = local_hydroshare._hs_session
+    response = session.request("GET", local_server.url + "/resource/abc/data/contents/f.nc/", stream=True)
+    response.headers["ETag"] = etag
+    write_part_file(tmp_path, content[:1000], etag)
+
+    downloaded = session.stream_to_file(response, os.path.join(str(tmp_path), "f.nc"), resume=True)
+
+    with open(downloaded, "rb") as f:
+        assert f.read() == changed
+
+
+def test_failed_resume_is_not_saved_as_the_file(local_server, local_hydroshare, tmp_path):
+    content = os.urandom(256 * 1024)
+    etag = f'"{hashlib.md5(content).hexdigest()}"'
+
+    def handler(request):
+        if "Range" in request.headers:
+            return 416, {}, b"Range Not Satisfiable"
+        return LocalHydroShare._serve(request, content)
+
+    local_server.routes[("GET", "/resource/abc/data/contents/f.nc/")] = handler
+    write_part_file(tmp_path, content[:1000], etag)
+
+    with pytest.raises(Exception, match="status_code 416"):
+        local_hydroshare._hs_session.retrieve_file("resource/abc/data/contents/f.nc", str(tmp_path))
+
+    # the .part file is kept to resume from later
+    assert sorted(os.listdir(str(tmp_path))) == ["f.nc.part", "f.nc.part.validator"]
+
+
+def test_checksum_mismatch_rejects_download(local_server, local_hydroshare, tmp_path):
+    local_server.routes[("GET", "/resource/abc/data/contents/f.txt/")] = serve_file(b"corrupted")
+
+    with pytest.raises(Exception, match="does not match"):
+        local_hydroshare._hs_session.retrieve_file(
+            "resource/abc/data/contents/f.txt", str(tmp_path), checksum=hashlib.md5(b"content").hexdigest()
+        )
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_retrieve_zip_waits_on_task(local_server, local_hydroshare, tmp_path):
+    base_url = local_hydroshare._hs_session.base_url
+    local_server.routes[("GET", "/resource/abc/data/contents/folder/")] = lambda request: (
+        200,
+        {"Content-Type": "application/json"},
+        json.dumps({"task_id": "t1"}).encode(),
+    )
+    local_server.routes[("GET", "/hsapi/taskstatus/t1/")] = lambda request: (
+        200,
+        {"Content-Type": "application/json"},
+        json.dumps({"status": "true", "payload": f"{base_url}/zips/folder.zip"}).encode(),
+    )
+    local_server.routes[("GET", "/zips/folder.zip")] = serve_file(b"zip content")
+
+    downloaded = local_hydroshare._hs_session.retrieve_zip("resource/abc/data/contents/folder", str(tmp_path))
+
+    assert downloaded == os.path.join(str(tmp_path), "folder.zip")
+    with open(downloaded, "rb") as f:
+        assert f.read() == b"zip content"
@@ -0,0 +1,74 @@
+from hsclient.fileindex import FileIndex
+from hsclient.hydroshare import File
+from hsclient.utils import attribute_filter
+
+
+def _file(path, checksum=None):
+    return File(path, f"/resource/abc/data/contents/{path}", checksum or f"md5-{path}")
+
+
+FILES = [
+    _file("readme.txt"),
+    _file("data/a.csv"),
+    _file("data/b.csv", checksum="shared"),
+    _file("data/nested/c.csv", checksum="shared"),
+    _file("database/d.txt"),
+    _file("other/a.csv"),
+]
+
+
+def _linear(**kwargs):
+    files = FILES
+    for key, value in kwargs.items():
+        files = [file for file in files if attribute_filter(file, key, value)]
+    return files
+
+
+def test_lookups_match_linear_filter():
+    index = FileIndex(FILES)
+
+    for kwargs in (
+        {"path": "data/a.csv"},
+        {"name": "a.csv"},
+        {"extension": ".csv"},
+        {"folder": "data"},
+        {"checksum": "shared"},
+        {"extension": ".csv", "name": "a.csv"},
+        {"folder": "data", "checksum": "shared"},
+        {"url": FILES[0].url},
+        {"path": "missing.txt"},
+        {"name": ["unhashable"]},
+        {"name__startswith": "a"},
+    ):
+        assert index.filter(**kwargs) == _linear(**kwargs), kwargs
+
+
+def test_within_folder():
+    index = FileIndex(FILES)
+
+    assert index.filter(within="data") == ["data/a.csv", "data/b.csv", "data/nested/c.csv"]
+    assert index.filter(within="data/nested/") == ["data/nested/c.csv"]
+    assert index.filter(within="data", checksum="shared") == ["data/b.csv", "data/nested/c.csv"]
+    assert index.filter(within="dat") == []
+    assert index.filter(within="") == FILES
+
+
+def test_find_is_lazy():
+    index = FileIndex(FILES)
+
+    assert next(index.find(extension=".csv")) == "data/a.csv"
+    assert set(index._indexes) == {"extension"}
+    assert index._tree is None
+
+
+def test_resource_files_use_updated_index(local_server, local_hydroshare):
+    resource_id = local_server.add_resource(
+        {"folder/a.txt": b"a", "folder/sub/b.txt": b"b"}, aggregations=["ecoregions"]
+    )
+    res = local_hydroshare.resource(resource_id)
+
+    assert res.files(within="folder") == ["folder/a.txt", "folder/sub/b.txt"]
+    assert res.file(search_aggregations=True, extension=".csv") == "ecoregions.csv"
+    res.file_rename("folder/sub", "moved")
+    assert res.file(folder="moved") == "moved/b.txt"
+    assert res.files(within="folder") == ["folder/a.txt"]
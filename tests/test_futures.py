@@ -0,0 +1,86 @@
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from zipfile import ZipFile
+
+from hsclient import HydroShare, PollingStrategy
+from hsclient.testing import LocalHydroShare
+
+COPY_ID = "0123456789abcdef0123456789abcdef"
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def zip_task_routes(server, path, task_id, content):
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    server.routes[("GET", path)] = lambda request: (200, {}, json.dumps({"task_id": task_id}).encode())
+    server.routes[("GET", f"/hsapi/taskstatus/{task_id}/")] = lambda request: (
+        200, {}, json.dumps({"status": "true", "payload": f"{base_url}/zips/{task_id}.zip"}).encode()
+    )
+    server.routes[("GET", f"/zips/{task_id}.zip")] = lambda request: (200, {}, content)
+
+
+def test_submit_copy_completes_when_copy_is_ready(local_server):
+    resource_id = local_server.add_resource({})
+    local_server.add_resource({}, resource_id=COPY_ID)
+    hs = HydroShare(
+        host="127.0.0.1",
+        protocol="http",
+        port=local_server.server_address[1],
+        polling=PollingStrategy(initial_interval=0.01),
+    )
+    local_server.routes[("POST", f"/hsapi/resource/{resource_id}/copy/")] = lambda request: (202, {}, COPY_ID.encode())
+    polls = []
+
+    def copy_map(request):
+        polls.append(request)
+        if len(polls) < 3:
+            return 404, {}, b""
+        return LocalHydroShare._serve(request, local_server.resources[COPY_ID].resource_map(), "application/xml")
+
+    local_server.routes[("GET", f"/resource/{COPY_ID}/data/resourcemap.xml/")] = copy_map
+
+    copied = hs.resource(resource_id).submit_copy().result(timeout=5)
+
+    assert len(polls) == 3
+    assert copied.resource_id == COPY_ID
+
+
+def test_submit_downloads(local_server, local_hydroshare, tmp_path):
+    resource_id = local_server.add_resource({"data.txt": b"data"}, aggregations=("ecoregions",))
+    zip_task_routes(local_server, f"/resource/{resource_id}/data/contents/folder/", "folder-task", b"folder zip")
+    archive = io.BytesIO()
+    with ZipFile(archive, "w") as zipped:
+        zipped.writestr("ecoregions.csv", "a,b\n")
+    zip_task_routes(
+        local_server,
+        f"/django_irods/rest_download/{resource_id}/data/contents/ecoregions.csv/",
+        "aggregation-task",
+        archive.getvalue(),
+    )
+    executor = CountingExecutor()
+    local_hydroshare._hs_session.executor = executor
+    res = local_hydroshare.resource(resource_id)
+    unzip_to = os.path.join(str(tmp_path), "unzipped")
+
+    folder = res.submit_folder_download("folder", str(tmp_path))
+    aggregation = res.submit_aggregation_download(res.aggregations()[0], str(tmp_path), unzip_to=unzip_to)
+    data = res.submit_file_download("data.txt", str(tmp_path))
+
+    with open(folder.result(timeout=5), "rb") as f:
+        assert f.read() == b"folder zip"
+    assert aggregation.result(timeout=5) == unzip_to
+    assert os.listdir(unzip_to) == ["ecoregions.csv"]
+    with open(data.result(timeout=5), "rb") as f:
+        assert f.read() == b"data"
+    # the folder and aggregation zips, unzipping the aggregation and the file download
+    assert executor.submitted == 4
@@ -0,0 +1,23 @@
+import subprocess
+import sys
+
+
+def test_import_defers_slow_dependencies():
+    code = (
+        "import sys, hsclient; "
+        "print(sorted(m for m in ('hsmodels', 'rdflib', 'pydantic', 'requests_oauthlib', 'pkg_resources', 'pandas', "
+        "'fiona', 'rasterio', 'xarray') if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+
+    assert output.strip() == "[]"
+
+
+def test_deferred_names_are_importable():
+    from hsclient import Token
+    from hsclient.hydroshare import AggregationType, ResourcePreview, load_rdf
+
+    assert Token.__name__ == "Token"
+    assert AggregationType.CSVFileAggregation.value == "CSV"
+    assert ResourcePreview.__name__ == "ResourcePreview"
+    assert callable(load_rdf)
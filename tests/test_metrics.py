@@ -0,0 +1,78 @@
+import pytest
+
+from hsclient import HydroShare, MetricsCollector, RequestHook, RetryPolicy
+from hsclient.metrics import endpoint_template, percentile
+
+
+def test_endpoint_template():
+    assert (
+        endpoint_template("https://host/resource/97523bdb7b174901b3fc2d89813458f1/data/contents/a/b.csv")
+        == "/resource/{resource_id}/data/contents/{path}"
+    )
+    assert endpoint_template("https://host/hsapi/taskstatus/0f8fad5b-d9cb-469f-a165-70867728950e/") == (
+        "/hsapi/taskstatus/{task_id}/"
+    )
+    assert endpoint_template("https://host/hsapi/userDetails/12/") == "/hsapi/userDetails/{id}/"
+
+
+def test_percentile():
+    values = [4, 1, 3, 2, 5]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 100) == 5
+    assert percentile(values, 90) == pytest.approx(4.6)
+    assert percentile([], 50) == 0.0
+
+
+def test_collector_records_requests(local_server):
+    port = local_server.server_address[1]
+    attempts = []
+
+    def user_info(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            return 503, {}, b""
+        return 200, {"Content-Type": "application/json"}, b'{"id": 1}'
+
+    local_server.routes[("GET", "/hsapi/userInfo/")] = user_info
+    local_server.routes[("GET", "/hsapi/userDetails/1/")] = lambda request: (404, {}, b"missing")
+    starts = []
+
+    class StartHook(RequestHook):
+        def on_request_start(self, event):
+            starts.append(event)
+
+    collector = MetricsCollector()
+    hs = HydroShare(
+        host="127.0.0.1",
+        protocol="http",
+        port=port,
+        retry=RetryPolicy(backoff_factor=0),
+        hooks=[collector, StartHook()],
+    )
+    hs.my_user_info()
+    with pytest.raises(Exception):
+        hs.user(1)
+
+    info, details = collector.events
+    assert [event.endpoint for event in starts] == ["/hsapi/userInfo/", "/hsapi/userDetails/{id}/"]
+    assert (info.method, info.status_code, info.retries, info.bytes_received) == ("GET", 200, 1, 9)
+    assert (details.status_code, details.retries, details.bytes_received) == (404, 0, 7)
+    summary = collector.summary()
+    assert summary[("GET", "/hsapi/userInfo/")]["count"] == 1
+    assert summary[("GET", "/hsapi/userDetails/{id}/")]["errors"] == 1
+    assert summary[("GET", "/hsapi/userInfo/")]["p99"] == info.elapsed
+
+
+def test_collector_records_connection_errors(local_server):
+    port = local_server.server_address[1]
+    local_server.shutdown()
+    local_server.server_close()
+    collector = MetricsCollector()
+    hs = HydroShare(host="127.0.0.1", protocol="http", port=port, retry=None, hooks=[collector])
+
+    with pytest.raises(Exception):
+        hs.my_user_info()
+
+    event, = collector.events
+    assert event.status_code is None
+    assert event.error is not None
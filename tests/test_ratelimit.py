@@ -0,0 +1,65 @@
+import multiprocessing
+import os
+import time
+
+from hsclient import HydroShare, RateLimiter
+from hsclient.ratelimit import SharedTokenBucket, TokenBucket
+
+
+def test_token_bucket_paces_after_burst():
+    bucket = TokenBucket(rate=50, capacity=2)
+    start = time.monotonic()
+    delays = [bucket.acquire() for _ in range(7)]
+
+    assert delays[:2] == [0, 0]
+    assert time.monotonic() - start >= 0.09
+
+
+def test_large_acquisitions_are_paced():
+    bucket = TokenBucket(rate=1000, capacity=100)
+    assert bucket.acquire(300) >= 0.19
+
+
+def test_buckets_are_per_host():
+    limiter = RateLimiter(requests_per_second=10, burst=0.1)
+    limiter.acquire_request("http://a.org/path")
+    assert limiter.acquire_request("http://b.org/path") == 0
+    assert limiter.acquire_request("http://a.org/other") > 0
+
+
+def _acquire(path, count):
+    bucket = SharedTokenBucket(path, rate=40, capacity=1)
+    for _ in range(count):
+        bucket.acquire()
+
+
+def test_shared_bucket_paces_across_processes(tmp_path):
+    path = os.path.join(str(tmp_path), "bucket")
+    processes = [multiprocessing.Process(target=_acquire, args=(path, 5)) for _ in range(2)]
+    start = time.monotonic()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in processes)
+    # 10 tokens at 40 per second with a single token of burst
+    assert time.monotonic() - start >= 0.2
+
+
+def test_session_paces_requests_and_bytes(local_server, tmp_path):
+    resource_id = local_server.add_resource({"data.bin": os.urandom(40000)})
+    limiter = RateLimiter(requests_per_second=20, bytes_per_second=100000, burst=0.1)
+    hs = HydroShare(host="127.0.0.1", protocol="http", port=local_server.server_address[1], rate_limiter=limiter)
+    session = hs._hs_session
+    session.download_chunk_size = 10000
+
+    start = time.monotonic()
+    for _ in range(4):
+        session.retrieve_string(f"/resource/{resource_id}/manifest-md5.txt")
+    assert time.monotonic() - start >= 0.1
+
+    start = time.monotonic()
+    session.retrieve_file(f"/resource/{resource_id}/data/contents/data.bin", save_path=str(tmp_path))
+    # 40000 bytes at 100000 per second after a 10000 byte burst
+    assert time.monotonic() - start >= 0.25
@@ -0,0 +1,107 @@
+import pytest
+
+
+def test_eager_refresh_loads_everything(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({"data.txt": b"data"}, aggregations=["ecoregions"])
+    res = local_hydroshare.resource(resource_id)
+
+    res.refresh(eager=True)
+    requests = sum(local_server.request_counts.values())
+
+    assert res.metadata.title is not None
+    assert sorted(res.files(search_aggregations=True)) == ["data.txt", "ecoregions.csv"]
+    assert res.aggregation(type="CSV").metadata.title is not None
+    assert res.file(path="data.txt").checksum is not None
+    assert sum(local_server.request_counts.values()) == requests
+
+
+def test_lazy_refresh_retrieves_on_access(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({"data.txt": b"data"})
+    res = local_hydroshare.resource(resource_id)
+    res.files()
+
+    res.refresh()
+    requests = sum(local_server.request_counts.values())
+    assert res.files() == ["data.txt"]
+    assert sum(local_server.request_counts.values()) > requests
+
+
+def _get_count(server):
+    return sum(count for (method, _), count in server.request_counts.items() if method == "GET")
+
+
+def test_renames_update_files_locally(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({f"file{i}.txt": b"data" for i in range(20)}, aggregations=["ecoregions"])
+    res = local_hydroshare.resource(resource_id)
+    res.files()
+    res.aggregations()
+    requests = _get_count(local_server)
+
+    for i in range(20):
+        res.file_rename(f"file{i}.txt", f"renamed/file{i}.txt")
+
+    assert sorted(res.files()) == sorted(f"renamed/file{i}.txt" for i in range(20))
+    assert res.file(path="renamed/file0.txt").checksum is not None
+    assert res.aggregation(type="CSV").main_file_path == "ecoregions.csv"
+    assert _get_count(local_server) == requests
+    res.refresh()
+    assert sorted(res.files()) == sorted(f"renamed/file{i}.txt" for i in range(20))
+
+
+def test_renames_without_aggregations_update_files_locally(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({f"file{i}.txt": b"data" for i in range(20)})
+    res = local_hydroshare.resource(resource_id)
+    assert res.aggregations() == []
+    res.files()
+    requests = _get_count(local_server)
+
+    for i in range(20):
+        res.file_rename(f"file{i}.txt", f"renamed{i}.txt")
+        assert f"renamed{i}.txt" in res.files()
+
+    assert res.aggregations() == []
+    assert _get_count(local_server) == requests
+
+
+def test_folder_delete_reloads_changed_aggregations(local_server, local_hydroshare):
+    resource_id = local_server.add_resource(
+        {"folder/data.txt": b"data", "data.txt": b"data"}, aggregations=["ecoregions", "folder/ecoregions"]
+    )
+    res = local_hydroshare.resource(resource_id)
+    res.files()
+    unchanged = res.aggregation(file__path="ecoregions.csv")
+    assert len(res.aggregations()) == 2
+    requests = _get_count(local_server)
+
+    res.folder_delete("folder")
+
+    assert res.files() == ["data.txt"]
+    assert res.aggregations() == [unchanged]
+    # only the resource map is retrieved again
+    assert _get_count(local_server) == requests + 1
+
+
+def test_rename_of_aggregation_file_reloads_files(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({"data.txt": b"data"}, aggregations=["ecoregions"])
+    res = local_hydroshare.resource(resource_id)
+    res.files()
+    res.aggregations()
+
+    res.file_rename("ecoregions.csv", "moved.csv")
+
+    assert res.files() == ["data.txt"]
+    assert local_server.resources[resource_id].contents["moved.csv"]
+
+
+def test_failed_aggregation_map_is_raised(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({"data.txt": b"data"}, aggregations=["ecoregions"])
+    requests = []
+    resmap_path = f"/resource/{resource_id}/data/contents/ecoregions_resmap.xml/"
+    local_server.routes[("GET", resmap_path)] = lambda request: requests.append(request) or (404, {}, b"Not Found")
+    res = local_hydroshare.resource(resource_id)
+
+    with pytest.raises(Exception, match="status_code 404"):
+        res.aggregations()
+
+    # the error loading the map is raised rather than lost and retrieved again
+    assert len(requests) == 1
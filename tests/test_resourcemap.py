@@ -0,0 +1,48 @@
+import glob
+import os
+
+import pytest
+from hsmodels.schemas import load_rdf
+
+from hsclient.resourcemap import parse_resource_map
+from hsclient.testing import resource_map_xml
+
+METADATA_FILES_PATH = os.path.join(os.path.dirname(__file__), "data", "test_resource_metadata_files")
+RESOURCE_ID = "97523bdb7b174901b3fc2d89813458f1"
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+# one of the fixtures named _resmap.xml holds aggregation metadata rather than a resource map
+DOCUMENTS = [
+    path
+    for path in sorted(glob.glob(os.path.join(METADATA_FILES_PATH, "*_resmap.xml")))
+    if "ore:describes" in read(path)
+]
+
+
+@pytest.mark.parametrize("document", [read(path) for path in DOCUMENTS] + [
+    resource_map_xml(RESOURCE_ID, ["data.txt", "folder/with space.txt"], ["ecoregions_resmap.xml"])
+], ids=[os.path.basename(path) for path in DOCUMENTS] + ["resourcemap.xml"])
+def test_listing_matches_model(document):
+    model = load_rdf(document)
+
+    listing = parse_resource_map(document, chunk_size=100)
+
+    assert listing.identifier == model.identifier
+    assert listing.is_documented_by == str(model.describes.is_documented_by)
+    assert sorted(listing.files) == sorted(str(file) for file in model.describes.files)
+
+
+def test_resource_listing_and_model(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({"data.txt": b"data"}, aggregations=("ecoregions",))
+
+    res = local_hydroshare.resource(resource_id)
+
+    assert res.resource_id == resource_id
+    assert [file.path for file in res.files()] == ["data.txt"]
+    assert res._retrieved_map_model is None
+    assert res.resource_map.identifier == resource_id
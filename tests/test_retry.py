@@ -0,0 +1,96 @@
+import pytest
+
+from hsclient import CircuitBreaker, HydroShare, RetryPolicy
+
+
+class Responses:
+    """Answers successive requests with the given (status, headers) pairs, repeating the last one"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.count = 0
+
+    def __call__(self, request):
+        self.count += 1
+        status, headers = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        return status, headers, b"{}"
+
+
+@pytest.fixture()
+def hydroshare_with(local_server):
+    def create(**kwargs):
+        return HydroShare(host="127.0.0.1", protocol="http", port=local_server.server_address[1], **kwargs)
+
+    return create
+
+
+def test_backoff_is_exponential_and_capped():
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+    assert [policy.backoff(attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_retry_after_takes_precedence():
+    class Response:
+        headers = {"Retry-After": "2"}
+
+    assert RetryPolicy(backoff_factor=10).backoff(0, Response()) == 2
+    assert RetryPolicy(backoff_factor=10, respect_retry_after=False).backoff(0, Response()) == 10
+
+
+def test_transient_failures_are_retried(local_server, hydroshare_with):
+    responses = Responses((503, {}), (429, {"Retry-After": "0"}), (200, {}))
+    local_server.routes[("GET", "/hsapi/userInfo/")] = responses
+    hs = hydroshare_with(retry=RetryPolicy(backoff_factor=0))
+
+    hs.my_user_info()
+
+    assert responses.count == 3
+    assert hs._hs_session.retry_stats == {"retries": 2}
+
+
+def test_retries_are_exhausted(local_server, hydroshare_with):
+    responses = Responses((502, {}))
+    local_server.routes[("GET", "/hsapi/userInfo/")] = responses
+    hs = hydroshare_with(retry=RetryPolicy(total=2, backoff_factor=0))
+
+    with pytest.raises(Exception, match="status_code 502"):
+        hs.my_user_info()
+
+    assert responses.count == 3
+    assert hs._hs_session.retry_stats == {"retries": 2, "exhausted": 1}
+
+
+def test_post_is_not_retried(local_server, hydroshare_with):
+    responses = Responses((503, {}), (201, {}))
+    local_server.routes[("POST", "/hsapi/resource/")] = responses
+    hs = hydroshare_with(retry=RetryPolicy(backoff_factor=0))
+
+    with pytest.raises(Exception, match="Failed POST"):
+        hs._hs_session.post("/hsapi/resource/", status_code=201)
+    assert responses.count == 1
+
+
+def test_circuit_breaker_fails_fast(local_server, hydroshare_with):
+    responses = Responses((500, {}))
+    local_server.routes[("GET", "/hsapi/userInfo/")] = responses
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    hs = hydroshare_with(retry=None, circuit_breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(Exception, match="status_code 500"):
+            hs.my_user_info()
+    with pytest.raises(Exception, match="circuit breaker is open"):
+        hs.my_user_info()
+
+    assert responses.count == 2
+    assert breaker.state == CircuitBreaker.OPEN
+    assert hs._hs_session.retry_stats == {"circuit_opened": 1, "circuit_rejections": 1}
+
+
+def test_circuit_breaker_half_open_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
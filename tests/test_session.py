@@ -0,0 +1,48 @@
+from requests.adapters import HTTPAdapter
+
+from hsclient import HydroShare
+from hsclient.hydroshare import PoolAdapter
+
+
+def pool_adapter(hs):
+    adapter = hs._hs_session._session.get_adapter("https://www.hydroshare.org")
+    assert isinstance(adapter, PoolAdapter)
+    return adapter
+
+
+def test_pool_sized_to_workers():
+    hs = HydroShare(max_workers=24, pool_maxsize=4)
+    assert pool_adapter(hs)._pool_maxsize == 24
+    assert hs._hs_session.max_workers == 24
+
+
+def test_pool_configuration():
+    hs = HydroShare(pool_connections=2, pool_maxsize=50, timeout=(3, 30), keep_alive=False)
+    adapter = pool_adapter(hs)
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 50
+    assert adapter.timeout == (3, 30)
+    assert not adapter.keep_alive
+
+
+def test_set_oauth_keeps_pool():
+    hs = HydroShare(pool_maxsize=50)
+    adapter = pool_adapter(hs)
+    hs._hs_session.set_oauth("client_id", {"access_token": "token", "token_type": "Bearer"})
+    assert pool_adapter(hs) is adapter
+
+
+def test_default_timeout_and_keep_alive_applied(local_server, monkeypatch):
+    local_server.routes[("GET", "/hsapi/userInfo/")] = lambda request: (200, {}, b"{}")
+    hs = HydroShare(host="127.0.0.1", protocol="http", port=local_server.server_address[1], timeout=7, keep_alive=False)
+    sent = []
+    send = HTTPAdapter.send
+
+    def recording_send(self, request, **kwargs):
+        sent.append((request.headers.get("Connection"), kwargs["timeout"]))
+        return send(self, request, **kwargs)
+
+    monkeypatch.setattr(HTTPAdapter, "send", recording_send)
+    hs.my_user_info()
+    hs._hs_session.get("/hsapi/userInfo/", status_code=200, timeout=3)
+    assert sent == [("close", 7), ("close", 3)]
@@ -0,0 +1,53 @@
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from hsclient import MetricsCollector
+
+
+def slow(route, delay=0.2):
+    def handle(request):
+        time.sleep(delay)
+        return route(request)
+
+    return handle
+
+
+def test_concurrent_access_shares_one_retrieval(local_server, local_hydroshare):
+    resource_id = local_server.add_resource({"data.txt": b"some data"}, aggregations=("ecoregions",))
+    for key in list(local_server.routes):
+        local_server.routes[key] = slow(local_server.routes[key])
+    collector = MetricsCollector()
+    local_hydroshare._hs_session.hooks.append(collector)
+    res = local_hydroshare.resource(resource_id, validate=False)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: res.files(search_aggregations=True), range(8)))
+
+    assert all(files == results[0] for files in results)
+    assert set(Counter(event.url for event in collector.events).values()) == {1}
+    assert len(collector.events) == 4
+
+
+def test_concurrent_retrievals_share_failures(local_server, local_hydroshare):
+    attempts = []
+
+    def fail(request):
+        attempts.append(request)
+        time.sleep(0.2)
+        return 404, {}, b"missing"
+
+    local_server.routes[("GET", "/missing.xml/")] = fail
+    session = local_hydroshare._hs_session
+
+    def retrieve(_):
+        try:
+            session.retrieve_string("/missing.xml")
+        except Exception as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        errors = list(executor.map(retrieve, range(4)))
+
+    assert len(attempts) == 1
+    assert all("status_code 404" in error for error in errors)
@@ -0,0 +1,59 @@
+import pytest
+
+from hsclient import CSVAggregation
+
+
+@pytest.fixture()
+def snapshot(local_server, tmp_path):
+    resource_id = local_server.add_resource(
+        {"data.txt": b"data", "folder/nested.txt": b"nested"}, aggregations=["ecoregions"]
+    )
+    path = str(tmp_path / "resource.snapshot")
+    # the snapshot is taken by another client than the local_hydroshare restoring it
+    local_server.hydroshare().resource(resource_id).snapshot(path)
+    local_server.request_counts.clear()
+    return resource_id, path
+
+
+def test_restore_without_retrieving_documents(local_server, local_hydroshare, snapshot):
+    resource_id, path = snapshot
+
+    res = local_hydroshare.resource_from_snapshot(path)
+
+    assert res.resource_id == resource_id
+    assert sorted(res.files()) == ["data.txt", "folder/nested.txt"]
+    aggregation = res.aggregation(type="CSV")
+    assert isinstance(aggregation, CSVAggregation)
+    assert aggregation.files() == ["ecoregions.csv"]
+    assert res.metadata.title == "sadfadsgasdf"
+    assert list(local_server.request_counts) == [("GET", "/hsapi/resource/{resource_id}/sysmeta/")]
+
+
+def test_restore_without_validation(local_server, local_hydroshare, snapshot):
+    resource_id, path = snapshot
+
+    res = local_hydroshare.resource_from_snapshot(path, validate=False)
+
+    assert len(res.files()) == 2
+    assert not local_server.request_counts
+
+
+def test_stale_snapshot_is_discarded(local_hydroshare, snapshot, tmp_path):
+    resource_id, path = snapshot
+    hs = local_hydroshare
+    new_file = tmp_path / "new.txt"
+    new_file.write_text("new")
+    hs.resource(resource_id).file_upload(str(new_file))
+
+    res = hs.resource_from_snapshot(path, use_cache=False)
+
+    assert "new.txt" in res.files()
+
+
+def test_restored_resource_is_usable(local_hydroshare, snapshot):
+    resource_id, path = snapshot
+    res = local_hydroshare.resource_from_snapshot(path)
+
+    res.file_delete("data.txt")
+
+    assert res.files() == ["folder/nested.txt"]
@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+
+import pytest
+
+from hsclient import PollingStrategy, TaskWatcher
+
+
+def test_polling_intervals_back_off_to_max():
+    polling = PollingStrategy(initial_interval=0.5, multiplier=2, max_interval=3, jitter=0)
+    intervals = polling.intervals()
+    assert [next(intervals) for _ in range(5)] == [0.5, 1, 2, 3, 3]
+
+
+def test_polling_jitter_stays_in_bounds():
+    polling = PollingStrategy(initial_interval=1, multiplier=1, jitter=0.2)
+    intervals = polling.intervals()
+    assert all(0.8 <= next(intervals) <= 1.2 for _ in range(50))
+
+
+def test_polling_timeout():
+    polling = PollingStrategy(initial_interval=0.01, timeout=0.05)
+    with pytest.raises(TimeoutError):
+        polling.wait(lambda: False)
+
+
+def task_status_route(statuses, payload=None):
+    def handler(request):
+        status = statuses.pop(0)
+        return 200, {"Content-Type": "application/json"}, json.dumps({"status": status, "payload": payload}).encode()
+
+    return handler
+
+
+def test_wait_for_task_completes_quickly(local_server, local_hydroshare):
+    local_server.routes[("GET", "/hsapi/taskstatus/abc/")] = task_status_route(["progress", "true"], "url")
+    session = local_hydroshare._hs_session
+
+    start = time.monotonic()
+    assert session.wait_for_task("abc") == "url"
+
+    assert time.monotonic() - start < 1
+    timing = session.task_timings[-1]
+    assert timing.task_id == "abc"
+    assert timing.polls == 2
+
+
+def test_wait_for_failed_task(local_server, local_hydroshare):
+    local_server.routes[("GET", "/hsapi/taskstatus/abc/")] = task_status_route(["progress", "failed"])
+    with pytest.raises(Exception, match="Task abc failed"):
+        local_hydroshare._hs_session.wait_for_task("abc")
+
+
+def test_task_watcher_polls_many_tasks_from_one_thread():
+    watcher = TaskWatcher(PollingStrategy(initial_interval=0.01, jitter=0), max_workers=4)
+    polls = {}
+    threads = set()
+
+    def poll_task(task_id):
+        def poll():
+            threads.add(threading.current_thread().name)
+            polls[task_id] = polls.get(task_id, 0) + 1
+            return polls[task_id] == 3, task_id
+
+        return poll
+
+    futures = [watcher.watch(poll_task(task_id)) for task_id in range(20)]
+
+    assert [future.result(timeout=5) for future in futures] == list(range(20))
+    assert set(polls.values()) == {3}
+    assert all(name.startswith("hsclient-poll") for name in threads)
+    assert watcher.pending == 0
+
+
+def test_task_watcher_slow_poll_does_not_hold_back_other_tasks():
+    watcher = TaskWatcher(PollingStrategy(initial_interval=0.01, jitter=0), max_workers=4)
+    release = threading.Event()
+    polls = []
+
+    def slow_poll():
+        release.wait(5)
+        return True, "slow"
+
+    def quick_poll():
+        polls.append(1)
+        return len(polls) == 5, "quick"
+
+    slow = watcher.watch(slow_poll)
+    quick = watcher.watch(quick_poll)
+
+    assert quick.result(timeout=1) == "quick"
+    assert not slow.done()
+    release.set()
+    assert slow.result(timeout=5) == "slow"
+
+
+def test_task_watcher_times_out_and_cancels():
+    watcher = TaskWatcher(PollingStrategy(initial_interval=0.01, timeout=0.05))
+    timed_out = watcher.watch(lambda: (False, None), "slow task")
+    with pytest.raises(TimeoutError, match="slow task"):
+        timed_out.result(timeout=5)
+
+    watcher = TaskWatcher(PollingStrategy(initial_interval=0.05))
+    polls = []
+    cancelled = watcher.watch(lambda: polls.append(1) or (False, None))
+    time.sleep(0.02)
+    assert cancelled.cancel()
+    time.sleep(0.2)
+    assert len(polls) <= 2
+
+
+def test_submit_zip_returns_future(local_server, local_hydroshare, tmp_path):
+    base_url = local_hydroshare._hs_session.base_url
+    for name in ("a", "b", "c"):
+        local_server.routes[("GET", f"/resource/abc/data/contents/{name}/")] = (
+            lambda request, name=name: (200, {}, json.dumps({"task_id": name}).encode())
+        )
+        local_server.routes[("GET", f"/hsapi/taskstatus/{name}/")] = task_status_route(
+            ["progress", "true"], f"{base_url}/zips/{name}.zip"
+        )
+        local_server.routes[("GET", f"/zips/{name}.zip")] = (
+            lambda request, name=name: (200, {}, name.encode())
+        )
+    session = local_hydroshare._hs_session
+
+    futures = [session.submit_zip(f"resource/abc/data/contents/{name}", str(tmp_path)) for name in ("a", "b", "c")]
+
+    for future, name in zip(futures, ("a", "b", "c")):
+        with open(future.result(timeout=5), "rb") as f:
+            assert f.read() == name.encode()
+    assert sorted(timing.task_id for timing in session.task_timings) == ["a", "b", "c"]
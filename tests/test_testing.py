@@ -0,0 +1,102 @@
+import os
+import time
+from zipfile import ZipFile
+
+import pytest
+
+from hsclient import PollingStrategy, RetryPolicy
+from hsclient.testing import LocalHydroShare
+
+METADATA_FILES_PATH = os.path.join(os.path.dirname(__file__), "data", "test_resource_metadata_files")
+
+
+@pytest.fixture()
+def server():
+    with LocalHydroShare(fixtures_path=METADATA_FILES_PATH, task_polls=2, page_size=2) as server:
+        yield server
+
+
+@pytest.fixture()
+def hs(server):
+    return server.hydroshare(polling=PollingStrategy(initial_interval=0.01))
+
+
+def test_resource_files_and_aggregations(server, hs):
+    resource_id = server.add_resource(
+        {"data.txt": b"data", "folder/nested.txt": b"nested"}, aggregations=["ecoregions"]
+    )
+
+    res = hs.resource(resource_id)
+
+    assert sorted(res.files(search_aggregations=True)) == ["data.txt", "ecoregions.csv", "folder/nested.txt"]
+    aggregation = res.aggregation(type="CSV")
+    assert aggregation.main_file_path == "ecoregions.csv"
+    assert aggregation.metadata.title is not None
+
+
+def test_upload_and_modify_files(server, hs, tmp_path):
+    resource_id = server.add_resource()
+    res = hs.resource(resource_id)
+    files = [os.path.join(METADATA_FILES_PATH, name) for name in
+             ("ecoregions.csv", "ecoregions_resmap.xml", "ecoregions_meta.xml")]
+    text = tmp_path / "notes.txt"
+    text.write_text("notes")
+
+    res.file_upload(*files)
+    res.file_upload(str(text), destination_path="docs")
+    res.folder_create("empty")
+    res.file_rename("docs/notes.txt", "docs/renamed.txt")
+
+    assert res.aggregation(type="CSV").main_file_path == "ecoregions.csv"
+    assert res.files() == ["docs/renamed.txt"]
+    assert server.resources[resource_id].contents["docs/renamed.txt"] == b"notes"
+    res.folder_delete("docs")
+    assert res.files() == []
+
+
+def test_zipped_download_polls_task(server, hs, tmp_path):
+    resource_id = server.add_resource({"folder/a.txt": b"a", "folder/b.txt": b"b"})
+
+    path = hs.resource(resource_id).folder_download("folder", save_path=str(tmp_path))
+
+    with ZipFile(path) as zipped:
+        assert sorted(zipped.namelist()) == ["folder/a.txt", "folder/b.txt"]
+    assert server.request_counts[("GET", "/hsapi/taskstatus/{task_id}/")] == 2
+
+
+def test_search_pagination(server, hs):
+    resource_ids = {server.add_resource() for _ in range(5)}
+
+    assert {preview.resource_id for preview in hs.search()} == resource_ids
+    assert server.request_counts[("GET", "/hsapi/resource/")] == 3
+
+
+def test_create_copy_and_delete(server, hs):
+    res = hs.create()
+    copied = res.copy()
+
+    assert copied.resource_id != res.resource_id
+    assert set(server.resources) == {res.resource_id, copied.resource_id}
+    res.delete()
+    assert set(server.resources) == {copied.resource_id}
+
+
+def test_failure_injection(server):
+    resource_id = server.add_resource()
+    hs = server.hydroshare(retry=RetryPolicy(backoff_factor=0))
+
+    server.fail_next(2)
+    hs.resource(resource_id)
+    server.fail_next(4)
+    with pytest.raises(Exception, match="status_code 503"):
+        hs.resource(resource_id, use_cache=False)
+
+
+def test_latency_and_bandwidth(tmp_path):
+    with LocalHydroShare(fixtures_path=METADATA_FILES_PATH, latency=0.1, bandwidth=100 * 1024) as server:
+        resource_id = server.add_resource({"large.bin": os.urandom(50 * 1024)})
+        res = server.hydroshare().resource(resource_id)
+        start = time.monotonic()
+        path = res.file_download("large.bin", save_path=str(tmp_path))
+        assert time.monotonic() - start >= 0.5
+        assert os.path.getsize(path) == 50 * 1024
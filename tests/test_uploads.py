@@ -0,0 +1,161 @@
+import io
+import os
+from email.parser import BytesParser
+from email.policy import HTTP
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+from hsclient.streaming import (
+    PARALLEL_UPLOAD_MIN_FILE_SIZE,
+    MultipartEncoder,
+    UploadStrategy,
+    choose_upload_strategy,
+    zip_stream,
+)
+
+
+def parse_multipart(request):
+    """Parses a multipart/form-data request body into a dict of field name to (filename, content)"""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {request.headers['Content-Type']}\r\n\r\n".encode() + request.body
+    )
+    return {
+        part.get_param("name", header="content-disposition"): (part.get_filename(), part.get_payload(decode=True))
+        for part in message.iter_parts()
+    }
+
+
+def test_multipart_encoder_streams_in_chunks(tmp_path):
+    path = os.path.join(str(tmp_path), "data.bin")
+    content = os.urandom(100 * 1024 + 5)
+    with open(path, "wb") as f:
+        f.write(content)
+    progress = []
+
+    with open(path, "rb") as f:
+        body = MultipartEncoder({"file": (path, f), "title": "a title"}, callback=progress.append, chunk_size=8192)
+        chunks = list(body)
+        body.rewind()
+        assert body.read() == b"".join(chunks)
+
+    assert max(len(chunk) for chunk in chunks) <= 8192
+    assert len(b"".join(chunks)) == len(body)
+    assert progress[len(chunks) - 1].bytes_sent == len(body)
+
+    class Request:
+        headers = {"Content-Type": body.content_type}
+
+    Request.body = b"".join(chunks)
+    assert parse_multipart(Request) == {"file": ("data.bin", content), "title": (None, b"a title")}
+
+
+def test_file_upload_streams_file_with_progress(local_server, local_hydroshare, tmp_path):
+    resource_id = local_server.add_resource({})
+    uploads = []
+
+    def upload(request):
+        uploads.append(parse_multipart(request))
+        return 201, {}, b""
+
+    local_server.routes[("POST", f"/hsapi/resource/{resource_id}/files/folder/")] = upload
+    path = os.path.join(str(tmp_path), "upload.nc")
+    content = os.urandom(3 * 1024 * 1024)
+    with open(path, "wb") as f:
+        f.write(content)
+    progress = []
+
+    res = local_hydroshare.resource(resource_id)
+    res.file_upload(path, destination_path="folder", progress=progress.append, refresh=False)
+
+    assert uploads == [{"file": ("upload.nc", content)}]
+    assert progress[-1].bytes_sent == progress[-1].total_bytes > len(content)
+    assert len(progress) > 1
+
+
+def write_files(directory, sizes):
+    paths = []
+    for name, size in sizes.items():
+        path = os.path.join(str(directory), name)
+        with open(path, "wb") as f:
+            f.write(os.urandom(size))
+        paths.append(path)
+    return paths
+
+
+def test_zip_stream_stores_compressed_formats(tmp_path):
+    text = os.path.join(str(tmp_path), "notes.txt")
+    with open(text, "w") as f:
+        f.write("streamed " * 10000)
+    image, = write_files(tmp_path, {"image.png": 50000})
+
+    archive = ZipFile(io.BytesIO(b"".join(zip_stream([text, image], chunk_size=4096))))
+
+    assert archive.getinfo("notes.txt").compress_type == ZIP_DEFLATED
+    assert archive.getinfo("image.png").compress_type == ZIP_STORED
+    with open(text, "rb") as f:
+        assert archive.read("notes.txt") == f.read()
+    with open(image, "rb") as f:
+        assert archive.read("image.png") == f.read()
+
+
+def test_choose_upload_strategy(tmp_path):
+    small = write_files(tmp_path, {"a.csv": 100, "b.txt": 100})
+    large = write_files(tmp_path, {"c.bin": PARALLEL_UPLOAD_MIN_FILE_SIZE, "d.bin": PARALLEL_UPLOAD_MIN_FILE_SIZE})
+    shapefile = write_files(tmp_path, {"e.shp": PARALLEL_UPLOAD_MIN_FILE_SIZE, "e.shx": 100})
+    metadata = write_files(tmp_path, {"f_meta.xml": 100})
+
+    assert choose_upload_strategy(small) == UploadStrategy.ZIP
+    assert choose_upload_strategy(large) == UploadStrategy.PARALLEL
+    assert choose_upload_strategy(shapefile) == UploadStrategy.ZIP
+    assert choose_upload_strategy(large + metadata) == UploadStrategy.ZIP
+
+
+def test_file_upload_zip_streams_archive(local_server, local_hydroshare, tmp_path):
+    resource_id = local_server.add_resource({})
+    uploads, unzips = [], []
+
+    def upload(request):
+        uploads.append(parse_multipart(request))
+        return 201, {}, b""
+
+    def unzip(request):
+        unzips.append(request.body)
+        return 200, {}, b""
+
+    local_server.routes[("POST", f"/hsapi/resource/{resource_id}/files/folder/")] = upload
+    local_server.routes[
+        ("POST", f"/hsapi/resource/{resource_id}/functions/unzip/data/contents/folder/files.zip/")
+    ] = unzip
+    paths = write_files(tmp_path, {"a.csv": 1000, "b.txt": 2000})
+    progress = []
+
+    res = local_hydroshare.resource(resource_id)
+    res.file_upload(*paths, destination_path="folder", progress=progress.append, strategy="zip", refresh=False)
+
+    (filename, content), = [upload["file"] for upload in uploads]
+    assert filename == "files.zip"
+    assert sorted(ZipFile(io.BytesIO(content)).namelist()) == ["a.csv", "b.txt"]
+    assert unzips == [b"overwrite=true&ingest_metadata=true"]
+    assert progress[-1].total_bytes is None
+
+
+def test_file_upload_parallel_uploads_each_file(local_server, local_hydroshare, tmp_path):
+    resource_id = local_server.add_resource({})
+    uploads = []
+
+    def upload(request):
+        uploads.append(parse_multipart(request)["file"])
+        return 201, {}, b""
+
+    local_server.routes[("POST", f"/hsapi/resource/{resource_id}/files/")] = upload
+    paths = write_files(tmp_path, {"a.bin": 200000, "b.bin": 300000, "c.bin": 100000})
+    progress = []
+
+    res = local_hydroshare.resource(resource_id)
+    res.file_upload(*paths, progress=progress.append, strategy=UploadStrategy.PARALLEL, refresh=False)
+
+    expected = {}
+    for path in paths:
+        with open(path, "rb") as f:
+            expected[os.path.basename(path)] = f.read()
+    assert dict(uploads) == expected
+    assert progress[-1].bytes_sent == progress[-1].total_bytes > 600000